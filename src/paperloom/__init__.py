@@ -1 +1,4 @@
-__all__=[]
\ No newline at end of file
+from .models import PaperRecord
+from .api import extract_records, extract_record
+
+__all__ = ["PaperRecord", "extract_records", "extract_record"]
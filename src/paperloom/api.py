@@ -0,0 +1,175 @@
+import os, io, hashlib
+from collections import deque
+from typing import IO, Any, Deque, Iterable, Iterator, Optional, Tuple, Union
+from .models import PaperRecord
+from .defaults import RULE_TIME_BUDGET
+
+# -----------------------------
+#  Bellek içi kütüphane API'si
+# -----------------------------
+# extract_pdfs klasör okuyup dosya yazar; buradaki üreteçler ise PDF'leri
+# bayt, dosya benzeri nesne ya da yol olarak alır ve PaperRecord'ları tembel
+# olarak (sırayla, hazır oldukça) üretir. İstenmedikçe diske hiçbir şey
+# yazılmaz ve okunmaz (yollar hariç). Ağır modüller ilk çağrıda yüklenir ki
+# `import paperloom` ucuz kalsın.
+#
+#   from paperloom import extract_records
+#   for rec in extract_records([blob1, ("b.pdf", blob2), open("c.pdf", "rb")], workers=4):
+#       ...
+
+Data = Union[bytes, bytearray, memoryview, IO[bytes]]
+Source = Union[str, "os.PathLike[str]", Data, Tuple[str, Data]]
+
+
+def _is_pair(source: Any) -> bool:
+    """
+    (ad, bayt | akış) çifti mi? Yalnızca bu biçim tek kaynaktır; başka her
+    demet (ör. ("a.pdf", "b.pdf")) kaynakların listesi sayılır.
+    """
+    return (isinstance(source, tuple) and len(source) == 2 and isinstance(source[0], str)
+            and (isinstance(source[1], (bytes, bytearray, memoryview)) or hasattr(source[1], "read")))
+
+
+def _named(source: Any, i: int) -> Tuple[str, Any]:
+    """Kaynağı (ad, yol | bayt | akış) çiftine çevir."""
+    if _is_pair(source):
+        return source
+    if isinstance(source, tuple):
+        raise TypeError(f"Source {i}: expected a (name, bytes | file object) pair, got a tuple of {len(source)}")
+    if isinstance(source, (str, os.PathLike)):
+        path = os.fspath(source)
+        return os.path.basename(path), path
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return f"document_{i}.pdf", source
+    name = getattr(source, "name", None)
+    return (os.path.basename(name) if isinstance(name, str) else f"document_{i}.pdf"), source
+
+
+def _as_reader(data: Any) -> Any:
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return io.BytesIO(data)
+    return data
+
+
+def _extract_one(item: Tuple[str, Any], cache: Any = None, **kwargs) -> PaperRecord:
+    """
+    Tek kaynak için kayıt; önbellek verildiyse içerik özeti ve okuma
+    seçenekleriyle (sayfa bütçesi, erken durdurma) anahtarlanır.
+    """
+    from .pipeline import _extract_source
+
+    name, data = item
+    key = None
+    if cache is not None:
+        from .cache import cache_variant
+
+        variant = cache_variant(kwargs.get("page_budget"), kwargs.get("early_stop", False))
+        if isinstance(data, str):
+            key = cache.key_for(data, variant)
+        else:
+            if not isinstance(data, (bytes, bytearray, memoryview)):
+                data = data.read()
+            key = cache.key_for(name, variant, digest=hashlib.sha256(data).hexdigest())
+        rec = cache.get(key, name)
+        if rec is not None:
+            return rec
+    rec = _extract_source(_as_reader(data), name, **kwargs)
+    if key is not None and not rec.extras:
+        cache.put(key, rec)
+    return rec
+
+
+def extract_records(
+    sources: Union[Source, Iterable[Source]],
+    workers: int = 1,
+    page_budget: Optional[int] = None,
+    early_stop: bool = False,
+    rule_timeout: Optional[float] = RULE_TIME_BUDGET,
+    cache_dir: Optional[str] = None,
+    errors: str = "raise",
+) -> Iterator[PaperRecord]:
+    """
+    PDF kaynaklarından PaperRecord'ları tembel olarak üret (giriş sırasıyla).
+
+    Kaynak: yol (str/PathLike), bayt, dosya benzeri nesne ya da (ad, bayt |
+    dosya benzeri nesne) çifti. Tek bir kaynak ya da kaynakların herhangi bir
+    iterable'ı (üreteç ve yol demetleri dahil: ("a.pdf", "b.pdf") iki
+    kaynaktır) verilebilir; kaynaklar ancak işlenecekleri sırada tüketilir.
+
+    workers > 1 ise bir süreç havuzu kullanılır; aynı anda en fazla 2*workers
+    belge havuzdadır (bellek sınırlı). Akışlar havuza gönderilmeden önce ana
+    süreçte okunur. cache_dir verilirse extract_pdfs ile aynı biçimde diskte
+    sonuç önbelleği kullanılır; verilmezse diske dokunulmaz.
+
+    errors="raise" ilk hatada istisnayı yükseltir; "skip" hatalı belgeyi atlar.
+    """
+    if errors not in ("raise", "skip"):
+        raise ValueError(f"Unknown errors mode: {errors}")
+    if (isinstance(sources, (str, os.PathLike, bytes, bytearray, memoryview))
+            or hasattr(sources, "read") or _is_pair(sources)):
+        sources = [sources]
+    cache = None
+    if cache_dir:
+        from .cache import ResultCache
+        cache = ResultCache(cache_dir)
+    kwargs = dict(cache=cache, page_budget=page_budget, early_stop=early_stop, rule_timeout=rule_timeout)
+    items = (_named(s, i) for i, s in enumerate(sources))
+
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    if workers == 1:
+        for item in items:
+            try:
+                yield _extract_one(item, **kwargs)
+            except Exception:
+                if errors == "raise":
+                    raise
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        window: Deque[Any] = deque()
+        exhausted = False
+        while True:
+            while not exhausted and len(window) < workers * 2:
+                item = next(items, None)
+                if item is None:
+                    exhausted = True
+                    break
+                name, data = item
+                if not isinstance(data, (str, bytes)):
+                    data = bytes(data) if isinstance(data, (bytearray, memoryview)) else data.read()
+                window.append(pool.submit(_extract_one, (name, data), **kwargs))
+            if not window:
+                break
+            try:
+                yield window.popleft().result()
+            except Exception:
+                if errors == "raise":
+                    for fut in window:
+                        fut.cancel()
+                    raise
+
+
+def extract_record(
+    source: Source,
+    name: Optional[str] = None,
+    page_budget: Optional[int] = None,
+    early_stop: bool = False,
+    rule_timeout: Optional[float] = RULE_TIME_BUDGET,
+    cache_dir: Optional[str] = None,
+) -> PaperRecord:
+    """Tek bir kaynaktan kayıt (hata olursa istisna yükseltilir); name verilirse kayıt o adı taşır."""
+    if name is not None and isinstance(source, (str, os.PathLike)):
+        # (ad, yol) bir kaynak çifti değildir (iki yol sayılır); tek belge doğrudan işlenir
+        cache = None
+        if cache_dir:
+            from .cache import ResultCache
+            cache = ResultCache(cache_dir)
+        return _extract_one((name, os.fspath(source)), cache=cache, page_budget=page_budget,
+                            early_stop=early_stop, rule_timeout=rule_timeout)
+    if name is not None and not _is_pair(source):
+        source = (name, source)
+    return next(extract_records(source, page_budget=page_budget, early_stop=early_stop,
+                                rule_timeout=rule_timeout, cache_dir=cache_dir))
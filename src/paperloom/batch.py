@@ -0,0 +1,143 @@
+import re
+from typing import Any, Dict, Iterable, List, Optional
+from .models import PaperRecord, FIELDS
+
+# -----------------------------
+#  Sütunlu kayıt grupları
+# -----------------------------
+# Kayıtlar yazıcılara tek tek değil, sütunlar halinde (alan adı → değer listesi)
+# gruplar olarak gider. Güven skoru, aralık temizliği, tip dönüşümü ve
+# U_Zn_d / U_O_p / manyetik moment ayrıştırması her grup için sütun başına
+# bir kez yapılır; JSON/JSONL/CSV/Excel/SQLite yazıcıları aynı grubu ve aynı
+# türetilmiş sütunları kullanır (satırlar her yazıcı için yeniden kurulmaz).
+
+IMPORTANT_FIELDS = [
+    "functional", "u_values", "kpoints", "bandgap_ev", "bandgap_type",
+    "doping", "vacancy", "passivation", "ndr"
+]
+
+_RE_MM_VAL = re.compile(r"([0-9]+\.?[0-9]*)")
+_RE_U_ZN = re.compile(r"U_Zn-d=([0-9.]+)")
+_RE_U_O = re.compile(r"U_O-p=([0-9.]+)")
+
+_EMPTY = (None, "", [], {})
+
+
+def _to_float(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _search_floats(regex: re.Pattern, col: List[Any]) -> List[Optional[float]]:
+    search = regex.search
+    out: List[Optional[float]] = []
+    for v in col:
+        m = search(v) if isinstance(v, str) else None
+        out.append(_to_float(m.group(1)) if m else None)
+    return out
+
+
+def confidence_column(columns: Dict[str, List[Any]], n: int) -> List[float]:
+    """Önemli alanların doluluk oranı (0..1), kayıt başına; sütun sütun sayılır."""
+    if not IMPORTANT_FIELDS:
+        return [0.0] * n
+    present = [0] * n
+    for k in IMPORTANT_FIELDS:
+        col = columns.get(k) or [None] * n
+        present = [p + (v not in _EMPTY) for p, v in zip(present, col)]
+    return [round(p / len(IMPORTANT_FIELDS), 3) for p in present]
+
+
+def _mm_number(v: Any) -> Optional[float]:
+    try:
+        return float(str(v).split()[0])
+    except Exception:
+        return None
+
+
+def sanitize_columns(columns: Dict[str, List[Any]]) -> None:
+    """
+    Fiziksel olarak anlamsız değerleri sütunlar üzerinde None yapar (yerinde).
+    (2055 yılı, 50 eV bant aralığı, saçma pasivasyon vb.)
+    """
+    # Yıl: çok eski veya çok gelecekteyse None
+    columns["year"] = [y if y is None or 1970 <= y <= 2035 else None for y in columns["year"]]
+
+    # Band gap: negatif veya aşırı büyükse (ya da sayı değilse) None
+    gaps = [None if v is None else _to_float(v) for v in columns["bandgap_ev"]]
+    columns["bandgap_ev"] = [v if g is not None and 0.0 <= g <= 10.0 else None
+                             for v, g in zip(columns["bandgap_ev"], gaps)]
+
+    # Manyetik moment: makul aralığın dışındaysa None
+    nums = [None if v is None else _mm_number(v) for v in columns["magnetic_moment"]]
+    columns["magnetic_moment"] = [v if n is not None and 0.0 <= n <= 10.0 else None
+                                  for v, n in zip(columns["magnetic_moment"], nums)]
+
+    # Passivasyon: sadece H/F/S; vacancy: sadece V_Zn veya V_O
+    columns["passivation"] = [v if v in ("H", "F", "S") else None for v in columns["passivation"]]
+    columns["vacancy"] = [v if v in ("V_Zn", "V_O") else None for v in columns["vacancy"]]
+
+
+def derive_columns(columns: Dict[str, List[Any]]) -> Dict[str, List[Any]]:
+    """
+    Excel/SQLite için tiplenmiş ve ayrıştırılmış sütunlar: year/bandgap_ev/ndr
+    tipleri, U_Zn_d / U_O_p ve magnetic_moment_value / _unit (bkz. SCI_COLS).
+    """
+    years = [_to_float(v) for v in columns["year"]]
+    mm = columns["magnetic_moment"]
+    return {
+        "bandgap_ev": [_to_float(v) for v in columns["bandgap_ev"]],
+        "year": [int(y) if y is not None else None for y in years],
+        "ndr": [bool(v) if v is not None else None for v in columns["ndr"]],
+        "magnetic_moment_value": _search_floats(_RE_MM_VAL, mm),
+        "magnetic_moment_unit": ["μB" if isinstance(v, str) else None for v in mm],
+        "U_Zn_d": _search_floats(_RE_U_ZN, columns["u_values"]),
+        "U_O_p": _search_floats(_RE_U_O, columns["u_values"]),
+    }
+
+
+class RecordBatch:
+    """
+    Bir grup kaydın sütunlu görünümü. rows() ve derived() ilk çağrıda bir kez
+    hesaplanır; aynı grubu alan tüm yazıcılar bu sonuçları paylaşır.
+    """
+
+    def __init__(self, records: Iterable[PaperRecord]):
+        self.records = list(records)
+        self.columns: Dict[str, List[Any]] = {
+            f: [getattr(r, f) for r in self.records] for f in FIELDS
+        }
+        self._rows: Optional[List[Dict[str, Any]]] = None
+        self._derived: Optional[Dict[str, List[Any]]] = None
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """Kayıt sözlükleri (PaperRecord.to_dict ile aynı anahtarlar ve sıra)."""
+        if self._rows is None:
+            cols = [self.columns[f] for f in FIELDS]
+            self._rows = [dict(zip(FIELDS, vals)) for vals in zip(*cols)]
+        return self._rows
+
+    def derived(self) -> Dict[str, List[Any]]:
+        if self._derived is None:
+            self._derived = derive_columns(self.columns)
+        return self._derived
+
+    def table(self, names: List[str]) -> List[List[Any]]:
+        """İstenen sütunlardan satırlar; türetilmiş sütunlar ham sütunların önüne geçer."""
+        derived = self.derived()
+        cols = [derived.get(c) or self.columns.get(c) or [None] * len(self) for c in names]
+        return [list(r) for r in zip(*cols)]
+
+    def sanitize(self) -> "RecordBatch":
+        """Aralık temizliğini sütunlarda çalıştır ve sonucu kayıtlara geri yaz."""
+        sanitize_columns(self.columns)
+        for f in ("year", "bandgap_ev", "magnetic_moment", "passivation", "vacancy"):
+            for r, v in zip(self.records, self.columns[f]):
+                setattr(r, f, v)
+        self._rows = self._derived = None
+        return self
@@ -0,0 +1,364 @@
+import os, sys, glob, json, math, time, shutil, tempfile, subprocess
+from typing import Callable, Dict, List, Optional, Sequence
+from .extract_rules import extract_all
+from .defaults import STARTUP_BUDGET_MS
+
+# -----------------------------
+#  Patolojik girdiler
+# -----------------------------
+# Her üreteç yaklaşık n karakterlik, bozuk bir PDF'ten gelebilecek türden bir
+# metin döndürür. Her biri belirli bir kuralın eski halinde süper-doğrusal
+# (ya da üstel) geri izlemeye yol açan yapıyı hedefler.
+
+def _repeat(unit: str, n: int) -> str:
+    return unit * max(1, n // len(unit))
+
+
+ADVERSARIAL: Dict[str, Callable[[int], str]] = {
+    # RE_TITLE_FALLBACK / RE_AUTH_FALLBACK: boşlukla ayrılmış büyük harfli kelimeler
+    "name_block_spaces": lambda n: "Some Title Line Here For Paper\n" + _repeat("Abc ", n) + "x\n",
+    "name_block_commas": lambda n: "Some Title Line Here For Paper\n" + _repeat("Abc, ", n) + "x\n",
+    "capitalized_lines": lambda n: _repeat("Abcdefghijklm Nopqrst Uvwxyz x\n", n),
+    # RE_ABS_FALLBACK: bitiş işareti olmayan çok sayıda 'abstract'
+    "abstract_no_end": lambda n: _repeat("abstract ", n),
+    "abstract_far_end": lambda n: _repeat("abstract ", n) + "\nIntroduction\n",
+    # RE_PASS_SYMBOL: anahtar kelimeler var, sembol yok
+    "passivation_keywords": lambda n: _repeat("edge " + "a" * 30 + " passivated ", n),
+    # RE_UVAL: U(Zn-d) var, U(O-p) yok
+    "u_values_without_op": lambda n: _repeat("U(Zn-d)=6.5 eV " + "z" * 40 + " ", n),
+    # RE_MM / RE_KPTS / RE_YEAR: uzun rakam dizileri
+    "long_digit_run": lambda n: "1" * n + " x μB 2 x 3 x",
+    # RE_TITLE: satır başı + uzun boşluk dizisi
+    "title_spaces": lambda n: "Title:" + " " * n + "\n",
+    # RE_DOI: çok sayıda DOI benzeri önek
+    "doi_prefixes": lambda n: _repeat("10.1234/" + "a" * 50, n),
+    # segment_text: her satır başı numaralı başlık adayı
+    "numbered_short_lines": lambda n: _repeat("\n1. Re", n),
+    # Karışık çöp: ikili veri gibi görünen metin
+    "binary_garbage": lambda n: _repeat("\x00ÿ(Zn-d U=.. eV band gap 1. doi 10.1/ edge H ", n),
+}
+
+
+def _time_once(fn: Callable[[], object]) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def bench_adversarial(
+    sizes: Sequence[int] = (20_000, 80_000, 320_000),
+    repeat: int = 3,
+    max_exponent: float = 1.35,
+) -> Dict[str, Dict[str, object]]:
+    """
+    Her patolojik girdi için extract_all süresini farklı boyutlarda ölç ve
+    büyüme üssünü (log t / log n eğimi) hesapla. Üs max_exponent'i aşarsa
+    'linear' False olur. Zaman bütçesi kapalıdır; takılan kural gerçekten ölçülür.
+    """
+    results: Dict[str, Dict[str, object]] = {}
+    for name, gen in ADVERSARIAL.items():
+        seconds: List[float] = []
+        for n in sizes:
+            text = gen(n)
+            seconds.append(min(_time_once(lambda: extract_all(text, time_budget=None))
+                               for _ in range(repeat)))
+        # Çok kısa süreler ölçüm gürültüsüdür; eğim için alt sınır koy
+        t0, t1 = max(seconds[0], 1e-4), max(seconds[-1], 1e-4)
+        exponent = math.log(t1 / t0) / math.log(sizes[-1] / sizes[0])
+        results[name] = {
+            "sizes": list(sizes),
+            "seconds": [round(s, 6) for s in seconds],
+            "exponent": round(exponent, 3),
+            "linear": exponent <= max_exponent,
+        }
+    return results
+
+
+# -----------------------------
+#  Aşama (stage) benchmark'ları
+# -----------------------------
+
+# truth.json ile çıktıyı karşılaştırırken bakılan alanlar
+TRUTH_FIELDS = ["title", "authors", "year", "doi", "doping", "functional", "edge",
+                "passivation", "vacancy", "u_values", "kpoints", "bandgap_ev",
+                "bandgap_type", "magnetic_moment", "ndr"]
+
+
+def peak_rss_mb(children: bool = False) -> float:
+    """Sürecin (ya da çocuk süreçlerin) şimdiye kadarki en yüksek RSS değeri (MB)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0.0
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    rss = resource.getrusage(who).ru_maxrss
+    # Linux KB, macOS bayt döndürür
+    return round(rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024, 1)
+
+
+def _stage(docs: int, nbytes: int, seconds: float, **extra) -> Dict[str, object]:
+    seconds = max(seconds, 1e-9)
+    out = {
+        "docs": docs,
+        "seconds": round(seconds, 6),
+        "docs_per_sec": round(docs / seconds, 3),
+        "mb_per_sec": round(nbytes / seconds / 1e6, 3),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    out.update(extra)
+    return out
+
+
+def _field_recall(records: List[dict], truth: Dict[str, dict]) -> Dict[str, float]:
+    """Gömülü doğru değerlerin alan başına ne oranda aynen bulunduğu."""
+    hits = {k: 0 for k in TRUTH_FIELDS}
+    n = 0
+    for rec in records:
+        tr = truth.get(rec.get("source_path"))
+        if tr is None:
+            continue
+        n += 1
+        for k in TRUTH_FIELDS:
+            if k in tr and rec.get(k) == tr[k]:
+                hits[k] += 1
+    return {k: round(v / n, 3) for k, v in hits.items()} if n else {}
+
+
+def bench_stages(
+    corpus_dir: Optional[str] = None,
+    n_docs: int = 20,
+    pages: int = 8,
+    page_chars: int = 3000,
+    seed: int = 0,
+    workers: int = 1,
+) -> Dict[str, object]:
+    """
+    read_pdf_text, normalize_text, extract_all, grup halinde aralık temizliği,
+    io_utils yazıcıları (tek tek ve aynı grupları paylaşarak hep birlikte) ve
+    uçtan uca extract_pdfs için throughput ölç.
+
+    corpus_dir verilmezse geçici bir klasöre sentetik korpus üretilir.
+    MB/s her aşamanın girdisi üzerinden hesaplanır (PDF baytları, ham metin,
+    normalize metin, kayıt JSON boyutu).
+    """
+    from .parse_pdf import read_pdf_text
+    from .normalize import normalize_text
+    from .pipeline import extract_pdfs, _build_record
+    from .batch import RecordBatch
+    from . import io_utils
+    from .synth import write_corpus
+
+    tmp = tempfile.mkdtemp(prefix="paperloom-bench-")
+    try:
+        if corpus_dir is None:
+            corpus_dir = os.path.join(tmp, "corpus")
+            write_corpus(corpus_dir, n_docs=n_docs, pages=pages, page_chars=page_chars, seed=seed)
+        pdfs = sorted(glob.glob(os.path.join(corpus_dir, "*.pdf")))
+        n = len(pdfs)
+        stages: Dict[str, object] = {}
+
+        t0 = time.perf_counter()
+        raws = [read_pdf_text(p) for p in pdfs]
+        stages["read_pdf_text"] = _stage(n, sum(os.path.getsize(p) for p in pdfs),
+                                         time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        norms = [normalize_text(r) for r in raws]
+        stages["normalize_text"] = _stage(n, sum(len(r.encode("utf-8")) for r in raws),
+                                          time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        feats = [extract_all(t) for t in norms]
+        stages["extract_all"] = _stage(n, sum(len(t.encode("utf-8")) for t in norms),
+                                       time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        records = RecordBatch(_build_record(os.path.basename(p), f) for p, f in zip(pdfs, feats)).sanitize().records
+        dt = time.perf_counter() - t0
+        record_bytes = sum(len(json.dumps(r.to_dict(), ensure_ascii=False).encode("utf-8")) for r in records)
+        stages["sanitize_record"] = _stage(n, record_bytes, dt)
+
+        out_dir = os.path.join(tmp, "out")
+        os.makedirs(out_dir, exist_ok=True)
+        for name, fn, fname in [
+            ("write_json", io_utils.write_json, "d.json"),
+            ("write_jsonl", io_utils.write_jsonl, "d.jsonl"),
+            ("write_csv", io_utils.write_csv, "d.csv"),
+            ("write_excel", io_utils.write_excel, "d.xlsx"),
+        ]:
+            t0 = time.perf_counter()
+            fn(os.path.join(out_dir, fname), records)
+            stages[name] = _stage(n, record_bytes, time.perf_counter() - t0,
+                                  output_bytes=os.path.getsize(os.path.join(out_dir, fname)))
+
+        # Dört yazıcı aynı sütunlu grupları paylaşarak (extract_pdfs'teki gibi)
+        t0 = time.perf_counter()
+        with io_utils.RecordWriters([io_utils.JsonArrayWriter(os.path.join(out_dir, "a.json")),
+                                     io_utils.JsonlWriter(os.path.join(out_dir, "a.jsonl")),
+                                     io_utils.CsvStreamWriter(os.path.join(out_dir, "a.csv")),
+                                     io_utils.ExcelStreamWriter(os.path.join(out_dir, "a.xlsx"))]) as out:
+            for r in records:
+                out.write(r)
+        stages["write_all"] = _stage(n, record_bytes, time.perf_counter() - t0)
+
+        e2e_dir = os.path.join(tmp, "e2e")
+        t0 = time.perf_counter()
+        extract_pdfs(corpus_dir, e2e_dir, use_cache=False, workers=workers, log_level="WARNING")
+        stages["extract_pdfs"] = _stage(n, sum(os.path.getsize(p) for p in pdfs),
+                                        time.perf_counter() - t0, workers=workers,
+                                        peak_rss_children_mb=peak_rss_mb(children=True))
+
+        result: Dict[str, object] = {
+            "meta": {"python": sys.version.split()[0], "platform": sys.platform,
+                     "cpus": os.cpu_count(), "time": int(time.time())},
+            "corpus": {"dir": corpus_dir, "docs": n, "pages": pages, "page_chars": page_chars, "seed": seed},
+            "stages": stages,
+        }
+        truth_path = os.path.join(corpus_dir, "truth.json")
+        if os.path.exists(truth_path):
+            with open(truth_path, "r", encoding="utf-8") as f:
+                truth = json.load(f)
+            result["field_recall"] = _field_recall([r.to_dict() for r in records], truth)
+        return result
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+# -----------------------------
+#  CLI açılış süresi
+# -----------------------------
+
+# `import paperloom.cli` sonrasında yüklenmemiş olması gereken modüller
+HEAVY_MODULES = ["PyPDF2", "openpyxl", "pandas", "sqlite3", "asyncio", "paperloom.pipeline"]
+
+_STARTUP_PROBE = (
+    "import sys, time; t0 = time.perf_counter(); import paperloom.cli; "
+    "t1 = time.perf_counter(); import json; "
+    "print(json.dumps({'import_ms': (t1 - t0) * 1000, "
+    "'heavy': [m for m in %r if m in sys.modules]}))" % (HEAVY_MODULES,)
+)
+
+
+def bench_startup(budget_ms: float = STARTUP_BUDGET_MS, repeat: int = 5) -> Dict[str, object]:
+    """
+    Temiz bir yorumlayıcıda `import paperloom.cli` süresini ölç (en iyi / ortanca)
+    ve ağır bağımlılıkların yüklenmediğini doğrula. En iyi süre budget_ms'i
+    aşarsa ya da HEAVY_MODULES'tan biri yüklendiyse 'ok' False olur.
+    """
+    runs: List[float] = []
+    heavy: List[str] = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", _STARTUP_PROBE],
+                             capture_output=True, text=True, check=True)
+        probe = json.loads(out.stdout.strip().splitlines()[-1])
+        runs.append(probe["import_ms"])
+        heavy = probe["heavy"]
+    runs.sort()
+    return {
+        "budget_ms": budget_ms,
+        "best_ms": round(runs[0], 3),
+        "median_ms": round(runs[len(runs) // 2], 3),
+        "heavy_modules_loaded": heavy,
+        "ok": runs[0] <= budget_ms and not heavy,
+    }
+
+
+# -----------------------------
+#  Normalizer eşdeğerliği
+# -----------------------------
+
+def _reference_normalize(text: str) -> str:
+    """normalize_text'in eski (geçiş geçiş re.sub) hali; eşdeğerlik için referans."""
+    import re, unicodedata
+    from .normalize import LIGATURES
+
+    text = unicodedata.normalize("NFKC", text or "")
+    for k, v in LIGATURES.items():
+        text = text.replace(k, v)
+    text = re.sub(r"(\w)-\s*\n\s*(\w)", r"\1\2", text)
+    text = re.sub(r"(\d)\s*×\s*(\d)", r"\1x\2", text)
+    text = re.sub(r"(\d)\s*[xX]\s*(\d)\s*[xX]\s*(\d)", r"\1x\2x\3", text)
+    text = re.sub(r"[ \t]+", " ", text)
+    text = re.sub(r"\s*\n\s*", "\n", text)
+    return text.strip()
+
+
+# Kenar durumları: satır sonu tireleri, zincirleme ×/x, karışık boşluklar,
+# ligatürler, birleşen aksanlar, uyumluluk rakamları
+_NORMALIZE_ATOMS = (
+    "a", "Z", "x", "X", "1", "5", "-", " ", "  ", "\t", "\n", "\n\n", " \n ", "\r", "\x0b", "\x0c",
+    "\u00ad", "\ufb01", "\ufb03", "\u00d7", "\u00e9", "e\u0301", "\u0301", "\u00a8", "\u3000", "\u2009",
+    "\xa0", "\x85", ".", ",", "\u00b2", "\uff15", "\uff58", "\u0663", "_", "nano-", "-\n", "5x", " x ",
+    "\u1100", "\u1161",
+)
+
+
+def _normalize_corpus(n_docs: int, pages: int, page_chars: int, cases: int, seed: int) -> List[List[str]]:
+    """Sayfalara bölünmüş metinler: sentetik makaleler + rastgele kenar durumu dizileri."""
+    import random
+    from .synth import synth_paper
+
+    rng = random.Random(seed)
+    docs = [synth_paper(rng, pages=pages, page_chars=page_chars)[0] for _ in range(n_docs)]
+    for _ in range(cases):
+        text = "".join(rng.choice(_NORMALIZE_ATOMS) for _ in range(rng.randint(0, 60)))
+        cuts = sorted(rng.sample(range(len(text) + 1), min(len(text) + 1, rng.randint(0, 4))))
+        docs.append([text[a:b] for a, b in zip([0] + cuts, cuts + [len(text)])])
+    return docs
+
+
+def bench_normalize(
+    n_docs: int = 20,
+    pages: int = 8,
+    page_chars: int = 3000,
+    cases: int = 20000,
+    seed: int = 0,
+    repeat: int = 3,
+) -> Dict[str, object]:
+    """
+    normalize_text ve parça parça Normalizer'ın eski re.sub zinciriyle birebir
+    aynı çıktı verdiğini bir eşdeğerlik korpusunda doğrula ve üçünün
+    throughput'unu ölç. Kenar durumları rastgele noktalardan bölünerek
+    Normalizer'a verilir; sentetik makaleler sayfa sayfa. 'ok' = hiç fark yok.
+    """
+    from .normalize import normalize_text, Normalizer
+
+    docs = _normalize_corpus(n_docs, pages, page_chars, cases, seed)
+
+    def chunked(parts: List[str]) -> str:
+        norm = Normalizer()
+        return "".join([norm.feed(p) for p in parts] + [norm.finish()])
+
+    mismatches: List[Dict[str, str]] = []
+    n_bad = 0
+    for parts in docs:
+        text = "".join(parts)
+        want = _reference_normalize(text)
+        for name, got in (("normalize_text", normalize_text(text)), ("Normalizer", chunked(parts))):
+            if got != want:
+                n_bad += 1
+                if len(mismatches) < 5:
+                    mismatches.append({"impl": name, "input": text[:200], "got": got[:200], "want": want[:200]})
+
+    # Throughput: yalnızca makaleler (kenar durumları çok kısa)
+    papers = docs[:n_docs]
+    texts = ["".join(p) for p in papers]
+    nbytes = sum(len(t.encode("utf-8")) for t in texts)
+    timings = {
+        "reference": lambda: [_reference_normalize(t) for t in texts],
+        "normalize_text": lambda: [normalize_text(t) for t in texts],
+        "Normalizer": lambda: [chunked(p) for p in papers],
+    }
+    throughput = {}
+    for name, fn in timings.items():
+        best = min(_time_once(fn) for _ in range(repeat))
+        throughput[name] = _stage(len(texts), nbytes, best)
+    ref_s = throughput["reference"]["seconds"]
+    return {
+        "cases": len(docs),
+        "mismatches": n_bad,
+        "examples": mismatches,
+        "throughput": throughput,
+        "speedup": round(ref_s / max(throughput["normalize_text"]["seconds"], 1e-9), 2),
+        "ok": n_bad == 0,
+    }
@@ -0,0 +1,122 @@
+import os, struct, hashlib, tempfile
+from typing import Optional
+from .models import PaperRecord
+from .codec import encode_record, decode_record
+from . import batch, extract_rules, normalize, segment
+
+CACHE_VERSION = "2"
+
+
+def file_sha256(path: str, chunk_size: int = 1 << 20) -> str:
+    """Dosya içeriğinin SHA-256 özetini parça parça okuyarak hesapla."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def rules_fingerprint() -> str:
+    """
+    extract_rules.py, segment.py, normalize.py ve batch.py (temizleme/türetme
+    kuralları) kaynaklarının özetini döndür. Kurallar değiştiğinde eski
+    önbellek girdileri kendiliğinden geçersiz olur.
+    """
+    h = hashlib.sha256(CACHE_VERSION.encode())
+    for mod in (extract_rules, segment, normalize, batch):
+        with open(mod.__file__, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()[:16]
+
+
+def cache_variant(page_budget: Optional[int], early_stop: bool) -> str:
+    """Sonucu değiştiren okuma seçeneklerinin anahtar parçası (tam okuma için boş)."""
+    return "" if page_budget is None and not early_stop else f"p{page_budget}-e{int(early_stop)}"
+
+
+class ResultCache:
+    """
+    İçerik adresli, diskte kalıcı sonuç önbelleği.
+
+    Anahtar = dosya içeriğinin SHA-256'sı + kural parmak izi. Her girdi ayrı bir
+    dosyadır (codec.py ikili kayıt biçimi); yazma atomiktir (geçici dosya + os.replace), bu yüzden
+    paralel işçiler aynı önbelleği güvenle paylaşabilir. Boyut sınırı aşılınca
+    en uzun süredir kullanılmayan girdiler silinir.
+    """
+
+    def __init__(self, root: str, max_bytes: int = 512 * 1024 * 1024, rebuild: bool = False):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.rebuild = rebuild
+        self.fingerprint = rules_fingerprint()
+        os.makedirs(root, exist_ok=True)
+
+    def key_for(self, path: str, variant: str = "", digest: Optional[str] = None) -> str:
+        """
+        variant: sonucu değiştiren seçenekler (ör. sayfa bütçesi) için ek anahtar parçası.
+        digest: dosyanın önceden hesaplanmış SHA-256'sı (yeniden okunmasın diye).
+        """
+        key = f"{digest or file_sha256(path)}-{self.fingerprint}"
+        return f"{key}-{variant}" if variant else key
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key + ".rec")
+
+    def get(self, key: str, source_path: str) -> Optional[PaperRecord]:
+        """Önbellekteki kaydı döndür; yoksa (veya rebuild modundaysa) None."""
+        if self.rebuild:
+            return None
+        entry = self._entry_path(key)
+        try:
+            with open(entry, "rb") as f:
+                rec = decode_record(f.read())
+        except (OSError, ValueError, struct.error, UnicodeDecodeError):
+            return None
+        # LRU için erişim zamanını güncelle
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+        # Aynı içerik farklı adla gelmiş olabilir
+        rec.source_path = source_path
+        return rec
+
+    def put(self, key: str, rec: PaperRecord) -> None:
+        entry = self._entry_path(key)
+        os.makedirs(os.path.dirname(entry), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(entry), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(encode_record(rec))
+            os.replace(tmp, entry)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def evict(self) -> int:
+        """Toplam boyut sınırın altına inene kadar en eski girdileri sil; silinen sayısını döndür."""
+        entries = []
+        total = 0
+        for dirpath, _, files in os.walk(self.root):
+            for fn in files:
+                p = os.path.join(dirpath, fn)
+                try:
+                    st = os.stat(p)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, p))
+                total += st.st_size
+
+        removed = 0
+        entries.sort()
+        for _, size, p in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(p)
+                total -= size
+                removed += 1
+            except OSError:
+                pass
+        return removed
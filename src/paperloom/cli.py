@@ -1,5 +1,9 @@
-import typer, os
-from .pipeline import extract_pdfs
+import typer, os, sys, json
+from typing import List
+from .defaults import PAGE_THRESHOLD, RULE_TIME_BUDGET, STARTUP_BUDGET_MS
+
+# Ağır bağımlılıklar (PyPDF2, openpyxl, sqlite3, asyncio...) yalnızca onları
+# kullanan komut çalıştığında, komut gövdesi içinde içe aktarılır.
 
 app = typer.Typer(help="Paperloom Extractor (M5.1)")
 
@@ -7,19 +11,291 @@ app = typer.Typer(help="Paperloom Extractor (M5.1)")
 def extract(
     input: str = typer.Option("data/inputs", help="Folder with PDFs"),
     output: str = typer.Option("data/outputs", help="Folder for outputs"),
-    json_name: str = typer.Option("znr_dataset.json"),
-    csv_name: str = typer.Option("znr_dataset.csv"),
-    excel_name: str = typer.Option("znr_dataset.xlsx"),
+    json_name: str = typer.Option("znr_dataset.json", help="JSON output (empty string = skip)"),
+    csv_name: str = typer.Option("znr_dataset.csv", help="CSV output (empty string = skip)"),
+    excel_name: str = typer.Option("znr_dataset.xlsx", help="Excel output (empty string = skip)"),
+    writer: List[str] = typer.Option(None, help="Extra output NAME=FILE using a built-in or plugin writer (repeatable)"),
+    jsonl_name: str = typer.Option(None, help="Also stream JSON Lines (gzip if it ends with .gz)"),
+    sqlite_name: str = typer.Option(None, help="Also upsert records into this SQLite database (relative to output)"),
+    sqlite_key: str = typer.Option("sha", help="SQLite upsert key: sha (file hash) | doi"),
     log_level: str = typer.Option("INFO", help="DEBUG|INFO|WARNING|ERROR|CRITICAL"),
+    workers: int = typer.Option(1, help="Parallel worker processes (0 = all cores)"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Disable the on-disk result cache"),
+    rebuild_cache: bool = typer.Option(False, "--rebuild-cache", help="Ignore cached results and re-parse every PDF"),
+    cache_dir: str = typer.Option(None, help="Cache folder (default: <output>/.paperloom-cache)"),
+    cache_size_mb: int = typer.Option(512, help="Maximum cache size in MB"),
+    max_pages: int = typer.Option(None, help="Page budget: read at most this many pages per PDF"),
+    early_stop: bool = typer.Option(False, "--early-stop", help="Stop reading a PDF once all key fields and metadata are found"),
+    rule_timeout: float = typer.Option(RULE_TIME_BUDGET, help="Time budget per extraction rule in seconds (0 = unlimited)"),
+    page_workers: int = typer.Option(1, help="Processes used to read the pages of one large PDF in parallel"),
+    page_threshold: int = typer.Option(PAGE_THRESHOLD, help="Only PDFs with more pages than this are read page-parallel"),
+    resume: bool = typer.Option(False, "--resume", help="Skip files completed in the run journal and rebuild outputs from it"),
+    profile: bool = typer.Option(False, "--profile", help="Log per-stage/per-rule timings and write a metrics file"),
+    metrics_name: str = typer.Option("metrics.json", help="Metrics file written with --profile"),
+    top_n: int = typer.Option(10, help="Slowest documents/rules listed in the metrics file"),
+    dedup: str = typer.Option("off", help="Duplicate papers before parsing: off | skip | merge (list copies in the kept record)"),
+    dedup_threshold: float = typer.Option(0.8, help="First-page text similarity (0..1) above which two PDFs are near-duplicates"),
+    shard: str = typer.Option(None, help="Process only shard K/N of the input (stable across machines); combine with 'merge'"),
+    store_text: str = typer.Option(None, help="Also keep normalized texts in this text store folder for 'reextract'"),
+    doc_timeout: float = typer.Option(None, help="Kill a document's worker after this many seconds and quarantine the file"),
+    max_rss_mb: float = typer.Option(None, help="Kill a worker whose memory (RSS) exceeds this many MB and quarantine the file"),
+    max_tasks_per_worker: int = typer.Option(None, help="Recycle each supervised worker after this many documents"),
+    retry_quarantined: bool = typer.Option(False, "--retry-quarantined", help="Process files listed in quarantine.json again"),
+    recursive: bool = typer.Option(False, "--recursive", help="Also scan subfolders (source_path becomes the relative path)"),
+    include: List[str] = typer.Option(None, help="Glob of files to process, matched on the name or relative path (repeatable; default *.pdf)"),
+    exclude: List[str] = typer.Option(None, help="Glob of files/folders to skip (repeatable)"),
+    manifest: str = typer.Option(None, help="File listing PDF paths, one per line ('-' = stdin); replaces folder scanning"),
+    schedule: str = typer.Option("input", help="Processing order: input | size | pages (largest first; output order unchanged)"),
+    progress: bool = typer.Option(None, "--progress/--no-progress", help="Live progress line on stderr: docs/s, pages/s, ETA, in flight, failed (default: when stderr is a terminal)"),
+    metrics_textfile: str = typer.Option(None, help="Keep rewriting live metrics to this Prometheus textfile (relative to output; name it *.prom)"),
+    metrics_interval: float = typer.Option(15.0, help="Seconds between --metrics-textfile refreshes"),
 ):
     """Extract ZnO features from PDFs and export JSON, CSV, and Excel (multi-sheet)."""
     if not os.path.exists(input):
         raise typer.BadParameter(f"Input directory not found: {input}")
+    if sqlite_key not in ("sha", "doi"):
+        raise typer.BadParameter(f"Unknown SQLite key: {sqlite_key}")
+    if dedup not in ("off", "skip", "merge"):
+        raise typer.BadParameter(f"Unknown dedup mode: {dedup}")
+    if schedule not in ("input", "size", "pages"):
+        raise typer.BadParameter(f"Unknown schedule: {schedule}")
+    if manifest and manifest != "-" and not os.path.isfile(manifest):
+        raise typer.BadParameter(f"Manifest not found: {manifest}")
+    if store_text and (max_pages is not None or early_stop):
+        raise typer.BadParameter("--store-text needs full reads; drop --max-pages/--early-stop")
+    shard_kn = None
+    if shard:
+        from .shard import parse_shard
+
+        try:
+            shard_kn = parse_shard(shard)
+        except ValueError as e:
+            raise typer.BadParameter(str(e))
+    extra_writers = []
+    if writer:
+        from .plugins import available_writers
+
+        known = available_writers()
+        for spec in writer:
+            name, sep, file_name = spec.partition("=")
+            if not sep or not file_name:
+                raise typer.BadParameter(f"Expected NAME=FILE, got: {spec}")
+            if name not in known:
+                raise typer.BadParameter(f"Unknown writer: {name} (available: {', '.join(sorted(known))})")
+            extra_writers.append((name, file_name))
+    from .pipeline import extract_pdfs
+
+    on_progress, tty = None, sys.stderr.isatty()
+    if progress if progress is not None else tty:
+        from .telemetry import format_status
+
+        def on_progress(snap):
+            line = format_status(snap)
+            if tty:
+                # Satırı yerinde güncelle; çalışma bitince alt satıra geç
+                typer.echo("\r" + line + "\x1b[K", err=True, nl=not snap["running"])
+            else:
+                typer.echo(line, err=True)
+
     os.makedirs(output, exist_ok=True)
     extract_pdfs(input, output,
                  json_name=json_name, csv_name=csv_name, excel_name=excel_name,
-                 log_level=log_level)
-    typer.echo(f"Wrote JSON, CSV, and Excel to {output}")
+                 jsonl_name=jsonl_name, sqlite_name=sqlite_name, sqlite_key=sqlite_key,
+                 log_level=log_level, workers=workers,
+                 use_cache=not no_cache, rebuild_cache=rebuild_cache,
+                 cache_dir=cache_dir, cache_max_mb=cache_size_mb,
+                 page_budget=max_pages, early_stop=early_stop,
+                 rule_timeout=rule_timeout or None,
+                 profile=profile, metrics_name=metrics_name, top_n=top_n,
+                 page_workers=page_workers, page_threshold=page_threshold,
+                 resume=resume, extra_writers=extra_writers,
+                 dedup=dedup, dedup_threshold=dedup_threshold, shard=shard_kn,
+                 store_text=store_text, doc_timeout=doc_timeout, max_rss_mb=max_rss_mb,
+                 max_tasks_per_worker=max_tasks_per_worker, retry_quarantined=retry_quarantined,
+                 recursive=recursive, include=include or None, exclude=exclude or None,
+                 manifest=manifest, schedule=schedule, progress=on_progress,
+                 progress_interval=1.0 if tty else 30.0, metrics_textfile=metrics_textfile,
+                 metrics_interval=metrics_interval)
+    typer.echo(f"Wrote outputs to {output}")
+
+@app.command()
+def merge(
+    parts: List[str] = typer.Argument(..., help="Shard outputs: JSONL/CSV/SQLite files or shard output folders"),
+    output: str = typer.Option("data/outputs", help="Folder for the merged outputs"),
+    json_name: str = typer.Option("znr_dataset.json", help="JSON output (empty string = skip)"),
+    csv_name: str = typer.Option("znr_dataset.csv", help="CSV output (empty string = skip)"),
+    excel_name: str = typer.Option("znr_dataset.xlsx", help="Excel output (empty string = skip)"),
+    jsonl_name: str = typer.Option(None, help="Also write merged JSON Lines"),
+):
+    """Merge partial shard outputs into the final JSON, CSV and multi-sheet Excel files."""
+    from .shard import merge_outputs
+
+    for p in parts:
+        if not os.path.exists(p):
+            raise typer.BadParameter(f"Part not found: {p}")
+    n = merge_outputs(parts, output, json_name=json_name, csv_name=csv_name,
+                      excel_name=excel_name, jsonl_name=jsonl_name)
+    typer.echo(f"Merged {n} record(s) from {len(parts)} part(s) into {output}")
+
+@app.command()
+def reextract(
+    store: str = typer.Argument(..., help="Text store folder written by 'extract --store-text'"),
+    output: str = typer.Option("data/outputs", help="Output folder"),
+    json_name: str = typer.Option("znr_dataset.json", help="JSON output (empty string = skip)"),
+    csv_name: str = typer.Option("znr_dataset.csv", help="CSV output (empty string = skip)"),
+    excel_name: str = typer.Option("znr_dataset.xlsx", help="Excel output (empty string = skip)"),
+    jsonl_name: str = typer.Option(None, help="Also write JSON Lines"),
+    log_level: str = typer.Option("INFO", help="DEBUG|INFO|WARNING|ERROR|CRITICAL"),
+    workers: int = typer.Option(1, help="Parallel worker processes (0 = all cores)"),
+    rule_timeout: float = typer.Option(RULE_TIME_BUDGET, help="Time budget per extraction rule in seconds (0 = unlimited)"),
+):
+    """Re-run only the extraction rules over stored texts, without parsing PDFs again."""
+    from .pipeline import reextract_store
+
+    if not os.path.isdir(store):
+        raise typer.BadParameter(f"Text store not found: {store}")
+    n = reextract_store(store, output, json_name=json_name, csv_name=csv_name,
+                        excel_name=excel_name, jsonl_name=jsonl_name, log_level=log_level,
+                        workers=workers, rule_timeout=rule_timeout or None)
+    typer.echo(f"Re-extracted {n} record(s) into {output}")
+
+@app.command()
+def writers():
+    """List output writers (built-in and 'paperloom.writers' plugins) without importing them."""
+    from .plugins import available_writers
+
+    for name, target in sorted(available_writers().items()):
+        typer.echo(f"{name}\t{target}")
+
+@app.command()
+def watch(
+    input: str = typer.Option("data/inputs", help="Folder to watch for PDFs"),
+    output: str = typer.Option("data/outputs", help="Folder for outputs"),
+    jsonl_name: str = typer.Option("znr_dataset.jsonl", help="JSON Lines output (appended)"),
+    csv_name: str = typer.Option("znr_dataset.csv", help="CSV output (appended)"),
+    sqlite_name: str = typer.Option(None, help="Also upsert records into this SQLite database"),
+    sqlite_key: str = typer.Option("sha", help="SQLite upsert key: sha (file hash) | doi"),
+    log_level: str = typer.Option("INFO", help="DEBUG|INFO|WARNING|ERROR|CRITICAL"),
+    workers: int = typer.Option(1, help="Warm worker processes (0 = all cores)"),
+    interval: float = typer.Option(1.0, help="Seconds between folder scans"),
+    max_queue: int = typer.Option(None, help="Maximum files in flight in the pool (default: 4 x workers)"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Disable the on-disk result cache"),
+    cache_dir: str = typer.Option(None, help="Cache folder (default: <output>/.paperloom-cache)"),
+    rule_timeout: float = typer.Option(RULE_TIME_BUDGET, help="Time budget per extraction rule in seconds (0 = unlimited)"),
+    once: bool = typer.Option(False, "--once", help="Process the current backlog and exit"),
+    recursive: bool = typer.Option(False, "--recursive", help="Also watch subfolders (source_path becomes the relative path)"),
+    include: List[str] = typer.Option(None, help="Glob of files to process, matched on the name or relative path (repeatable; default *.pdf)"),
+    exclude: List[str] = typer.Option(None, help="Glob of files/folders to skip (repeatable)"),
+):
+    """Watch a folder and append records for new or modified PDFs (Ctrl-C to stop)."""
+    from .watch import watch_folder
+
+    if not os.path.exists(input):
+        raise typer.BadParameter(f"Input directory not found: {input}")
+    if sqlite_key not in ("sha", "doi"):
+        raise typer.BadParameter(f"Unknown SQLite key: {sqlite_key}")
+    n = watch_folder(input, output, jsonl_name=jsonl_name, csv_name=csv_name,
+                     sqlite_name=sqlite_name, sqlite_key=sqlite_key, log_level=log_level,
+                     workers=workers, interval=interval, max_queue=max_queue,
+                     use_cache=not no_cache, cache_dir=cache_dir,
+                     rule_timeout=rule_timeout or None, once=once,
+                     recursive=recursive, include=include or None, exclude=exclude or None)
+    typer.echo(f"Appended {n} record(s) to {output}")
+
+@app.command()
+def serve(
+    host: str = typer.Option("127.0.0.1", help="Address to bind"),
+    port: int = typer.Option(8765, help="Port to listen on"),
+    workers: int = typer.Option(1, help="Pre-warmed worker processes (0 = all cores)"),
+    max_concurrency: int = typer.Option(None, help="Documents processed at once (default: 2 x workers)"),
+    max_body_mb: int = typer.Option(64, help="Largest accepted request body in MB"),
+    rule_timeout: float = typer.Option(RULE_TIME_BUDGET, help="Time budget per extraction rule in seconds (0 = unlimited)"),
+    log_level: str = typer.Option("INFO", help="DEBUG|INFO|WARNING|ERROR|CRITICAL"),
+):
+    """Serve PDF-to-record extraction over local HTTP (/extract, /extract/batch, /health, /stats)."""
+    import logging
+    from .serve import serve as run_server
+
+    logging.basicConfig(level=getattr(logging, log_level.upper(), logging.INFO),
+                        format="%(asctime)s %(levelname)s: %(message)s")
+    run_server(host, port, workers=workers, max_concurrency=max_concurrency,
+               max_body_mb=max_body_mb, rule_timeout=rule_timeout or None)
+
+@app.command()
+def bench(
+    suite: str = typer.Option("adversarial", help="adversarial|stages|startup|normalize|all"),
+    json_out: str = typer.Option(None, help="Also write the results as JSON to this file"),
+    check: bool = typer.Option(False, "--check", help="Exit with code 1 if an adversarial input scales super-linearly, startup is over budget or the normalizer differs from the reference"),
+    startup_budget_ms: float = typer.Option(STARTUP_BUDGET_MS, help="Startup suite: import-time budget for paperloom.cli in ms"),
+    corpus: str = typer.Option(None, help="Stage suite: existing PDF folder (default: generate a synthetic corpus)"),
+    docs: int = typer.Option(20, help="Stage suite: number of synthetic documents"),
+    pages: int = typer.Option(8, help="Stage suite: pages per synthetic document"),
+    page_chars: int = typer.Option(3000, help="Stage suite: characters per synthetic page"),
+    seed: int = typer.Option(0, help="Stage suite: random seed for the synthetic corpus"),
+    workers: int = typer.Option(1, help="Stage suite: workers for the end-to-end extract_pdfs run"),
+):
+    """Run the offline benchmarks (adversarial rule inputs, per-stage throughput, CLI startup, normalizer equivalence)."""
+    from .bench import bench_adversarial, bench_stages, bench_startup, bench_normalize
+
+    if suite not in ("adversarial", "stages", "startup", "normalize", "all"):
+        raise typer.BadParameter(f"Unknown suite: {suite}")
+    results = {}
+    if suite in ("adversarial", "all"):
+        results["adversarial"] = bench_adversarial()
+    if suite in ("startup", "all"):
+        results["startup"] = bench_startup(startup_budget_ms)
+    if suite in ("normalize", "all"):
+        results["normalize"] = bench_normalize(n_docs=docs, pages=pages, page_chars=page_chars, seed=seed)
+    if suite in ("stages", "all"):
+        results["stages"] = bench_stages(corpus, n_docs=docs, pages=pages, page_chars=page_chars,
+                                         seed=seed, workers=workers)
+    text = json.dumps(results, indent=2)
+    typer.echo(text)
+    if json_out:
+        with open(json_out, "w", encoding="utf-8") as f:
+            f.write(text)
+    if check and "adversarial" in results and not all(r["linear"] for r in results["adversarial"].values()):
+        raise typer.Exit(code=1)
+    if check and "startup" in results and not results["startup"]["ok"]:
+        raise typer.Exit(code=1)
+    if check and "normalize" in results and not results["normalize"]["ok"]:
+        raise typer.Exit(code=1)
+
+@app.command()
+def synth(
+    output: str = typer.Option("data/synthetic", help="Folder for the generated PDFs and truth.json"),
+    docs: int = typer.Option(20, help="Number of documents"),
+    pages: int = typer.Option(8, help="Pages per document"),
+    page_chars: int = typer.Option(3000, help="Characters per page"),
+    page_jitter: int = typer.Option(0, help="Add 0..N extra pages per document"),
+    seed: int = typer.Option(0, help="Random seed"),
+):
+    """Generate a synthetic ZnO paper corpus with known (planted) values."""
+    from .synth import write_corpus
+
+    paths = write_corpus(output, n_docs=docs, pages=pages, page_chars=page_chars,
+                         seed=seed, page_jitter=page_jitter or None)
+    typer.echo(f"Wrote {len(paths)} PDF(s) and truth.json to {output}")
+
+@app.command()
+def query(
+    database: str = typer.Argument(..., help="SQLite database written with --sqlite-name"),
+    where: List[str] = typer.Option(None, help="Condition COLUMN OP VALUE, OP one of = != < <= > >= ~ (LIKE); repeatable, joined with AND. E.g. --where doping=Co --where 'bandgap_ev>=1'"),
+    order_by: str = typer.Option("source_path", help="Sort column, optionally followed by DESC"),
+    limit: int = typer.Option(None, help="Maximum number of rows"),
+):
+    """Query a SQLite record store; prints one JSON object per line."""
+    from .io_utils import parse_condition, query_sqlite
+
+    if not os.path.exists(database):
+        raise typer.BadParameter(f"Database not found: {database}")
+    try:
+        conditions = [parse_condition(w) for w in where or []]
+        rows = query_sqlite(database, conditions, order_by=order_by, limit=limit)
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
+    for row in rows:
+        typer.echo(json.dumps(row, ensure_ascii=False))
 
 def main():
     app()
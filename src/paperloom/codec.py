@@ -0,0 +1,121 @@
+import json, struct
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Dict, List, Optional, Tuple
+from .models import PaperRecord, FIELDS
+
+# -----------------------------
+#  İkili kayıt kodlaması
+# -----------------------------
+# Sabit şemalı, sıkı bir PaperRecord kodlaması (önbellek girdileri ve süreçler
+# arası taşıma için). Düzen (little-endian):
+#   [sürüm: B][doluluk maskesi: I, bit i = FIELDS[i] None değil]
+#   [sabit blok: dolu kategorik alanlar için B kod, year i, bandgap_ev/confidence d, ndr ?]
+#   [uzunluklar: I; önce tabloda olmayan kategori değerleri, sonra metin alanları]
+#   [yük: bu metinlerin UTF-8 baytları aynı sırayla art arda; extras JSON olarak]
+# Sabit bloğun biçimi yalnızca maskeye bağlıdır ve maske başına bir kez
+# derlenir (lru_cache); sayılar ve kodlar tek bir struct çağrısıyla okunur.
+# Boyut JSON'un yaklaşık yarısıdır; ResultCache girdileri bu biçimdedir.
+# Kategorik alanların (edge, passivation, functional, vacancy, bandgap_type)
+# bilinen değerleri tek bayta iner; tabloda olmayan bir değer (ör. küçük
+# harfli "pbe") 0 koduyla metin olarak yazılır, yani kodlama kayıpsızdır.
+# Tablolara yalnızca sona ekleme yapılmalı; sıra değişirse CODEC_VERSION artar.
+
+CODEC_VERSION = 1
+
+CATEGORIES: Dict[str, Tuple[str, ...]] = {
+    "edge": ("zigzag", "armchair", "ZZ", "AC"),
+    "passivation": ("H", "F", "S"),
+    "functional": ("PBE", "LDA", "GGA", "HSE", "PBE0", "SCAN", "B3LYP", "LDA+U", "GGA+U"),
+    "vacancy": ("V_Zn", "V_O"),
+    "bandgap_type": ("direct", "indirect"),
+}
+_NUMERIC = {"year": "i", "bandgap_ev": "d", "confidence": "d", "ndr": "?"}
+
+_N = len(FIELDS)
+_EXTRAS = FIELDS.index("extras")
+# Alan sırasına göre: kategori tablosu (değer → kod) ve ters tablo (kod → değer)
+_CODES: List[Optional[Dict[str, int]]] = [
+    {v: i + 1 for i, v in enumerate(CATEGORIES[f])} if f in CATEGORIES else None for f in FIELDS
+]
+_VALUES: List[Optional[Tuple[Any, ...]]] = [
+    (None,) + CATEGORIES[f] if f in CATEGORIES else None for f in FIELDS
+]
+_HEADER = struct.Struct("<BI")
+_get_all = attrgetter(*FIELDS)
+
+
+@lru_cache(maxsize=None)
+def _layout(mask: int) -> Tuple[struct.Struct, Tuple[int, ...], Tuple[int, ...]]:
+    """Maske için (sabit blok struct'ı, sabit bloktaki alan indeksleri, metin alanı indeksleri)."""
+    fmt, fixed, texts = ["<"], [], []
+    for i, f in enumerate(FIELDS):
+        if not mask >> i & 1:
+            continue
+        if f in CATEGORIES or f in _NUMERIC:
+            fmt.append(_NUMERIC.get(f, "B"))
+            fixed.append(i)
+        else:
+            texts.append(i)
+    return struct.Struct("".join(fmt)), tuple(fixed), tuple(texts)
+
+
+def encode_record(rec: PaperRecord) -> bytes:
+    """Kaydı ikili biçime çevir."""
+    vals = _get_all(rec)
+    mask = 0
+    for i, v in enumerate(vals):
+        if v is not None:
+            mask |= 1 << i
+    block, fixed, texts = _layout(mask)
+    head: List[Any] = []
+    blobs: List[bytes] = []
+    for i in fixed:
+        codes = _CODES[i]
+        if codes is None:
+            head.append(vals[i])
+            continue
+        code = codes.get(vals[i], 0)
+        head.append(code)
+        if not code:
+            blobs.append(vals[i].encode("utf-8"))
+    for i in texts:
+        v = vals[i]
+        blobs.append((json.dumps(v, ensure_ascii=False) if i == _EXTRAS else v).encode("utf-8"))
+    return b"".join((
+        _HEADER.pack(CODEC_VERSION, mask),
+        block.pack(*head),
+        struct.pack(f"<{len(blobs)}I", *map(len, blobs)),
+        *blobs,
+    ))
+
+
+def decode_record(data: bytes) -> PaperRecord:
+    """encode_record'un tersi. Bilinmeyen sürümde ya da bozuk veride ValueError (ya da struct.error)."""
+    version, mask = _HEADER.unpack_from(data, 0)
+    if version != CODEC_VERSION:
+        raise ValueError(f"Unsupported record codec version: {version}")
+    block, fixed, texts = _layout(mask)
+    pos = _HEADER.size
+    head = block.unpack_from(data, pos)
+    pos += block.size
+    vals: List[Any] = [None] * _N
+    escaped = []
+    for i, v in zip(fixed, head):
+        table = _VALUES[i]
+        if table is None:
+            vals[i] = v
+        elif v:
+            if v >= len(table):
+                raise ValueError(f"Unknown {FIELDS[i]} code: {v}")
+            vals[i] = table[v]
+        else:
+            escaped.append(i)
+    order = escaped + list(texts)
+    lens = struct.unpack_from(f"<{len(order)}I", data, pos)
+    pos += 4 * len(order)
+    for i, n in zip(order, lens):
+        text = str(data[pos:pos + n], "utf-8")
+        pos += n
+        vals[i] = json.loads(text) if i == _EXTRAS else text
+    return PaperRecord(*vals)
@@ -0,0 +1,160 @@
+import os, re, hashlib
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from .cache import file_sha256
+from .normalize import normalize_text
+from .parse_pdf import iter_pdf_pages
+from .discover import source_name
+
+# -----------------------------
+#  Kopya makale tespiti
+# -----------------------------
+# Tam ayrıştırmadan önce çalışan ucuz bir aşama:
+#   1) Bayt bayt aynı dosyalar: boyutu çakışan dosyaların SHA-256'sı.
+#   2) Yakın kopyalar (ön baskı + yayımlanmış sürüm, yeniden adlandırılmış kopya):
+#      yalnızca ilk sayfa okunur; DOI'si aynı olanlar ya da ilk sayfa metninin
+#      kelime üçlülerinden çıkarılan bottom-k parmak izi yeterince benzer olanlar.
+
+# extract_rules.RE_DOI kayıt için ilk "."da durur; burada DOI'nin tamamı gerekir
+RE_DOI_FULL = re.compile(r"\b(10\.\d{4,9}/[^\s\"<>]+)", re.IGNORECASE)
+_WORD = re.compile(r"[a-z0-9]+")
+
+SKETCH_SIZE = 64
+SHINGLE = 3
+
+
+def _sketch(text: str, k: int = SKETCH_SIZE) -> Tuple[int, ...]:
+    """Kelime üçlülerinin 64 bitlik özetlerinden en küçük k tanesi (bottom-k MinHash)."""
+    words = _WORD.findall(text.lower())
+    shingles = {" ".join(words[i:i + SHINGLE]) for i in range(max(1, len(words) - SHINGLE + 1))}
+    hashes = sorted(
+        int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "big")
+        for s in shingles if s
+    )
+    return tuple(hashes[:k])
+
+
+def similarity(a: Tuple[int, ...], b: Tuple[int, ...], k: int = SKETCH_SIZE) -> float:
+    """İki bottom-k parmak izinden Jaccard benzerliği tahmini."""
+    if not a or not b:
+        return 0.0
+    union = sorted(set(a) | set(b))[:k]
+    both = set(a) & set(b)
+    return sum(1 for h in union if h in both) / len(union)
+
+
+def first_page_signature(path: str) -> Tuple[Optional[str], Tuple[int, ...]]:
+    """Yalnızca ilk sayfadan (DOI, parmak izi); okunamazsa (None, ())."""
+    try:
+        text = normalize_text("".join(iter_pdf_pages(path, max_pages=1)))
+    except Exception:
+        return None, ()
+    m = RE_DOI_FULL.search(text)
+    doi = m.group(1).rstrip(").,;\"'").lower() if m else None
+    return doi, _sketch(text)
+
+
+def find_duplicates(
+    pdfs: List[str],
+    workers: int = 1,
+    near: bool = True,
+    threshold: float = 0.8,
+    root: Optional[str] = None,
+) -> List[Dict[str, object]]:
+    """
+    Kopya dosyaları bul. Her grupta DOI'si olan (yoksa sıradaki ilk) dosya
+    tutulur; diğerleri için {"file", "duplicate_of", "reason", "similarity"}
+    listesi döner. reason: "sha256" | "doi" | "text". Adlar source_name(yol, root)'tur.
+    """
+    n = len(pdfs)
+    parent = list(range(n))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i: int, j: int) -> None:
+        ri, rj = find(i), find(j)
+        if ri != rj:
+            parent[max(ri, rj)] = min(ri, rj)
+
+    # 1) Bayt bayt aynı: yalnızca boyutu çakışanların özeti alınır
+    by_size: Dict[int, List[int]] = defaultdict(list)
+    for i, p in enumerate(pdfs):
+        by_size[os.path.getsize(p)].append(i)
+    sha: Dict[int, str] = {}
+    for group in by_size.values():
+        if len(group) < 2:
+            continue
+        seen: Dict[str, int] = {}
+        for i in group:
+            sha[i] = file_sha256(pdfs[i])
+            if sha[i] in seen:
+                union(seen[sha[i]], i)
+            else:
+                seen[sha[i]] = i
+
+    # 2) Yakın kopyalar: her bayt grubunun temsilcisi için ilk sayfa imzası
+    sigs: Dict[int, Tuple[Optional[str], Tuple[int, ...]]] = {}
+    if near:
+        reps = [i for i in range(n) if find(i) == i]
+        paths = [pdfs[i] for i in reps]
+        if workers > 1 and len(paths) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(first_page_signature, paths, chunksize=8))
+        else:
+            results = [first_page_signature(p) for p in paths]
+        sigs = dict(zip(reps, results))
+
+        by_doi: Dict[str, int] = {}
+        postings: Dict[int, List[int]] = defaultdict(list)
+        for i in reps:
+            doi, sk = sigs[i]
+            if doi:
+                if doi in by_doi:
+                    union(by_doi[doi], i)
+                else:
+                    by_doi[doi] = i
+            # Aday çiftler: ortak parmak izi değerleri üzerinden ters indeks
+            shared: Dict[int, int] = defaultdict(int)
+            for h in sk:
+                for j in postings[h]:
+                    shared[j] += 1
+                postings[h].append(i)
+            need = threshold * len(sk) / 2
+            for j, c in shared.items():
+                if c >= need and similarity(sigs[j][1], sk) >= threshold:
+                    union(j, i)
+
+    groups: Dict[int, List[int]] = defaultdict(list)
+    for i in range(n):
+        groups[find(i)].append(i)
+
+    def sig(i: int) -> Tuple[Optional[str], Tuple[int, ...]]:
+        return sigs.get(i) or sigs.get(find(i)) or (None, ())
+
+    report: List[Dict[str, object]] = []
+    for members in groups.values():
+        if len(members) < 2:
+            continue
+        keep = min(members, key=lambda i: (sig(i)[0] is None, i))
+        for i in members:
+            if i == keep:
+                continue
+            if i in sha and sha.get(keep) == sha[i]:
+                reason, sim = "sha256", 1.0
+            elif sig(i)[0] and sig(i)[0] == sig(keep)[0]:
+                reason, sim = "doi", similarity(sig(i)[1], sig(keep)[1])
+            else:
+                reason, sim = "text", similarity(sig(i)[1], sig(keep)[1])
+            report.append({
+                "file": source_name(pdfs[i], root),
+                "duplicate_of": source_name(pdfs[keep], root),
+                "reason": reason,
+                "similarity": round(sim, 3),
+            })
+    report.sort(key=lambda r: r["file"])
+    return report
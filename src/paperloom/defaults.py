@@ -0,0 +1,17 @@
+from typing import Optional
+
+# -----------------------------
+#  Paylaşılan varsayılanlar
+# -----------------------------
+# CLI seçenekleri ile kütüphane işlevleri aynı varsayılanları kullanır. Bu modül
+# hiçbir şey içe aktarmaz, böylece cli.py ağır modülleri yüklemeden okuyabilir.
+# extract_rules ve pipeline bu adları yeniden dışa verir.
+
+# Kural başına süre bütçesi (saniye); None ise sınırsız
+RULE_TIME_BUDGET: Optional[float] = 5.0
+
+# Bu kadar sayfadan uzun PDF'ler (page_workers > 1 ise) sayfa aralıklarına bölünüp paralel okunur
+PAGE_THRESHOLD = 200
+
+# `import paperloom.cli` için süre bütçesi (ms); bench --suite startup --check
+STARTUP_BUDGET_MS = 250.0
@@ -0,0 +1,137 @@
+import os, sys
+from fnmatch import fnmatchcase
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# -----------------------------
+#  Girdi keşfi
+# -----------------------------
+# Girdiler önceden listelenip sıralanmaz; os.scandir ile klasör klasör gezilip
+# bulundukça üretilir, böylece iş kuyruğu ilk dosyayla beslenmeye başlar.
+# Sıra: göreli yolların ("/" ile) dize sırası; düz bir klasörde
+# sorted(glob("*.pdf")) ile aynı. Alt klasör, klasördeki dosyalar arasına
+# adı + "/" ile sıralanır ("a.pdf" < "a/x.pdf" < "a0.pdf"), böylece kayıtlar
+# source_path'e göre sıralı çıkar (shard.iter_merged buna dayanır). Manifest
+# (ya da stdin) verilirse yollar satır satır, verildiği sırayla okunur.
+#
+# Desenler fnmatch ile eşlenir: "/" içermeyen desen dosya/klasör adına,
+# içeren desen girdi klasörüne göre göreli yola ("2019/nature/*.pdf"; fnmatch'te
+# "*" "/" karakterini de kapsar, yani alt klasörler de eşleşir).
+# Dışlanan bir klasörün altı hiç gezilmez.
+
+DEFAULT_INCLUDE = ["*.pdf"]
+
+
+def source_name(path: str, root: Optional[str] = None) -> str:
+    """Kayıtlardaki source_path: root verilirse göreli yol ("/" ile), yoksa dosya adı."""
+    if root is None:
+        return os.path.basename(path)
+    return os.path.relpath(path, root).replace(os.sep, "/")
+
+
+def _matches(rel: str, patterns: Sequence[str]) -> bool:
+    name = rel.rsplit("/", 1)[-1]
+    return any(fnmatchcase(rel if "/" in p else name, p) for p in patterns)
+
+
+def iter_pdfs(
+    input_dir: str,
+    recursive: bool = False,
+    include: Optional[Sequence[str]] = None,
+    exclude: Optional[Sequence[str]] = None,
+) -> Iterator[str]:
+    """input_dir altındaki PDF yollarını bulundukça üret (bkz. modül açıklaması)."""
+    include = list(include or DEFAULT_INCLUDE)
+    exclude = list(exclude or [])
+
+    def listing(folder: str, prefix: str) -> Iterator[Tuple[str, str, Optional[str]]]:
+        """Klasörün (sıralama anahtarı, yol, alt klasörse önek) girdileri, sıralı."""
+        try:
+            with os.scandir(folder) as it:
+                entries = list(it)
+        except OSError:
+            return iter(())
+        items = []
+        for e in entries:
+            rel = prefix + e.name
+            if exclude and _matches(rel, exclude):
+                continue
+            try:
+                if e.is_dir():
+                    if recursive:
+                        items.append((e.name + "/", e.path, rel + "/"))
+                    continue
+                if e.is_file() and _matches(rel, include):
+                    items.append((e.name, e.path, None))
+            except OSError:
+                continue
+        items.sort()
+        return iter(items)
+
+    stack = [listing(input_dir, "")]
+    while stack:
+        item = next(stack[-1], None)
+        if item is None:
+            stack.pop()
+        elif item[2] is None:
+            yield item[1]
+        else:
+            stack.append(listing(item[1], item[2]))
+
+
+def iter_manifest(
+    manifest: str,
+    input_dir: str,
+    include: Optional[Sequence[str]] = None,
+    exclude: Optional[Sequence[str]] = None,
+) -> Iterator[str]:
+    """
+    Manifest dosyasındaki (ya da "-" ise stdin'deki) yolları satır satır üret.
+    Göreli yollar input_dir'e göredir; boş ve "#" ile başlayan satırlar atlanır.
+    include/exclude yalnızca verilirse uygulanır.
+    """
+    f = sys.stdin if manifest == "-" else open(manifest, "r", encoding="utf-8")
+    try:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            path = line if os.path.isabs(line) else os.path.join(input_dir, line)
+            rel = source_name(path, input_dir)
+            if include and not _matches(rel, include):
+                continue
+            if exclude and _matches(rel, exclude):
+                continue
+            yield path
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def largest_first(paths: Iterable[str], by: str = "size") -> List[str]:
+    """
+    Yolları büyükten küçüğe sırala ki paralel çalışmada dev PDF'ler sona kalıp
+    uzun bir kuyruk oluşturmasın. by="size": dosya boyutu; by="pages": sayfa
+    sayısı (PDF başlığı okunur; okunamazsa boyuta göre, sayfa sayısı 0).
+    """
+    paths = list(paths)
+
+    def size(p: str) -> int:
+        try:
+            return os.path.getsize(p)
+        except OSError:
+            return 0
+
+    if by == "pages":
+        from .parse_pdf import count_pages
+
+        def pages(p: str) -> int:
+            try:
+                return count_pages(p)
+            except Exception:
+                return 0
+        key = lambda p: (pages(p), size(p))
+    elif by == "size":
+        key = size
+    else:
+        raise ValueError(f"Unknown schedule: {by}")
+    return sorted(paths, key=key, reverse=True)
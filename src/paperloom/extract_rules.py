@@ -1,13 +1,17 @@
-import re
-from typing import Dict, Optional
+import re, signal, threading, time
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+from typing import Collection, Dict, Iterable, Iterator, List, Optional, Tuple
+from .segment import segment_text
+from .defaults import RULE_TIME_BUDGET
 
 # -----------------------------
 #  Basit yardımcı fonksiyonlar
 # -----------------------------
 
-def _find(regex: re.Pattern, text: str, group: int = 1) -> Optional[str]:
+def _find(regex: re.Pattern, idx: "AnchorIndex", group: int = 1) -> Optional[str]:
     """İlk eşleşmeyi döndür (yoksa None)."""
-    m = regex.search(text)
+    m = idx.search(regex)
     if not m:
         return None
     try:
@@ -25,29 +29,32 @@ def _clean_doi(doi: Optional[str]) -> Optional[str]:
     return doi
 
 
-def _extract_year(text: str) -> Optional[str]:
+def _extract_year(idx: "AnchorIndex") -> Optional[str]:
     """
-    Metindeki yıllar arasından makul olanı seç.
+    Verilen bölgedeki yıllar arasından makul olanı seç.
 
-    - 1970–2035 arası dört haneli yılları toplar.
-    - En küçük yılı döndürür (genelde makale yılı ilk geçendir).
+    - Yalnızca idx'in bölgesine bakar; extract_all bunu önce ön kısımda
+      (başlık/yazar/özet, "front"), orada yıl yoksa gövdede çağırır, yani
+      kaynakçadaki eski yıllar hesaba girmez.
+    - 1970–2035 arası dört haneli yılları toplar ve bölgedeki en küçüğünü döndürür.
     """
-    years = [int(m.group(0)) for m in RE_YEAR.finditer(text)]
+    years = [int(m.group(0)) for m in idx.finditer(RE_YEAR)]
     years = [y for y in years if 1970 <= y <= 2035]
     if not years:
         return None
     return str(min(years))
 
 
-def _extract_bandgap(text: str) -> Optional[float]:
+def _extract_bandgap(idx: "AnchorIndex") -> Optional[float]:
     """
     Band aralığı değerini bulmaya çalış.
 
     - 'bulk' kelimesinin çok yakınında geçen band gap değerlerini öncelikle eler.
     - İlk uygun (bulk olmayan) değeri döndürür, yoksa ilk bulduğunu döndürür.
     """
+    text = idx.text
     candidates = []
-    for m in RE_BG.finditer(text):
+    for m in idx.finditer(RE_BG):
         full_span = text[max(0, m.start() - 40):m.end() + 40]
         try:
             val = float(m.group(2))
@@ -65,7 +72,7 @@ def _extract_bandgap(text: str) -> Optional[float]:
     return candidates[0][1]
 
 
-def _extract_passivation(text: str) -> Optional[str]:
+def _extract_passivation(idx: "AnchorIndex") -> Optional[str]:
     """
     Kenar pasivasyonunu/terminasyonunu daha muhafazakâr bir şekilde bul.
 
@@ -73,14 +80,14 @@ def _extract_passivation(text: str) -> Optional[str]:
     - H/F/S sembollerini ancak yakın çevrede 'passivat', 'terminate' vb. varsa kabul eder.
     """
     # Kelime bazlı: hydrogen / fluorine / sulfur
-    m = RE_PASS_WORD.search(text)
+    m = idx.search(RE_PASS_WORD)
     if m:
         word = m.group(1).lower()
         mapping = {"hydrogen": "H", "fluorine": "F", "sulfur": "S"}
         return mapping.get(word)
 
     # Sembol bazlı: H, F, S ama yakınında 'passivated', 'termination' vs. olsun
-    for m in RE_PASS_SYMBOL.finditer(text):
+    for m in idx.finditer(RE_PASS_SYMBOL):
         symbol = m.group(2).upper()
         # Sadece bağlamda 'passiv'/'terminat' vb. geçtiyse kabul et
         ctx = m.group(1).lower()
@@ -91,9 +98,9 @@ def _extract_passivation(text: str) -> Optional[str]:
     return None
 
 
-def _extract_doi(text: str) -> Optional[str]:
+def _extract_doi(idx: "AnchorIndex") -> Optional[str]:
     """Metinden DOI’yi yakala ve temizle."""
-    m = RE_DOI.search(text)
+    m = idx.search(RE_DOI)
     if not m:
         return None
     return _clean_doi(m.group(1))
@@ -104,22 +111,40 @@ def _extract_doi(text: str) -> Optional[str]:
 # -----------------------------
 
 # --- Basit metadata desenleri ---
+# Not: Bozuk PDF'lerden gelen uzun çöp metinlerde geri izleme (backtracking)
+# patlamasın diye desenler tek anlamlı ve sınırlı pencereli yazılmıştır:
+#   - aynı karakteri iki farklı niceleyicinin yiyebildiği yapılar yok,
+#   - sınırsız tembel ".+?" yerine üst sınırlı ".{1,N}?" kullanılır.
+
+# İsim bloğu: büyük harfle başlayan kelimeler; kelimeler arası boşluk (satır sonu
+# dahil) serbest, virgüllü ya da bitişik bölümler en fazla 6 tane.
+# Eski "(?:[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*[, ]*){1,6}" ile aynı dili tanır, fakat
+# boşluğun iki ayrı niceleyiciye bölünebilmesinden doğan üstel denemeleri yapmaz.
+_NAME_BLOCK = r"(?:[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*(?: *,[, ]*)?){1,6}[, ]*"
+
 # Başlık için fallback: büyük harfle başlayan, makul uzunlukta bir satır,
 # hemen altında isim gibi duran satırlar olsun.
 RE_TITLE_FALLBACK = re.compile(
     r"(?m)^([A-Z][^\n]{10,150})\n"
-    r"(?:[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*[, ]*){1,6}\n",  # yazar satır(lar)ı
+    + _NAME_BLOCK + r"\n",  # yazar satır(lar)ı
 )
 
 # Yazarlar fallback: "Soyad, İsim" biçimli bir satır grubu
 RE_AUTH_FALLBACK = re.compile(
-    r"(?m)^((?:[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*[, ]*){1,6})\n",
+    r"(?m)^(" + _NAME_BLOCK + r")\n",
 )
 
-# Abstract için fallback: 'Abstract' kelimesinden sonra gelen parça
+# Abstract için fallback: 'Abstract' kelimesinden sonra gelen parça (en fazla ~6000 karakter)
 RE_ABS_FALLBACK = re.compile(
-    r"(?is)\babstract\b[:\s]*([^\n].+?)(?:\n\s*\bkeywords?\b|\n\s*1\.\s*introduction\b|\n\s*introduction\b)",
+    r"(?is)\babstract\b[:\s]{0,20}([^\n].{1,6000}?)(?:\n\s*\bkeywords?\b|\n\s*1\.\s*introduction\b|\n\s*introduction\b)",
+)
+
+# RE_ABS_FALLBACK'in bitiş işaretleri; çapa pencerelerini önceden elemek için
+RE_ABS_END = re.compile(
+    r"\n\s*\bkeywords?\b|\n\s*1\.\s*introduction\b|\n\s*introduction\b",
+    re.IGNORECASE,
 )
+_ABS_MAX_REACH = len("abstract") + 20 + 1 + 6000 + 1
 
 RE_TITLE = re.compile(
     r"(?m)^(?:title|paper title)[:\s]*([^\n]{10,200})$",
@@ -151,7 +176,7 @@ RE_KEYS = re.compile(
 )
 
 RE_ABS = re.compile(
-    r"(?s)(?:^abstract\b[:\s]*)(.+?)(?:\n\s*\b(?:keywords?|introduction|1\.|I\.)\b)",
+    r"(?s)(?:^abstract\b[:\s]*)(.{1,6000}?)(?:\n\s*\b(?:keywords?|introduction|1\.|I\.)\b)",
     re.IGNORECASE,
 )
 
@@ -172,9 +197,11 @@ RE_PASS_WORD = re.compile(
     re.IGNORECASE,
 )
 
-# Sembol bazlı pasivasyon (H/F/S) – ama bağlamda 'passivated', 'termination' vb. aranacak
+# Sembol bazlı pasivasyon (H/F/S) – ama bağlamda 'passivated', 'termination' vb. aranacak.
+# Eşleşme anahtar kelimede başlar; eski "[^.]{0,40}?" öneki her konumda 40
+# karakterlik tembel bir tarama deniyordu ve sonucu hiç etkilemiyordu.
 RE_PASS_SYMBOL = re.compile(
-    r"([^.]{0,40}?(?:passivated?|passivation|terminated?|edge))[^A-Za-z]{0,10}\b(H|F|S)\b",
+    r"(passivat(?:ion|ed?)|terminated?|edge)[^A-Za-z]{0,10}\b(H|F|S)\b",
     re.IGNORECASE,
 )
 
@@ -193,11 +220,15 @@ RE_FUNC = re.compile(
     re.IGNORECASE,
 )
 
+# U(O-p) en fazla 200 karakter sonra aranır. Eski ".*?" + isteğe bağlı grup
+# sıfır karakterde hemen başarılı olduğu için U(O-p) hiç yakalanmıyordu.
 RE_UVAL = re.compile(
     r"""
-    \bU\s*(?:\(Zn\s*[-_]?d\)|Zn[-_ ]?d)\s*=\s*([0-9.]+)\s*eV
-    .*?
-    (?:U\s*(?:\(O\s*[-_]?p\)|O[-_ ]?p)\s*=\s*([0-9.]+)\s*eV)?
+    \bU\s{0,3}(?:\(Zn\s{0,3}[-_]?d\)|Zn[-_ ]?d)\s{0,3}=\s{0,3}([0-9.]{1,8})\s{0,3}eV
+    (?:
+        .{0,200}?
+        U\s{0,3}(?:\(O\s{0,3}[-_]?p\)|O[-_ ]?p)\s{0,3}=\s{0,3}([0-9.]{1,8})\s{0,3}eV
+    )?
     """,
     re.IGNORECASE | re.DOTALL | re.VERBOSE,
 )
@@ -217,7 +248,7 @@ RE_BGTP = re.compile(
 )
 
 RE_MM = re.compile(
-    r"\b([0-9]+\.?[0-9]*)\s*(?:μB|muB|mu_B|Bohr\s*magneton)\b",
+    r"\b([0-9]+(?:\.[0-9]*)?)\s*(?:μB|muB|mu_B|Bohr\s*magneton)\b",
     re.IGNORECASE,
 )
 
@@ -228,83 +259,457 @@ RE_NDR = re.compile(
 
 
 # -----------------------------
-#  Ana çıkarım fonksiyonu
+#  Çapa (anchor) tabanlı ön filtre
 # -----------------------------
 
-def extract_all(text: str) -> Dict[str, object]:
+# Desen → (çapalar, lead, span)
+#   çapalar: eşleşmenin içinde mutlaka geçen kelimeler (büyük/küçük harf duyarsız);
+#            "\b" ile başlayan çapa yalnızca kelime başında aranır.
+#   lead:    eşleşmenin çapadan en fazla kaç karakter önce başlayabileceği;
+#            None ise sınırsızdır ve çapa yalnızca ön filtre olarak kullanılır.
+#   span:    finditer için eşleşmenin çapa başından en fazla kaç karakter
+#            ilerisine uzanabileceği (+ sınır kontrolü için pay); None ise sınırsız.
+# Tabloda olmayan desenler (RE_YEAR, RE_KPTS, RE_VAC, fallback'ler) eskisi gibi
+# metnin tamamında çalışır.
+_RULE_ANCHORS = {
+    RE_TITLE:        ((r"\btitle",), 6, None),          # "paper title"
+    RE_DOI:          (("10.",), 0, None),               # grup 1 her zaman "10." ile başlar
+    RE_AUTH:         ((r"\bauthor",), 0, None),
+    RE_KEYS:         ((r"\bkeyword",), 0, None),
+    RE_ABS:          ((r"\babstract",), None, None),
+    RE_ABS_FALLBACK: ((r"\babstract",), 0, None),
+    RE_SYS:          (("zno",), 0, None),
+    RE_EDGE:         ((r"\bzigzag", r"\barmchair", r"\bzz", r"\bac"), 0, None),
+    RE_PASS_WORD:    ((r"\bhydrogen", r"\bfluorine", r"\bsulfur"), 0, None),
+    RE_PASS_SYMBOL:  (("passivat", "terminat", "edge"), 0, 0),
+    RE_DOP:          (("dop",), None, None),
+    RE_FUNC:         ((r"\bpbe", r"\blda", r"\bgga", r"\bhse", r"\bscan", r"\bb3lyp"), 0, None),
+    RE_UVAL:         (("zn",), 5, None),                 # "U" tek başına ayırt edici değil
+    RE_BG:           ((r"\bband",), 0, 0),               # eşleşme tam çapada başlar
+    RE_BGTP:         ((r"\bdirect", r"\bindirect"), 0, None),
+    RE_MM:           (("μb", "mub", "mu_b", "bohr"), None, None),
+    RE_NDR:          (("negative",), 0, None),
+}
+
+
+# IGNORECASE'in ASCII çapalarla eşleştirdiği ama str.lower()'ın eşlemediği harfler
+_CASE_FOLD = str.maketrans({"\u0130": "i", "\u0131": "i", "\u017f": "s", "\u00b5": "μ"})
+
+
+def _is_word_char(ch: str) -> bool:
+    """re modülündeki \\w tanımı (Unicode)."""
+    return ch.isalnum() or ch == "_"
+
+
+def _build_anchor_tokens():
     """
-    PDF’ten normalize edilmiş metni alır, metadata ve ZnO odaklı
-    bilimsel özellikleri sözlük olarak döndürür.
+    Çapa tablosunu kelime listesine çevir: (kelime, kelime_başı_mı, desenler, yedek regex).
+    Aynı kelimeyi birden çok desen paylaşabilir ("abstract" gibi).
     """
-    out: Dict[str, object] = {}
+    token_rules: Dict[str, List[re.Pattern]] = {}
+    word_start: Dict[str, bool] = {}
+    for pat, (anchors, _, _) in _RULE_ANCHORS.items():
+        for a in anchors:
+            ws = a.startswith(r"\b")
+            key = (a[2:] if ws else a).lower()
+            token_rules.setdefault(key, []).append(pat)
+            word_start[key] = word_start.get(key, True) and ws
+    return [
+        (key, word_start[key], pats,
+         re.compile("(?=" + (r"\b" if word_start[key] else "") + re.escape(key) + ")", re.IGNORECASE))
+        for key, pats in token_rules.items()
+    ]
 
-    # --- Metadata ----
-    out["title"] = _find(RE_TITLE, text)
-    if not out["title"]:
-        out["title"] = _find(RE_TITLE_FALLBACK, text)
 
-    out["doi"] = _extract_doi(text)
-    out["year"] = _extract_year(text)
+_ANCHOR_TOKENS = _build_anchor_tokens()
+
+
+class AnchorIndex:
+    """
+    Metni çapa kelimeleri için bir kez tarayıp her desenin çapa konumlarını tutar.
+
+    Tarama küçük harfe çevrilmiş metin üzerinde str.find ile yapılır (C hızında,
+    çakışan geçişler dahil); büyük harfe çevirme uzunluğu değiştirirse her kelime
+    için IGNORECASE regex'e düşülür.
+
+    search(): çapası hiç geçmeyen desen hiç çalışmaz; geçen desen ilk çapadan
+    (lead kadar geride) başlayarak aranır. finditer(): yalnızca çapaların
+    çevresindeki küçük pencerelerde çalışır. Her iki yol da metnin tamamında
+    yapılan search/finditer ile aynı eşleşmeleri döndürür.
+
+    view(lo, hi): aynı metin ve tarama üzerinde, aramaları [lo, hi) bölgesiyle
+    sınırlayan bir görünüm (bölge başları satır başıdır; ^ ve \b değişmez).
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.lo, self.hi = 0, len(text)
+        self.hits: Dict[re.Pattern, List[int]] = {p: [] for p in _RULE_ANCHORS}
+
+        low = text.translate(_CASE_FOLD).lower()
+        if len(low) != len(text):
+            low = None
+
+        multi = set()
+        for key, word_start, pats, fallback in _ANCHOR_TOKENS:
+            if low is None:
+                positions = [m.start() for m in fallback.finditer(text)]
+            else:
+                positions = []
+                i = low.find(key)
+                while i != -1:
+                    if not (word_start and i > 0 and _is_word_char(text[i - 1])):
+                        positions.append(i)
+                    i = low.find(key, i + 1)
+            if not positions:
+                continue
+            for pat in pats:
+                if self.hits[pat]:
+                    multi.add(pat)
+                self.hits[pat].extend(positions)
+
+        for pat in multi:
+            self.hits[pat] = sorted(set(self.hits[pat]))
+
+    def view(self, lo: int, hi: int) -> "AnchorIndex":
+        v = object.__new__(AnchorIndex)
+        v.text, v.lo, v.hi = self.text, lo, hi
+        v.hits = {p: h[bisect_left(h, lo):bisect_left(h, hi)] for p, h in self.hits.items()}
+        return v
+
+    def search(self, regex: re.Pattern) -> Optional[re.Match]:
+        spec = _RULE_ANCHORS.get(regex)
+        if spec is None:
+            return regex.search(self.text, self.lo, self.hi)
+        hits = self.hits[regex]
+        if not hits:
+            return None
+        lead = spec[1]
+        pos = self.lo if lead is None else max(self.lo, hits[0] - lead)
+        return regex.search(self.text, pos, self.hi)
+
+    def finditer(self, regex: re.Pattern) -> Iterator[re.Match]:
+        spec = _RULE_ANCHORS.get(regex)
+        if spec is None or spec[1] is None or spec[2] is None:
+            if spec is None or self.hits[regex]:
+                yield from regex.finditer(self.text, self.lo, self.hi)
+            return
+
+        text, hits = self.text, self.hits[regex]
+        _, lead, span = spec
+        if lead == 0 and span == 0:
+            # Eşleşme yalnızca çapa konumunda başlayabilir
+            end = 0
+            for h in hits:
+                if h < end:
+                    continue
+                m = regex.match(text, h, self.hi)
+                if m:
+                    yield m
+                    end = max(m.end(), h + 1)
+            return
+
+        # Çakışan pencereleri birleştir, her pencerede ayrı finditer
+        windows: List[List[int]] = []
+        for h in hits:
+            lo, hi = max(self.lo, h - lead), min(self.hi, h + span)
+            if windows and lo <= windows[-1][1]:
+                windows[-1][1] = max(windows[-1][1], hi)
+            else:
+                windows.append([lo, hi])
+        for lo, hi in windows:
+            yield from regex.finditer(text, lo, hi)
+
+
+# -----------------------------
+#  Kural adımları ve zaman bütçesi
+# -----------------------------
+
+class RuleTimeout(Exception):
+    """Bir kural kendisine ayrılan süreyi aştı."""
+
+
+_CAN_ALARM = hasattr(signal, "SIGALRM") and hasattr(signal, "setitimer")
+
+
+def _on_alarm(signum, frame):
+    raise RuleTimeout()
+
+
+@contextmanager
+def _time_budget(seconds: Optional[float]):
+    """
+    SIGALRM ile süre sınırı uygula. re modülü uzun eşleşmelerde sinyalleri
+    kontrol ettiği için takılan bir regex de kesilir. Yalnızca ana iş
+    parçacığında ve SIGALRM olan platformlarda etkindir; aksi halde sınırsız çalışır.
+    """
+    if (not seconds or not _CAN_ALARM
+            or threading.current_thread() is not threading.main_thread()):
+        yield
+        return
+    prev = signal.signal(signal.SIGALRM, _on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, prev)
+
 
-    out["authors"] = _find(RE_AUTH, text)
-    if not out["authors"]:
-        out["authors"] = _find(RE_AUTH_FALLBACK, text)
+def _rule_title(idx: "AnchorIndex") -> Optional[str]:
+    return _find(RE_TITLE, idx) or _find(RE_TITLE_FALLBACK, idx)
 
-    out["keywords"] = _find(RE_KEYS, text)
 
-    mabs = RE_ABS.search(text)
+def _rule_authors(idx: "AnchorIndex") -> Optional[str]:
+    return _find(RE_AUTH, idx) or _find(RE_AUTH_FALLBACK, idx)
+
+
+def _rule_keywords(idx: "AnchorIndex") -> Optional[str]:
+    return _find(RE_KEYS, idx)
+
+
+def _rule_abstract(idx: "AnchorIndex") -> Optional[str]:
+    mabs = idx.search(RE_ABS)
     if not mabs:
-        mabs = RE_ABS_FALLBACK.search(text)
-    if mabs:
-        out["abstract"] = mabs.group(1).strip()
+        mabs = _search_abs_fallback(idx)
+    return mabs.group(1).strip() if mabs else None
 
-    # --- ZnO sistem bilgisi ---
-    sysm = RE_SYS.search(text)
-    out["system"] = sysm.group(0) if sysm else None
 
-    edge = _find(RE_EDGE, text)
-    if edge:
-        if edge.upper() in ("ZZ", "AC"):
-            out["edge"] = edge.upper()
-        else:
-            out["edge"] = edge.lower()
+def _search_abs_fallback(idx: "AnchorIndex") -> Optional[re.Match]:
+    """
+    RE_ABS_FALLBACK.search ile aynı sonuç, ama yalnızca erişim mesafesinde bir
+    bitiş işareti olan 'abstract' konumları denenir. Böylece bitişi olmayan
+    onlarca 'abstract' geçişinin her biri 6000 karakter taranmaz.
+    """
+    hits = idx.hits[RE_ABS_FALLBACK]
+    if not hits:
+        return None
+    text = idx.text
+    ends = [m.start() for m in RE_ABS_END.finditer(text, hits[0], idx.hi)]
+    for h in hits:
+        i = bisect_right(ends, h)
+        if i == len(ends):
+            return None
+        if ends[i] - h <= _ABS_MAX_REACH:
+            m = RE_ABS_FALLBACK.match(text, h, idx.hi)
+            if m:
+                return m
+    return None
 
-    out["passivation"] = _extract_passivation(text)
 
-    dm = RE_DOP.search(text)
-    out["doping"] = dm.group(1) if dm else None
+def _rule_system(idx: "AnchorIndex") -> Optional[str]:
+    sysm = idx.search(RE_SYS)
+    return sysm.group(0) if sysm else None
 
-    vm = RE_VAC.search(text)
-    if vm:
-        v = vm.group(1).upper().replace(" ", "").replace("-", "_")
-        if v in ("VZN", "V_ZN"):
-            v = "V_Zn"
-        if v in ("VO", "V_O"):
-            v = "V_O"
-        out["vacancy"] = v
 
-    out["functional"] = _find(RE_FUNC, text)
+def _rule_edge(idx: "AnchorIndex") -> Optional[str]:
+    edge = _find(RE_EDGE, idx)
+    if not edge:
+        return None
+    if edge.upper() in ("ZZ", "AC"):
+        return edge.upper()
+    return edge.lower()
+
 
-    um = RE_UVAL.search(text)
-    if um:
-        u_zn, u_o = um.group(1), um.group(2)
-        out["u_values"] = f"U_Zn-d={u_zn} eV" + (f"; U_O-p={u_o} eV" if u_o else "")
+def _rule_doping(idx: "AnchorIndex") -> Optional[str]:
+    dm = idx.search(RE_DOP)
+    return dm.group(1) if dm else None
 
-    km = RE_KPTS.search(text)
-    if km:
-        out["kpoints"] = "x".join(km.groups())
 
+def _rule_vacancy(idx: "AnchorIndex") -> Optional[str]:
+    vm = idx.search(RE_VAC)
+    if not vm:
+        return None
+    v = vm.group(1).upper().replace(" ", "").replace("-", "_")
+    if v in ("VZN", "V_ZN"):
+        v = "V_Zn"
+    if v in ("VO", "V_O"):
+        v = "V_O"
+    return v
+
+
+def _rule_functional(idx: "AnchorIndex") -> Optional[str]:
+    return _find(RE_FUNC, idx)
+
+
+def _rule_u_values(idx: "AnchorIndex") -> Optional[str]:
+    um = idx.search(RE_UVAL)
+    if not um:
+        return None
+    u_zn, u_o = um.group(1), um.group(2)
+    return f"U_Zn-d={u_zn} eV" + (f"; U_O-p={u_o} eV" if u_o else "")
+
+
+def _rule_kpoints(idx: "AnchorIndex") -> Optional[str]:
+    km = idx.search(RE_KPTS)
+    return "x".join(km.groups()) if km else None
+
+
+def _rule_bandgap_type(idx: "AnchorIndex") -> Optional[str]:
+    bgt = idx.search(RE_BGTP)
+    return bgt.group(1).lower() if bgt else None
+
+
+def _rule_magnetic_moment(idx: "AnchorIndex") -> Optional[str]:
+    mm = idx.search(RE_MM)
+    return (mm.group(1) + " μB") if mm else None
+
+
+def _rule_ndr(idx: "AnchorIndex") -> bool:
+    return bool(idx.search(RE_NDR))
+
+
+# (alan, kural, bulunamazsa da anahtar yazılsın mı)
+RULES = [
+    # --- Metadata ----
+    ("title", _rule_title, True),
+    ("doi", _extract_doi, True),
+    ("year", _extract_year, True),
+    ("authors", _rule_authors, True),
+    ("keywords", _rule_keywords, True),
+    ("abstract", _rule_abstract, False),
+    # --- ZnO sistem bilgisi ---
+    ("system", _rule_system, True),
+    ("edge", _rule_edge, False),
+    ("passivation", _extract_passivation, True),
+    ("doping", _rule_doping, True),
+    ("vacancy", _rule_vacancy, False),
+    ("functional", _rule_functional, True),
+    ("u_values", _rule_u_values, False),
+    ("kpoints", _rule_kpoints, False),
     # Band gap (bulk bağlamını mümkün olduğunca ele)
-    bg_val = _extract_bandgap(text)
-    if bg_val is not None:
-        out["bandgap_ev"] = bg_val
+    ("bandgap_ev", _extract_bandgap, False),
+    ("bandgap_type", _rule_bandgap_type, True),
+    ("magnetic_moment", _rule_magnetic_moment, True),
+    ("ndr", _rule_ndr, True),
+]
+
+# Alan → sırayla denenecek bölgeler (bkz. segment.segment_text). Bir bölgede
+# değer bulunamazsa (None/False) bir sonrakine geçilir; kaynakça hiçbirinde yok.
+_META = ("front", "body")
+_SYSTEM = ("body",)
+_METHODS = ("methods", "body")
+_RESULTS = ("results", "abstract", "body")
+RULE_REGIONS: Dict[str, Tuple[str, ...]] = {
+    "title": _META, "doi": _META, "year": _META, "authors": _META, "keywords": _META,
+    "abstract": ("head", "body"),
+    "system": _SYSTEM, "edge": _SYSTEM, "passivation": _SYSTEM, "doping": _SYSTEM, "vacancy": _SYSTEM,
+    "functional": _METHODS, "u_values": _METHODS, "kpoints": _METHODS,
+    "bandgap_ev": _RESULTS, "bandgap_type": _RESULTS, "magnetic_moment": _RESULTS, "ndr": _RESULTS,
+}
 
-    bgt = RE_BGTP.search(text)
-    out["bandgap_type"] = bgt.group(1).lower() if bgt else None
 
-    mm = RE_MM.search(text)
-    out["magnetic_moment"] = (mm.group(1) + " μB") if mm else None
+# -----------------------------
+#  Ana çıkarım fonksiyonu
+# -----------------------------
 
-    out["ndr"] = bool(RE_NDR.search(text))
+def extract_all(
+    text: str,
+    time_budget: Optional[float] = RULE_TIME_BUDGET,
+    timings: Optional[Dict[str, float]] = None,
+    fields: Optional[Collection[str]] = None,
+) -> Dict[str, object]:
+    """
+    PDF’ten normalize edilmiş metni alır, metadata ve ZnO odaklı
+    bilimsel özellikleri sözlük olarak döndürür.
+
+    Metin önce tek geçişte çapa kelimeleri için taranır (AnchorIndex); pahalı
+    desenler yalnızca çapalarının bulunduğu yerlerde çalışır. Ardından metin
+    bölümlere ayrılır (segment_text) ve her kural yalnızca RULE_REGIONS'taki
+    bölgelerinde, sırayla, ilk değer bulunana kadar çalışır.
+
+    Her kural en fazla `time_budget` saniye çalışır; süreyi aşan kuralın alanı
+    boş kalır ve adı out["extras"]["rule_timeouts"] listesine yazılır.
+
+    timings bir sözlükse, çapa taraması ("anchor_index") ve her kuralın süresi
+    (saniye) kural adıyla içine yazılır.
+
+    fields verilirse yalnızca bu alanların kuralları çalışır (diğer anahtarlar
+    çıktıda yer almaz).
+    """
+    t0 = time.perf_counter()
+    idx = AnchorIndex(text)
+    if timings is not None:
+        timings["anchor_index"] = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    spans = segment_text(text)
+    views: Dict[Tuple[int, int], AnchorIndex] = {}
+    if timings is not None:
+        timings["segment"] = time.perf_counter() - t0
+    out: Dict[str, object] = {}
+    timeouts: List[str] = []
+
+    for name, rule, always in RULES:
+        if fields is not None and name not in fields:
+            continue
+        t0 = time.perf_counter()
+        try:
+            with _time_budget(time_budget):
+                value, tried = None, set()
+                for region in RULE_REGIONS.get(name, ("all",)):
+                    span = spans.get(region)
+                    if span is None or span in tried:
+                        continue
+                    tried.add(span)
+                    if span not in views:
+                        views[span] = idx.view(*span)
+                    value = rule(views[span])
+                    if value is not None and value is not False:
+                        break
+        except RuleTimeout:
+            timeouts.append(name)
+            value = None
+        if timings is not None:
+            timings[name] = time.perf_counter() - t0
+        if value is not None or always:
+            out[name] = value
+
+    if timeouts:
+        out["extras"] = {"rule_timeouts": timeouts}
+    return out
+
+
+# -----------------------------
+#  Sayfa sayfa (artımlı) çıkarım
+# -----------------------------
+
+def _is_filled(value: object) -> bool:
+    """Güven skoruyla (batch.confidence_column) aynı doluluk tanımı: ndr=False da doludur."""
+    return value not in (None, "", [], {})
+
+
+class IncrementalExtractor:
+    """
+    Normalize edilmiş sayfaları tek tek alır ve istenen alanların hangilerinin
+    bulunduğunu izler. Sayfa sınırını aşan eşleşmeler kaçmasın diye her sayfa
+    önceki sayfanın son `overlap` karakteriyle birlikte taranır. Her sayfada
+    yalnızca henüz bulunamamış alanların kuralları çalışır.
+
+    Yalnızca "okumayı durdurabilir miyiz?" kararını verir; nihai kayıt yine
+    okunan metnin tamamı üzerinde extract_all ile üretilmelidir.
+    """
 
-    return out
\ No newline at end of file
+    def __init__(self, required: Iterable[str], overlap: int = 2000,
+                 time_budget: Optional[float] = RULE_TIME_BUDGET):
+        self.required = set(required)
+        self.found = set()
+        self.overlap = overlap
+        self.time_budget = time_budget
+        self.pages = 0
+        self._tail = ""
+
+    @property
+    def done(self) -> bool:
+        return self.required <= self.found
+
+    def feed(self, page_text: str) -> bool:
+        """Bir sayfa ekle; tüm alanlar bulunduysa True döndür."""
+        self.pages += 1
+        window = f"{self._tail}\n{page_text}" if self._tail else page_text
+        missing = self.required - self.found
+        feats = extract_all(window, time_budget=self.time_budget, fields=missing)
+        for k in missing:
+            if _is_filled(feats.get(k)):
+                self.found.add(k)
+        self._tail = page_text[-self.overlap:]
+        return self.done
@@ -1,67 +1,436 @@
-import json, csv
-import pandas as pd
-from typing import List
+import os, re, ast, json, csv, gzip, time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 from .models import PaperRecord
+from .batch import FIELDS, RecordBatch, _to_float
 
-def write_json(path: str, records: List[PaperRecord]) -> None:
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump([r.to_dict() for r in records],
-                  f, ensure_ascii=False, indent=2)
-
-def write_csv(path: str, records: List[PaperRecord]) -> None:
-    rows = [r.to_dict() for r in records]
-    if not rows:
-        with open(path, "w", newline="", encoding="utf-8") as f:
-            f.write("")
-        return
-    headers = list(rows[0].keys())
-    with open(path, "w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=headers)
-        w.writeheader()
-        for r in rows:
-            w.writerow(r)
-
-def write_excel(path: str, records: List[PaperRecord]) -> None:
-    if not records:
-        pd.DataFrame().to_excel(path, index=False)
-        return
-
-    df = pd.DataFrame([r.to_dict() for r in records])
-
-    # Scientific typing/normalization
-    if "bandgap_ev" in df.columns:
-        df["bandgap_ev"] = pd.to_numeric(df["bandgap_ev"], errors="coerce")
-
-    if "year" in df.columns:
-        df["year"] = pd.to_numeric(df["year"], errors="coerce").astype("Int64")
-
-    if "ndr" in df.columns:
-        df["ndr"] = df["ndr"].astype("boolean")
-
-    # Magnetic moment split
-    if "magnetic_moment" in df.columns:
-        mm_val = df["magnetic_moment"].str.extract(r"([0-9]+\.?[0-9]*)", expand=False)
-        df["magnetic_moment_value"] = pd.to_numeric(mm_val, errors="coerce")
-        df["magnetic_moment_unit"] = df["magnetic_moment"].where(df["magnetic_moment"].notna(), None).apply(
-            lambda x: "μB" if isinstance(x, str) else None
+# Excel sayfaları
+BIO_COLS = ["source_path", "title", "authors", "year", "doi", "keywords", "abstract"]
+SCI_COLS = ["source_path", "system", "edge", "passivation", "doping", "vacancy",
+            "functional", "U_Zn_d", "U_O_p", "kpoints",
+            "bandgap_ev", "bandgap_type",
+            "magnetic_moment_value", "magnetic_moment_unit",
+            "ndr", "doi", "confidence"]  # DOI and confidence included
+
+
+class JsonArrayWriter:
+    """Writes the same indented JSON array as json.dump, one record at a time."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._f = open(path, "w", encoding="utf-8")
+        self._f.write("[")
+        self._count = 0
+
+    def write(self, rec: PaperRecord) -> None:
+        self.write_batch(RecordBatch([rec]))
+
+    def write_batch(self, batch: RecordBatch) -> None:
+        parts = []
+        for row in batch.rows():
+            body = json.dumps(row, ensure_ascii=False, indent=2)
+            parts.append(("," if self._count else "") + "\n  " + body.replace("\n", "\n  "))
+            self._count += 1
+        self._f.write("".join(parts))
+
+    def close(self) -> None:
+        self._f.write("\n]" if self._count else "]")
+        self._f.close()
+
+
+class JsonlWriter:
+    """
+    JSON Lines; gzip-compressed when the path ends with .gz. Flushed per batch;
+    streaming=True makes RecordWriters hand it every record as it arrives.
+    append=True adds to an existing file (a new gzip member for .gz).
+    """
+
+    streaming = True
+
+    def __init__(self, path: str, append: bool = False):
+        self.path = path
+        mode = "a" if append else "w"
+        if path.endswith(".gz"):
+            self._f = gzip.open(path, mode + "t", encoding="utf-8")
+        else:
+            self._f = open(path, mode, encoding="utf-8")
+
+    def write(self, rec: PaperRecord) -> None:
+        self.write_batch(RecordBatch([rec]))
+
+    def write_batch(self, batch: RecordBatch) -> None:
+        self._f.write("".join(json.dumps(row, ensure_ascii=False) + "\n" for row in batch.rows()))
+        self._f.flush()
+
+    def close(self) -> None:
+        self._f.close()
+
+
+class CsvStreamWriter:
+    """
+    Incremental CSV; the header comes from the first record. Flushed per batch
+    (per record under RecordWriters, see streaming).
+    append=True adds rows to an existing file and only writes a header if it is empty.
+    """
+
+    streaming = True
+
+    def __init__(self, path: str, append: bool = False):
+        self.path = path
+        self._header = not (append and os.path.exists(path) and os.path.getsize(path) > 0)
+        self._f = open(path, "a" if append else "w", newline="", encoding="utf-8")
+        self._w: Optional[csv.DictWriter] = None
+
+    def write(self, rec: PaperRecord) -> None:
+        self.write_batch(RecordBatch([rec]))
+
+    def write_batch(self, batch: RecordBatch) -> None:
+        if not len(batch):
+            return
+        if self._w is None:
+            self._w = csv.DictWriter(self._f, fieldnames=FIELDS)
+            if self._header:
+                self._w.writeheader()
+        self._w.writerows(batch.rows())
+        self._f.flush()
+
+    def close(self) -> None:
+        self._f.close()
+
+
+class ExcelStreamWriter:
+    """Multi-sheet Excel (Metadata / Scientific_Data) via an openpyxl write-only workbook."""
+
+    def __init__(self, path: str):
+        from openpyxl import Workbook
+
+        self.path = path
+        self._wb = Workbook(write_only=True)
+        self._bio = self._wb.create_sheet("Metadata")
+        self._sci = self._wb.create_sheet("Scientific_Data")
+        self._bio.append(BIO_COLS)
+        self._sci.append(SCI_COLS)
+
+    def write(self, rec: PaperRecord) -> None:
+        self.write_batch(RecordBatch([rec]))
+
+    def write_batch(self, batch: RecordBatch) -> None:
+        for row in batch.table(BIO_COLS):
+            self._bio.append(row)
+        for row in batch.table(SCI_COLS):
+            self._sci.append(row)
+
+    def close(self) -> None:
+        self._wb.save(self.path)
+
+
+class SqliteWriter:
+    """
+    SQLite record store with indexed query columns, upserted in place.
+
+    Rows are keyed on the SHA-256 of the source PDF, so re-running over the same
+    folder updates rows instead of duplicating them. A record also replaces the
+    row of an older version of the same file (same source_path, different
+    hash), e.g. when a watched PDF is modified. The digest is taken from
+    rec.file_sha256 (computed in the worker); only records without one (e.g.
+    older journal entries) are hashed here. With key="doi", a record
+    with a DOI also replaces any other row carrying that DOI (e.g. a new version
+    of the same paper); records without a DOI fall back to the file hash.
+    Numeric helper columns (U_Zn_d, U_O_p, magnetic_moment_value) are filled
+    from the batch's derived columns so that range queries work. Committed every `batch` records.
+    """
+
+    COLUMNS = ["source_path", "title", "authors", "year", "doi", "keywords", "abstract",
+               "system", "edge", "passivation", "doping", "vacancy", "functional",
+               "u_values", "U_Zn_d", "U_O_p", "kpoints", "bandgap_ev", "bandgap_type",
+               "magnetic_moment", "magnetic_moment_value", "ndr", "confidence", "extras"]
+    INDEXED = ["doi", "year", "doping", "functional", "vacancy", "bandgap_ev",
+               "edge", "passivation", "bandgap_type", "system"]
+
+    def __init__(self, path: str, source_dir: str, key: str = "sha", batch: int = 500):
+        import sqlite3
+        from .cache import file_sha256
+
+        if key not in ("sha", "doi"):
+            raise ValueError(f"Unknown SQLite key: {key}")
+        self.path = path
+        self.source_dir = source_dir
+        self.key = key
+        self.batch = batch
+        self._hash = file_sha256
+        self._pending = 0
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        cols = ", ".join(f'"{c}"' for c in self.COLUMNS)
+        self._db.execute(
+            f'CREATE TABLE IF NOT EXISTS records (file_sha256 TEXT PRIMARY KEY, {cols}, updated_at REAL)'
+        )
+        for c in self.INDEXED:
+            self._db.execute(f'CREATE INDEX IF NOT EXISTS idx_records_{c.lower()} ON records ("{c}")')
+        self._db.execute(
+            'CREATE INDEX IF NOT EXISTS idx_records_doping_edge_gap ON records (doping, edge, bandgap_ev)'
+        )
+        self._db.execute('CREATE INDEX IF NOT EXISTS idx_records_source_path ON records (source_path)')
+        placeholders = ", ".join("?" for _ in self.COLUMNS)
+        updates = ", ".join(f'"{c}"=excluded."{c}"' for c in self.COLUMNS + ["updated_at"])
+        self._upsert = (
+            f"INSERT INTO records (file_sha256, {cols}, updated_at) VALUES (?, {placeholders}, ?) "
+            f"ON CONFLICT(file_sha256) DO UPDATE SET {updates}"
         )
 
-    # U-values split
-    if "u_values" in df.columns:
-        df["U_Zn_d"] = pd.to_numeric(df["u_values"].str.extract(r"U_Zn-d=([0-9.]+)", expand=False), errors="coerce")
-        df["U_O_p"]  = pd.to_numeric(df["u_values"].str.extract(r"U_O-p=([0-9.]+)",  expand=False), errors="coerce")
-
-    # Sheets
-    bio_cols = ["source_path", "title", "authors", "year", "doi", "keywords", "abstract"]
-    sci_cols = ["source_path", "system", "edge", "passivation", "doping", "vacancy",
-                "functional", "U_Zn_d", "U_O_p", "kpoints",
-                "bandgap_ev", "bandgap_type",
-                "magnetic_moment_value", "magnetic_moment_unit",
-                "ndr", "doi", "confidence"]  # DOI and confidence included
-
-    df_bio = df[[c for c in bio_cols if c in df.columns]]
-    df_sci = df[[c for c in sci_cols if c in df.columns]]
-
-    with pd.ExcelWriter(path, engine="openpyxl") as writer:
-        df_bio.to_excel(writer, sheet_name="Metadata", index=False)
-        df_sci.to_excel(writer, sheet_name="Scientific_Data", index=False)
+    def write(self, rec: PaperRecord) -> None:
+        self.write_batch(RecordBatch([rec]))
+
+    def write_batch(self, batch: RecordBatch) -> None:
+        ndr, extras = self.COLUMNS.index("ndr"), self.COLUMNS.index("extras")
+        now = time.time()
+        rows = []
+        for rec, row in zip(batch.records, batch.table(self.COLUMNS)):
+            row[ndr] = int(row[ndr]) if row[ndr] is not None else None
+            row[extras] = json.dumps(row[extras], ensure_ascii=False) if row[extras] else None
+            digest = rec.file_sha256 or self._hash(os.path.join(self.source_dir, rec.source_path))
+            rows.append([digest] + row + [now])
+        self._db.executemany("DELETE FROM records WHERE source_path = ? AND file_sha256 <> ?",
+                             [(rec.source_path, row[0]) for rec, row in zip(batch.records, rows)])
+        if self.key == "doi":
+            # Sıra önemli: aynı DOI'li sonraki kayıt öncekinin yerini alır
+            for rec, row in zip(batch.records, rows):
+                if rec.doi:
+                    self._db.execute("DELETE FROM records WHERE doi = ? AND file_sha256 <> ?", (rec.doi, row[0]))
+                self._db.execute(self._upsert, row)
+        else:
+            self._db.executemany(self._upsert, rows)
+        self._pending += len(rows)
+        if self._pending >= self.batch:
+            self._db.commit()
+            self._pending = 0
+
+    def close(self) -> None:
+        self._db.commit()
+        self._db.close()
+
+
+# Query conditions: (column, op, value). Columns are checked against the store
+# schema and values are bound as parameters; no user text reaches the SQL.
+QUERY_COLUMNS = frozenset(SqliteWriter.COLUMNS + ["file_sha256", "updated_at"])
+QUERY_OPS = {"=": "=", "!=": "<>", "<": "<", "<=": "<=", ">": ">", ">=": ">=", "~": "LIKE"}
+Condition = Tuple[str, str, Any]
+
+
+def _query_column(name: str) -> str:
+    if name not in QUERY_COLUMNS:
+        raise ValueError(f"Unknown column: {name!r} (expected one of {', '.join(sorted(QUERY_COLUMNS))})")
+    return f'"{name}"'
+
+
+def parse_condition(text: str) -> Condition:
+    """
+    "doping=Co", "bandgap_ev>=1.5", "title~%ribbon%", "doi=null" -> (column, op, value).
+    Numeric values become int/float (numeric columns compare as numbers);
+    "null" with = or != means IS NULL / IS NOT NULL.
+    """
+    m = re.match(r"\s*([A-Za-z_]\w*)\s*(<=|>=|!=|=|<|>|~)\s*(.*?)\s*$", text, re.S)
+    if not m:
+        raise ValueError(f"Expected COLUMN OP VALUE with OP in {' '.join(QUERY_OPS)}, got: {text!r}")
+    column, op, raw = m.groups()
+    _query_column(column)
+    value: Any = raw
+    if raw.lower() == "null":
+        value = None
+    else:
+        for conv in (int, float):
+            try:
+                value = conv(raw)
+                break
+            except ValueError:
+                continue
+    return column, op, value
+
+
+def query_sqlite(path: str, where: Iterable[Condition] = (), order_by: str = "source_path",
+                 limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Run a filtered SELECT against a SqliteWriter store and return rows as dicts.
+
+    where: (column, op, value) conditions joined with AND (see parse_condition);
+    order_by: "column" or "column DESC". Unknown columns or operators raise ValueError.
+    """
+    import sqlite3
+
+    clauses, params = [], []
+    for column, op, value in where:
+        col = _query_column(column)
+        if op not in QUERY_OPS:
+            raise ValueError(f"Unknown operator: {op!r}")
+        if value is None and op in ("=", "!="):
+            clauses.append(f"{col} IS {'NOT ' if op == '!=' else ''}NULL")
+        else:
+            clauses.append(f"{col} {QUERY_OPS[op]} ?")
+            params.append(value)
+    order_col, _, direction = order_by.strip().partition(" ")
+    direction = direction.strip().upper() or "ASC"
+    if direction not in ("ASC", "DESC"):
+        raise ValueError(f"Expected ASC or DESC, got: {direction!r}")
+    sql = f"SELECT * FROM records WHERE {' AND '.join(clauses) or '1=1'} ORDER BY {_query_column(order_col)} {direction}"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(int(limit))
+    db = sqlite3.connect(path)
+    try:
+        db.row_factory = sqlite3.Row
+        return [dict(r) for r in db.execute(sql, params)]
+    finally:
+        db.close()
+
+
+# --- Reading records back (partial shard outputs) ---
+
+def _from_row(row: Dict[str, Any]) -> PaperRecord:
+    """Rebuild a PaperRecord from a CSV/SQLite row, restoring the typed fields."""
+    d = {k: (row.get(k) if row.get(k) != "" else None) for k in FIELDS}
+    year = _to_float(d["year"])
+    d["year"] = int(year) if year is not None else None
+    d["bandgap_ev"] = _to_float(d["bandgap_ev"])
+    d["confidence"] = _to_float(d["confidence"])
+    if isinstance(d["ndr"], str):
+        d["ndr"] = d["ndr"] == "True"
+    elif d["ndr"] is not None:
+        d["ndr"] = bool(d["ndr"])
+    if isinstance(d["extras"], str):
+        try:
+            d["extras"] = json.loads(d["extras"])
+        except ValueError:
+            d["extras"] = ast.literal_eval(d["extras"])  # CSV holds the dict repr
+    return PaperRecord(**d)
+
+
+def iter_jsonl_records(path: str) -> Iterator[PaperRecord]:
+    """Records from a JsonlWriter file (.gz included), in file order."""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield PaperRecord(**json.loads(line))
+
+
+def iter_csv_records(path: str) -> Iterator[PaperRecord]:
+    """Records from a CsvStreamWriter file, in file order."""
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            yield _from_row(row)
+
+
+def iter_sqlite_records(path: str) -> Iterator[PaperRecord]:
+    """Records from a SqliteWriter store, ordered by source_path (streamed by cursor)."""
+    import sqlite3
+
+    db = sqlite3.connect(path)
+    try:
+        db.row_factory = sqlite3.Row
+        for r in db.execute("SELECT * FROM records ORDER BY source_path"):
+            yield _from_row(dict(r))
+    finally:
+        db.close()
+
+
+def iter_records(path: str) -> Iterator[PaperRecord]:
+    """Read a JSONL, CSV or SQLite output back, chosen by file extension."""
+    if path.endswith((".jsonl", ".jsonl.gz")):
+        return iter_jsonl_records(path)
+    if path.endswith(".csv"):
+        return iter_csv_records(path)
+    if path.endswith((".db", ".sqlite", ".sqlite3")):
+        return iter_sqlite_records(path)
+    raise ValueError(f"Unsupported partial output: {path}")
+
+
+class RecordWriters:
+    """
+    Fans records out to several streaming writers; usable as a context manager.
+
+    Writers marked `streaming` (JSONL, CSV) and writers with only write(rec)
+    (e.g. plugins) get every record immediately, so finished work is on disk
+    even if the run is killed. The others (JSON array, Excel, SQLite) consume
+    a shared columnar RecordBatch, flushed every `batch_size` records or once
+    the oldest buffered record is `max_delay` seconds old.
+    With timed=True, seconds spent per writer class (write + close) go to .seconds.
+    """
+
+    def __init__(self, writers: List[Any], timed: bool = False, batch_size: int = 256,
+                 max_delay: float = 1.0):
+        self.writers = writers
+        self.count = 0
+        self.timed = timed
+        self.batch_size = max(1, batch_size)
+        self.max_delay = max_delay
+        self.seconds: Dict[str, float] = {}
+        self._now = [w for w in writers if getattr(w, "streaming", False) or not hasattr(w, "write_batch")]
+        self._batched = [w for w in writers if w not in self._now]
+        self._buf: List[PaperRecord] = []
+        self._since = 0.0
+
+    def _call(self, w: Any, fn, *args) -> None:
+        if not self.timed:
+            fn(*args)
+            return
+        t0 = time.perf_counter()
+        fn(*args)
+        name = type(w).__name__
+        self.seconds[name] = self.seconds.get(name, 0.0) + time.perf_counter() - t0
+
+    def write(self, rec: PaperRecord) -> None:
+        self.count += 1
+        if self._now:
+            one = RecordBatch([rec])
+            for w in self._now:
+                if hasattr(w, "write_batch"):
+                    self._call(w, w.write_batch, one)
+                else:
+                    self._call(w, w.write, rec)
+        if self._batched:
+            if not self._buf:
+                self._since = time.monotonic()
+            self._buf.append(rec)
+            if len(self._buf) >= self.batch_size or time.monotonic() - self._since >= self.max_delay:
+                self.flush()
+
+    def flush(self) -> None:
+        if not self._buf:
+            return
+        batch = RecordBatch(self._buf)
+        self._buf = []
+        for w in self._batched:
+            self._call(w, w.write_batch, batch)
+
+    def close(self) -> None:
+        self.flush()
+        for w in self.writers:
+            self._call(w, w.close)
+
+    def __enter__(self) -> "RecordWriters":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _write_all(writer: Any, records: Iterable[PaperRecord]) -> None:
+    with RecordWriters([writer]) as out:
+        for r in records:
+            out.write(r)
+
+
+def write_json(path: str, records: Iterable[PaperRecord]) -> None:
+    _write_all(JsonArrayWriter(path), records)
+
+def write_jsonl(path: str, records: Iterable[PaperRecord]) -> None:
+    _write_all(JsonlWriter(path), records)
+
+def write_csv(path: str, records: Iterable[PaperRecord]) -> None:
+    _write_all(CsvStreamWriter(path), records)
+
+def write_excel(path: str, records: Iterable[PaperRecord]) -> None:
+    _write_all(ExcelStreamWriter(path), records)
+
+def write_sqlite(path: str, records: Iterable[PaperRecord], source_dir: str, key: str = "sha") -> None:
+    _write_all(SqliteWriter(path, source_dir, key), records)
@@ -0,0 +1,99 @@
+import os, json, time
+from typing import Dict, Optional
+from .models import PaperRecord
+
+JOURNAL_NAME = ".paperloom-journal.jsonl"
+
+
+def file_stamp(path: str) -> Dict[str, int]:
+    """Dosyanın değişip değişmediğini anlamak için ucuz kimlik (boyut + mtime)."""
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+class RunJournal:
+    """
+    Çıktı klasöründe, tamamlanan her dosyayı ve kaydını tutan salt-ekleme günlüğü.
+
+    Her satır bağımsız bir JSON nesnesidir ({"file", "size", "mtime_ns", "record"},
+    biliniyorsa "sha256"),
+    bu yüzden çöken bir çalışmanın yarım kalmış son satırı okurken atlanır.
+    Her kayıt hemen işletim sistemine yazılır (flush); diske kalıcı yazma
+    (fsync) ise `batch` kayıtta ya da `interval` saniyede bir, toplu yapılır.
+    """
+
+    def __init__(self, path: str, resume: bool = False, batch: int = 64, interval: float = 2.0):
+        self.path = path
+        self.batch = batch
+        self.interval = interval
+        self.done: Dict[str, dict] = self._load() if resume else {}
+        self._f = open(path, "a" if resume else "w", encoding="utf-8")
+        if resume and self._torn_tail():
+            self._f.write("\n")  # yarım satırın devamına yazmamak için
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def _load(self) -> Dict[str, dict]:
+        done: Dict[str, dict] = {}
+        if not os.path.exists(self.path):
+            return done
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    done[entry["file"]] = entry
+                except (ValueError, KeyError, TypeError):
+                    continue  # yarım kalmış satır
+        return done
+
+    def _torn_tail(self) -> bool:
+        with open(self.path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() == 0:
+                return False
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) != b"\n"
+
+    def completed(self, path: str, name: Optional[str] = None) -> Optional[PaperRecord]:
+        """
+        Dosya bu günlükte tamamlanmış ve o zamandan beri değişmemişse kaydını döndür.
+        name, günlükteki anahtardır (kaydın source_path'i; verilmezse dosya adı).
+        """
+        entry = self.done.get(name or os.path.basename(path))
+        if entry is None:
+            return None
+        try:
+            stamp = file_stamp(path)
+        except OSError:
+            return None
+        if entry.get("size") != stamp["size"] or entry.get("mtime_ns") != stamp["mtime_ns"]:
+            return None
+        rec = PaperRecord(**entry["record"])
+        rec.file_sha256 = entry.get("sha256")
+        return rec
+
+    def append(self, path: str, rec: PaperRecord) -> None:
+        entry = {"file": rec.source_path or os.path.basename(path), **file_stamp(path), "record": rec.to_dict()}
+        if rec.file_sha256:
+            entry["sha256"] = rec.file_sha256
+        self._f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._f.flush()
+        self._pending += 1
+        if self._pending >= self.batch or time.monotonic() - self._last_sync >= self.interval:
+            self.sync()
+
+    def sync(self) -> None:
+        if self._pending:
+            os.fsync(self._f.fileno())
+            self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        self.sync()
+        self._f.close()
+
+    def __enter__(self) -> "RunJournal":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
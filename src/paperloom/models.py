@@ -1,7 +1,10 @@
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field, fields
 from typing import Optional, Dict, Any
 
-@dataclass
+# slots=True: örnek başına __dict__ yok (daha az bellek, daha hızlı öznitelik
+# erişimi). İkili kodlama için bkz. codec.py. json/copy ihtiyaç anında
+# yüklenir ki `import paperloom` ucuz kalsın.
+@dataclass(slots=True)
 class PaperRecord:
     source_path: str
     title: Optional[str] = None
@@ -25,6 +28,31 @@ class PaperRecord:
     ndr: Optional[bool] = None                   # Negative Differential Resistance mentioned?
     confidence: Optional[float] = None           # simple heuristic confidence score (0..1)
     extras: Optional[Dict[str, Any]] = None
+    # Kaynak PDF'in SHA-256'sı: işçide hesaplanıp kayıtla taşınır ki SqliteWriter
+    # dosyayı ana süreçte yeniden okumasın. Çıktı alanı değildir (FIELDS dışı).
+    file_sha256: Optional[str] = field(default=None, repr=False, compare=False, metadata={"output": False})
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        # asdict her değeri özyinelemeli kopyalar; burada yalnızca extras (tek
+        # iç içe alan) kopyalanır, diğer alanlar değişmez türlerdir
+        d = {f: getattr(self, f) for f in FIELDS}
+        if self.extras is not None:
+            from copy import deepcopy
+            d["extras"] = deepcopy(self.extras)
+        return d
+
+    def to_json(self) -> str:
+        import json
+        return json.dumps(self.to_dict(), ensure_ascii=False)
+
+    def to_bytes(self) -> bytes:
+        from .codec import encode_record
+        return encode_record(self)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "PaperRecord":
+        from .codec import decode_record
+        return decode_record(data)
+
+
+FIELDS = tuple(f.name for f in fields(PaperRecord) if f.metadata.get("output", True))
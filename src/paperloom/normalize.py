@@ -1,22 +1,208 @@
 import re, unicodedata
+from typing import Iterable, List
 
 LIGATURES = {
     "\ufb00": "ff", "\ufb01": "fi", "\ufb02": "fl", "\ufb03": "ffi", "\ufb04": "ffl",
     "\u00ad": "",   # soft hyphen
 }
 
-def normalize_text(text: str) -> str:
-    # Unicode normalize
-    text = unicodedata.normalize("NFKC", text or "")
-    # Replace common ligatures/soft hyphens
-    for k, v in LIGATURES.items():
-        text = text.replace(k, v)
-    # Join hyphenated line breaks: e.g., "nano-\nbon" -> "nanobon"
-    text = re.sub(r"(\w)-\s*\n\s*(\w)", r"\1\2", text)
+# Tek geçişte ligatür/yumuşak tire dönüşümü
+_TRANSLATE = str.maketrans(LIGATURES)
+
+# Desenler bilerek sabit bir karakterle başlar: re motoru böylece adayları hızlı
+# arar (\w ya da \d ile başlayan bir desen her konumda denenir ve ~20 kat
+# yavaştır). Eski re.sub geçişlerinin tuhaflıkları da korunur: bir eşleşmenin
+# yuttuğu sağ karakter bir sonrakinin sol karakteri olamaz ("a-\nb-\nc" →
+# "ab-\nc", "1×2×3" → "1x2×3"); bu yüzden adaylar `floor` ile süzülür.
+# \w / \d / \s ile str.isalnum()+"_" / isdecimal() / isspace() aynı kümelerdir.
+_RE_HYPHEN_BREAK = re.compile(r"-\s*\n\s*")
+_RE_KGRID_X = [re.compile(x + r"(?=\s*\d\s*[xX]\s*\d)") for x in ("x", "X")]
+_RE_SPACES = re.compile(r"  +")
+_RE_NL_TAIL = re.compile(r"\n\s+")
+_RE_WS_BEFORE_NL = re.compile(r"[^\S\n]+\n")
+# " ", "\t" ve "\n" dışındaki boşluk karakterleri (str.isspace)
+_OTHER_WS = "\x0b\x0c\r\x1c\x1d\x1e\x1f\x85\xa0\u1680" + "".join(map(chr, range(0x2000, 0x200b))) + "\u2028\u2029\u202f\u205f\u3000"
+
+
+def _is_word(c: str) -> bool:
+    return c.isalnum() or c == "_"
+
+
+def _skip_back(text: str, i: int) -> int:
+    while i >= 0 and text[i].isspace():
+        i -= 1
+    return i
+
+
+def _skip(text: str, i: int) -> int:
+    n = len(text)
+    while i < n and text[i].isspace():
+        i += 1
+    return i
+
+
+def _join_hyphens(text: str) -> str:
+    """re.sub(r"(\w)-\s*\n\s*(\w)", r"\1\2", text) ile aynı: "nano-\nbon" -> "nanobon"."""
+    out, last, floor = [], 0, 0
+    for m in _RE_HYPHEN_BREAK.finditer(text):
+        i, j = m.start() - 1, m.end()
+        if i < floor or j >= len(text) or not _is_word(text[i]) or not _is_word(text[j]):
+            continue
+        out.append(text[last:i + 1])
+        last, floor = j, j + 1
+    if not out:
+        return text
+    out.append(text[last:])
+    return "".join(out)
+
+
+def _times_to_x(text: str) -> str:
+    """re.sub(r"(\d)\s*×\s*(\d)", r"\1x\2", text) ile aynı."""
+    out, last, floor = [], 0, 0
+    k = text.find("×")
+    while k >= 0:
+        i, j = _skip_back(text, k - 1), _skip(text, k + 1)
+        if i >= floor and text[i].isdecimal() and j < len(text) and text[j].isdecimal():
+            out.append(text[last:i + 1])
+            out.append("x")
+            last, floor = j, j + 1
+        k = text.find("×", k + 1)
+    if not out:
+        return text
+    out.append(text[last:])
+    return "".join(out)
+
+
+def _kgrid_to_x(text: str) -> str:
+    """re.sub(r"(\d)\s*[xX]\s*(\d)\s*[xX]\s*(\d)", r"\1x\2x\3", text) ile aynı."""
+    starts = sorted(m.start() for r in _RE_KGRID_X for m in r.finditer(text))
+    out, last, floor = [], 0, 0
+    for k in starts:
+        i = _skip_back(text, k - 1)
+        if i < floor or not text[i].isdecimal():
+            continue
+        p2 = _skip(text, k + 1)        # ilerisi lookahead ile garanti
+        p3 = _skip(text, _skip(text, p2 + 1) + 1)
+        out.append(text[last:i + 1])
+        out += ("x", text[p2], "x")
+        last, floor = p3, p3 + 1
+    if not out:
+        return text
+    out.append(text[last:])
+    return "".join(out)
+
+
+def _collapse_whitespace(text: str) -> str:
+    """[ \t]+ → " ", sonra \s*\n\s* → "\n" (eski iki re.sub geçişiyle aynı)."""
+    if "\t" in text:
+        text = text.replace("\t", " ")
+    if "  " in text:
+        text = _RE_SPACES.sub(" ", text)
+    # \n içeren boşluk dizisi: önce ilk \n'den sonrası, sonra öncesi atılır
+    text = _RE_NL_TAIL.sub("\n", text)
+    if any(c in text for c in _OTHER_WS):
+        return _RE_WS_BEFORE_NL.sub("\n", text)
+    # Bu noktada \n'den önce olabilecek tek boşluk tek bir " "dir
+    return text.replace(" \n", "\n")
+
+
+def _normalize(text: str) -> str:
+    """normalize_text'in strip edilmemiş hali (Normalizer parçalar için kullanır)."""
+    # Unicode normalize (zaten NFKC ise kopyalanmaz)
+    if not unicodedata.is_normalized("NFKC", text):
+        text = unicodedata.normalize("NFKC", text)
+    # Replace common ligatures/soft hyphens (yalnızca varsa; translate karakter başına çalışır)
+    if any(k in text for k in LIGATURES):
+        text = text.translate(_TRANSLATE)
+    # Join hyphenated line breaks
+    text = _join_hyphens(text)
     # Normalize k-point separator to x
-    text = re.sub(r"(\d)\s*×\s*(\d)", r"\1x\2", text)
-    text = re.sub(r"(\d)\s*[xX]\s*(\d)\s*[xX]\s*(\d)", r"\1x\2x\3", text)
+    if "×" in text:
+        text = _times_to_x(text)
+    text = _kgrid_to_x(text)
     # Collapse whitespace
-    text = re.sub(r"[ \t]+", " ", text)
-    text = re.sub(r"\s*\n\s*", "\n", text)
-    return text.strip()
+    return _collapse_whitespace(text)
+
+
+def normalize_text(text: str) -> str:
+    """
+    NFKC, ligatür/yumuşak tire temizliği, satır sonu tirelerini birleştirme,
+    k-nokta ayıracını "x" yapma ve boşluk sadeleştirme. Her geçiş yalnızca
+    metinde işi varsa kopya üretir; çıktı eski re.sub zinciriyle birebir aynıdır.
+    """
+    return _normalize(text or "").strip()
+
+
+# -----------------------------
+#  Parça parça normalize
+# -----------------------------
+# Sayfalar (ya da herhangi bir bölünme) geldikçe normalize etmek için. Çıktının
+# birleşimi normalize_text(tüm metin) ile birebir aynıdır: metin yalnızca
+# hiçbir kuralın karşısına geçemeyeceği bir noktada kesilir, kalan kuyruk
+# sonraki parçayla birlikte işlenir. Kesim noktası: ASCII bir harf ya da
+# noktalama (rakam, x/X ve "-" hariç; bunlar tire birleştirme ve k-nokta
+# kurallarına girer) ve hemen ardından gelen boşluk dizisinin başı.
+
+_SAFE_LEFT = frozenset("ABCDEFGHIJKLMNOPQRSTUVWYZabcdefghijklmnopqrstuvwyz.,;:!?)]}'\"%")
+_ASCII_SPACE = frozenset(" \t\n\r")
+
+
+def _cut_point(text: str) -> int:
+    """text içindeki son güvenli kesim noktası (satır sonlarında aranır); yoksa 0."""
+    pos = text.rfind("\n")
+    while pos > 0:
+        start = pos
+        while start > 0 and text[start - 1] in _ASCII_SPACE:
+            start -= 1
+        if start > 0 and text[start - 1] in _SAFE_LEFT:
+            return start
+        pos = text.rfind("\n", 0, start)
+    return 0
+
+
+class Normalizer:
+    """
+    Metni parça parça normalize eder:
+
+        norm = Normalizer()
+        out = [norm.feed(page + "\\n") for page in pages]
+        out.append(norm.finish())
+        "".join(out) == normalize_text("".join(pages + ...))
+
+    feed() o ana kadar kesinleşen çıktıyı döndürür (boş olabilir); satır
+    sonuna taşan tire birleştirmeleri ve k-nokta ayıraçları kuyrukta bekler.
+    """
+
+    def __init__(self) -> None:
+        self._tail = ""
+        self._started = False
+
+    def _emit(self, text: str) -> str:
+        out = _normalize(text)
+        if not self._started:
+            out = out.lstrip()
+            self._started = bool(out)
+        return out
+
+    def feed(self, chunk: str) -> str:
+        buf = self._tail + (chunk or "")
+        cut = _cut_point(buf)
+        if not cut:
+            self._tail = buf
+            return ""
+        self._tail = buf[cut:]
+        return self._emit(buf[:cut])
+
+    def finish(self) -> str:
+        buf, self._tail = self._tail, ""
+        return self._emit(buf).rstrip()
+
+
+def normalize_pages(pages: Iterable[str], sep: str = "\n") -> str:
+    """normalize_text(sep.join(pages)) ile aynı sonuç; sayfalar parça parça işlenir."""
+    norm = Normalizer()
+    out: List[str] = []
+    for i, page in enumerate(pages):
+        out.append(norm.feed(page if i == 0 else sep + page))
+    out.append(norm.finish())
+    return "".join(out)
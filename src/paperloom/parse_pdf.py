@@ -1,14 +1,53 @@
-from typing import Optional
-from PyPDF2 import PdfReader
-
-def read_pdf_text(path: str, max_pages: Optional[int] = None) -> str:
-    reader = PdfReader(path)
-    texts = []
-    for i, p in enumerate(reader.pages):
-        if max_pages is not None and i >= max_pages:
-            break
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import IO, Iterator, List, Optional, Tuple, Union
+
+# A file path or a binary stream (e.g. io.BytesIO with PDF bytes)
+PdfSource = Union[str, IO[bytes]]
+
+def _reader(path: PdfSource):
+    # PyPDF2 is imported on first use so that CLI startup does not pay for it
+    from PyPDF2 import PdfReader
+    return PdfReader(path)
+
+def _page_texts(reader, start: int = 0, stop: Optional[int] = None) -> Iterator[str]:
+    for p in reader.pages[start:stop]:
         try:
-            texts.append(p.extract_text() or "")
+            yield p.extract_text() or ""
         except Exception:
-            texts.append("")
-    return "\n".join(texts)
+            yield ""
+
+def iter_pdf_pages(path: PdfSource, max_pages: Optional[int] = None) -> Iterator[str]:
+    """Yield the text of each page lazily; pages that fail to extract yield ''."""
+    yield from _page_texts(_reader(path), 0, max_pages)
+
+def read_pdf_text(path: PdfSource, max_pages: Optional[int] = None) -> str:
+    return "\n".join(iter_pdf_pages(path, max_pages))
+
+def count_pages(path: PdfSource) -> int:
+    return len(_reader(path).pages)
+
+def read_page_range(path: str, span: Tuple[int, int]) -> List[str]:
+    """Texts of pages [start, stop); each worker opens its own reader."""
+    return list(_page_texts(_reader(path), *span))
+
+def page_ranges(n_pages: int, workers: int, per_worker: int = 4) -> List[Tuple[int, int]]:
+    """Split 0..n_pages into contiguous ranges (a few per worker, for load balance)."""
+    n_ranges = max(1, min(n_pages, workers * per_worker))
+    size = max(1, -(-n_pages // n_ranges))
+    return [(i, min(i + size, n_pages)) for i in range(0, n_pages, size)]
+
+def read_pdf_pages_parallel(path: str, workers: int, n_pages: Optional[int] = None) -> List[str]:
+    """
+    Extract page ranges in a process pool and stitch them back in page order.
+    The result is the same list iter_pdf_pages would yield, so joining it with
+    '\\n' gives exactly the sequential text (hyphens split across a page break
+    are still joined by normalize_text).
+    """
+    if n_pages is None:
+        n_pages = count_pages(path)
+    pages: List[str] = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk in pool.map(partial(read_page_range, path), page_ranges(n_pages, workers)):
+            pages.extend(chunk)
+    return pages
@@ -1,25 +1,31 @@
-import os, glob, logging
-from typing import List
+import io, os, json, logging, itertools, multiprocessing
+from collections import Counter, deque
+from contextlib import nullcontext
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from logging.handlers import QueueHandler, QueueListener
+from typing import Callable, ContextManager, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
 from .models import PaperRecord
-from .parse_pdf import read_pdf_text
-from .normalize import normalize_text
-from .extract_rules import extract_all
+from .defaults import PAGE_THRESHOLD
+from .batch import IMPORTANT_FIELDS, RecordBatch, confidence_column
+from .parse_pdf import PdfSource, iter_pdf_pages, count_pages, read_pdf_pages_parallel
+from .normalize import Normalizer, normalize_text
+from .extract_rules import extract_all, IncrementalExtractor, RULE_TIME_BUDGET
+from .cache import ResultCache, cache_variant, file_sha256
+from .profiling import DocProfile, RunMetrics
+from .journal import RunJournal, JOURNAL_NAME
+from .textstore import TextStore
+from .supervise import Quarantine, QUARANTINE_NAME, run_supervised
+from .discover import iter_pdfs, iter_manifest, largest_first, source_name
+from .telemetry import Telemetry, Snapshot
 
-IMPORTANT_FIELDS = [
-    "functional", "u_values", "kpoints", "bandgap_ev", "bandgap_type",
-    "doping", "vacancy", "passivation", "ndr"
-]
+# Erken durdurma için IMPORTANT_FIELDS'e ek olarak beklenen metadata alanları
+META_FIELDS = ["title", "doi", "year", "authors", "abstract"]
 
 
 def _confidence(feats: dict) -> float:
     """Önemli alanların doluluk oranına göre basit bir güven skoru (0..1)."""
-    if not IMPORTANT_FIELDS:
-        return 0.0
-    present = sum(
-        1 for k in IMPORTANT_FIELDS
-        if feats.get(k) not in (None, "", [], {})
-    )
-    return round(present / len(IMPORTANT_FIELDS), 3)
+    return confidence_column({k: [feats.get(k)] for k in IMPORTANT_FIELDS}, 1)[0]
 
 
 def _setup_logger(output_dir: str, level: int) -> logging.Logger:
@@ -42,39 +48,364 @@ def _setup_logger(output_dir: str, level: int) -> logging.Logger:
 def _sanitize_record(rec: PaperRecord) -> PaperRecord:
     """
     Çıkarılan kaydı fiziksel olarak anlamsız değerlerden temizle.
-    (2055 yılı, 50 eV bant aralığı, saçma pasivasyon vb.)
-    """
-    # Yıl: çok eski veya çok gelecekteyse None
-    if rec.year is not None:
-        if rec.year < 1970 or rec.year > 2035:
-            rec.year = None
-
-    # Band gap: negatif veya aşırı büyükse None
-    if rec.bandgap_ev is not None:
-        try:
-            val = float(rec.bandgap_ev)
-            if val < 0.0 or val > 10.0:
-                rec.bandgap_ev = None
-        except Exception:
-            rec.bandgap_ev = None
-
-    # Manyetik moment: makul aralığın dışındaysa None
-    if rec.magnetic_moment is not None:
-        try:
-            num = float(str(rec.magnetic_moment).split()[0])
-            if num < 0.0 or num > 10.0:
-                rec.magnetic_moment = None
-        except Exception:
-            rec.magnetic_moment = None
-
-    # Passivasyon: sadece H/F/S kabul et
-    if rec.passivation is not None and rec.passivation not in ("H", "F", "S"):
-        rec.passivation = None
-
-    # Vacancy: sadece V_Zn veya V_O kalsın
-    if rec.vacancy is not None and rec.vacancy not in ("V_Zn", "V_O"):
-        rec.vacancy = None
+    (2055 yılı, 50 eV bant aralığı, saçma pasivasyon vb.; kurallar batch.sanitize_columns'ta)
+    """
+    RecordBatch([rec]).sanitize()
+    return rec
+
+
+def _build_record(source_path: str, feats: dict) -> PaperRecord:
+    """extract_all çıktısından (güven skoruyla birlikte) PaperRecord oluştur."""
+    return PaperRecord(
+        source_path=source_path,
+        title=feats.get("title"),
+        authors=feats.get("authors"),
+        year=int(feats["year"]) if feats.get("year") else None,
+        doi=feats.get("doi"),
+        keywords=feats.get("keywords"),
+        abstract=feats.get("abstract"),
+
+        system=feats.get("system"),
+        edge=feats.get("edge"),
+        passivation=feats.get("passivation"),
+        doping=feats.get("doping"),
+        vacancy=feats.get("vacancy"),
+        functional=feats.get("functional"),
+        u_values=feats.get("u_values"),
+        kpoints=feats.get("kpoints"),
+        bandgap_ev=feats.get("bandgap_ev"),
+        bandgap_type=feats.get("bandgap_type"),
+        magnetic_moment=feats.get("magnetic_moment"),
+        ndr=feats.get("ndr"),
+
+        confidence=_confidence(feats),
+        extras=feats.get("extras"),
+    )
+
+
+def _no_stage(name: str):
+    return nullcontext()
+
+
+def _read_pages(
+    path: PdfSource,
+    page_budget: Optional[int],
+    early_stop: bool,
+    page_workers: int = 1,
+    page_threshold: int = PAGE_THRESHOLD,
+    rule_timeout: Optional[float] = RULE_TIME_BUDGET,
+    stage: Callable[[str], ContextManager] = _no_stage,
+) -> Tuple[str, int]:
+    """
+    Sayfaları sırayla oku; (normalize edilmiş metin, okunan sayfa sayısı)
+    döndürür. Metin normalize_text("\n".join(sayfalar)) ile aynıdır. early_stop
+    açıksa sayfalar okundukça Normalizer'dan geçirilir (her sayfa bir kez
+    normalize edilir) ve çıkan metin IncrementalExtractor'a verilir;
+    IMPORTANT_FIELDS + META_FIELDS dolunca kalan sayfalar hiç ayrıştırılmaz.
+    page_budget en fazla kaç sayfa okunacağıdır; rule_timeout erken durdurma
+    kontrolündeki kural başına süre bütçesidir. stage, "read" (yalnızca sayfa
+    ayrıştırma), "normalize" ve "early_stop" (IncrementalExtractor kuralları)
+    aşamalarının süresini ölçer (bkz. DocProfile.stage).
+
+    page_workers > 1 ve (bütçe sonrası) sayfa sayısı page_threshold'u aşıyorsa
+    sayfa aralıkları paralel okunur ve sırayla birleştirilir; sonuç metin
+    sıralı okumayla birebir aynıdır. Erken durdurma sıralı okuma gerektirdiği
+    için bu durumda paralel okuma yapılmaz. path bir akış (BytesIO) da olabilir;
+    akışlar her zaman sıralı okunur.
+    """
+    label = os.path.basename(path) if isinstance(path, str) else "<stream>"
+    if page_workers > 1 and not early_stop and isinstance(path, str):
+        n_pages = count_pages(path)
+        if page_budget is not None:
+            n_pages = min(n_pages, page_budget)
+        if n_pages > page_threshold:
+            logging.getLogger("paperloom.extract").debug(
+                "Reading %d pages of %s with %d page worker(s).",
+                n_pages, label, page_workers,
+            )
+            with stage("read"):
+                pages = read_pdf_pages_parallel(path, page_workers, n_pages)
+            with stage("normalize"):
+                return normalize_text("\n".join(pages)), len(pages)
+
+    if not early_stop:
+        with stage("read"):
+            pages = list(iter_pdf_pages(path, max_pages=page_budget))
+        with stage("normalize"):
+            return normalize_text("\n".join(pages)), len(pages)
+
+    tracker = IncrementalExtractor(IMPORTANT_FIELDS + META_FIELDS, time_budget=rule_timeout)
+    norm = Normalizer()
+    out: List[str] = []
+    n_pages = 0
+    it = iter_pdf_pages(path, max_pages=page_budget)
+    while True:
+        with stage("read"):
+            page = next(it, None)
+        if page is None:
+            break
+        with stage("normalize"):
+            chunk = norm.feed(page if not n_pages else "\n" + page)
+        n_pages += 1
+        out.append(chunk)
+        # Normalizer kesin olmayan kuyruğu tutar; yeni metin yoksa kurallar yeniden koşmaz
+        with stage("early_stop"):
+            done = bool(chunk) and tracker.feed(chunk)
+        if done:
+            logging.getLogger("paperloom.extract").debug(
+                "All fields found in %s after %d page(s); stopping early.",
+                label, n_pages,
+            )
+            break
+    with stage("normalize"):
+        out.append(norm.finish())
+    return "".join(out), n_pages
+
+
+def _process_pdf(
+    path: str,
+    cache: Optional[ResultCache] = None,
+    page_budget: Optional[int] = None,
+    early_stop: bool = False,
+    rule_timeout: Optional[float] = RULE_TIME_BUDGET,
+    prof: Optional[DocProfile] = None,
+    page_workers: int = 1,
+    page_threshold: int = PAGE_THRESHOLD,
+    store: Optional[TextStore] = None,
+    root: Optional[str] = None,
+    hash_source: bool = False,
+) -> Optional[PaperRecord]:
+    """
+    Tek bir PDF için read_pdf_text → normalize_text → extract_all → _sanitize_record
+    zincirini çalıştırır. Önbellekte aynı içerik varsa kayıt doğrudan oradan gelir.
+    Hata olursa günlüğe yazar ve None döndürür.
+
+    store verilirse normalize edilmiş metin metin deposuna da yazılır; içerik
+    depoda yoksa önbelleğe bakılmaz (metin ancak ayrıştırılarak elde edilir).
+
+    root verilirse kaydın source_path'i root'a göre göreli yoldur (alt klasörler).
+
+    Dosyanın SHA-256'sı (önbellek, metin deposu ya da hash_source=True için)
+    burada, işçide bir kez hesaplanır ve kaydın file_sha256 alanında döner.
+
+    prof verilirse aşama/kural süreleri, sayfa sayısı ve metin uzunluğu içine
+    yazılır (günlükteki özet satırı _process_pdf_profiled'dandır).
+    """
+    logger = logging.getLogger("paperloom.extract")
+    name = source_name(path, root)
+    stage = prof.stage if prof is not None else _no_stage
+    try:
+        key = digest = None
+        stored = False
+        if store is not None or cache is not None or hash_source:
+            digest = file_sha256(path)
+        if store is not None:
+            stored = store.has(digest)
+        if cache is not None:
+            with stage("cache_lookup"):
+                key = cache.key_for(path, cache_variant(page_budget, early_stop), digest)
+                cached = cache.get(key, name) if store is None or stored else None
+            if cached is not None:
+                logger.info("Cache hit: %s", name)
+                if prof is not None:
+                    prof.cached = True
+                if store is not None:
+                    store.put(digest, name, "", 0)  # yalnızca ad → mevcut metin
+                cached.file_sha256 = digest
+                return cached
+
+        logger.info("Reading PDF: %s", name)
+        norm, n_pages = _read_pages(path, page_budget, early_stop, page_workers, page_threshold,
+                                    rule_timeout, stage)
+        if store is not None:
+            with stage("store_text"):
+                store.put(digest, name, norm, n_pages)
+        with stage("extract"):
+            feats = extract_all(norm, time_budget=rule_timeout,
+                                timings=prof.rules if prof is not None else None)
+        extras = feats.get("extras")
+        if extras and extras.get("rule_timeouts"):
+            logger.warning(
+                "Rule time budget exceeded in %s: %s",
+                name, ", ".join(extras["rule_timeouts"]),
+            )
+
+        with stage("sanitize"):
+            rec = _build_record(name, feats)
+            rec = _sanitize_record(rec)
+            rec.file_sha256 = digest
+        # Zaman aşımına uğramış (eksik) kayıtlar önbelleğe yazılmaz
+        if cache is not None and not extras:
+            with stage("cache_store"):
+                cache.put(key, rec)
+        logger.info(
+            "Processed %s (confidence=%.3f)",
+            name,
+            rec.confidence if rec.confidence is not None else 0.0,
+        )
+        if prof is not None:
+            prof.pages, prof.chars = n_pages, len(norm)
+        return rec
+
+    except Exception as e:
+        logger.exception("Failed on %s: %s", name, e)
+        return None
+
+
+def _process_stream(
+    data: bytes,
+    name: str,
+    page_budget: Optional[int] = None,
+    early_stop: bool = False,
+    rule_timeout: Optional[float] = RULE_TIME_BUDGET,
+) -> Dict[str, object]:
+    """
+    Bellekteki PDF baytlarından kayıt sözlüğü üret (HTTP servisi için).
+    _process_pdf'in aksine önbellek kullanmaz ve hata olursa istisnayı yükseltir.
+    """
+    return _extract_source(io.BytesIO(data), name, page_budget, early_stop, rule_timeout).to_dict()
+
+
+def _extract_source(
+    source: PdfSource,
+    name: str,
+    page_budget: Optional[int] = None,
+    early_stop: bool = False,
+    rule_timeout: Optional[float] = RULE_TIME_BUDGET,
+) -> PaperRecord:
+    """Yol ya da akıştan (BytesIO, açık dosya) kayıt; günlük/önbellek yok, hata yükseltilir."""
+    norm, _ = _read_pages(source, page_budget, early_stop, rule_timeout=rule_timeout)
+    feats = extract_all(norm, time_budget=rule_timeout)
+    return _sanitize_record(_build_record(name, feats))
+
+
+def _process_pdf_profiled(
+    path: str, log_profile: bool = True, **kwargs
+) -> Tuple[Optional[PaperRecord], Dict[str, object]]:
+    """
+    _process_pdf'i bir DocProfile ile çalıştır; profil sözlük olarak döner
+    (süreçler arası taşınabilir). log_profile=False ise özet satırı yazılmaz
+    (profil yalnızca canlı ilerleme için, ör. sayfa sayısı, toplanıyorsa).
+    """
+    prof = DocProfile(source_name(path, kwargs.get("root")))
+    rec = _process_pdf(path, prof=prof, **kwargs)
+    if log_profile and rec is not None and not prof.cached:
+        logging.getLogger("paperloom.extract").info("Profile %s: %s", prof.source_path, prof.summary())
+    return rec, prof.to_dict()
+
+
+def _init_worker(queue, level: int) -> None:
+    """İşçi süreçte günlük kayıtlarını ana sürece (extraction.log) yönlendir."""
+    logger = logging.getLogger("paperloom.extract")
+    logger.handlers[:] = [QueueHandler(queue)]
+    logger.setLevel(level)
+    logger.propagate = False
+
+
+def _apply_chunk(fn: Callable, paths: List[str]) -> list:
+    return [fn(p) for p in paths]
+
+
+def _bounded_map(pool: ProcessPoolExecutor, fn: Callable, items: Iterable[str],
+                 window: int, chunksize: int = 1) -> Iterator[Tuple[str, object]]:
+    """
+    pool.map gibi (sonuçlar giriş sırasıyla), ama girdiler tembel tüketilir:
+    havuzda aynı anda en fazla `window` parça bulunur. pool.map tüm girdiyi
+    baştan gönderir; bu, keşif akışını ve belleği sınırsız büyütürdü.
+    """
+    it = iter(items)
+    pending: Deque = deque()
+    while True:
+        while len(pending) < window:
+            chunk = list(itertools.islice(it, chunksize))
+            if not chunk:
+                break
+            pending.append((chunk, pool.submit(_apply_chunk, fn, chunk)))
+        if not pending:
+            return
+        chunk, fut = pending.popleft()
+        yield from zip(chunk, fut.result())
+
 
+def _run_parallel(
+    pdfs: Iterable[str],
+    workers: int,
+    logger: logging.Logger,
+    profile: bool = False,
+    total: Optional[int] = None,
+    **kwargs,
+) -> Iterator[Tuple[str, Optional[PaperRecord], Optional[Dict[str, object]]]]:
+    """
+    PDF'leri bir süreç havuzunda işler. (yol, kayıt, profil) üçlüleri giriş
+    sırasıyla ve hazır oldukça üretilir; işçilerin günlük kayıtları bir kuyruk
+    üzerinden extraction.log'a akar. pdfs bir üreteç olabilir (total bilinmez).
+    """
+    queue = multiprocessing.Queue()
+    listener = QueueListener(queue, *logger.handlers, respect_handler_level=True)
+    listener.start()
+    try:
+        # Küçük parçalar: uzun PDF'ler tek bir işçide birikmesin
+        chunksize = max(1, min(8, total // (workers * 8))) if total is not None else 2
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(queue, logger.level),
+        ) as pool:
+            if profile:
+                fn = partial(_process_pdf_profiled, **kwargs)
+                for path, (rec, prof) in _bounded_map(pool, fn, pdfs, workers * 4, chunksize):
+                    yield path, rec, prof
+            else:
+                fn = partial(_process_pdf, **kwargs)
+                for path, rec in _bounded_map(pool, fn, pdfs, workers * 4, chunksize):
+                    yield path, rec, None
+    finally:
+        listener.stop()
+
+
+def _run_supervised(
+    pdfs: Iterable[str],
+    workers: int,
+    logger: logging.Logger,
+    quarantine: Quarantine,
+    doc_timeout: Optional[float] = None,
+    max_rss_mb: Optional[float] = None,
+    max_tasks: Optional[int] = None,
+    profile: bool = False,
+    **kwargs,
+) -> Iterator[Tuple[str, Optional[PaperRecord], Optional[Dict[str, object]]]]:
+    """
+    _run_parallel gibi, ama her belge süre/bellek sınırı altında denetimli bir
+    işçide işlenir (bkz. supervise.py). Öldürülen belgeler karantinaya yazılır
+    ve (yol, None, None) olarak döner.
+    """
+    queue = multiprocessing.Queue()
+    listener = QueueListener(queue, *logger.handlers, respect_handler_level=True)
+    listener.start()
+    try:
+        fn = partial(_process_pdf_profiled if profile else _process_pdf, **kwargs)
+        for path, res in run_supervised(pdfs, fn, workers, doc_timeout, max_rss_mb, max_tasks,
+                                        on_kill=quarantine.add, initializer=_init_worker,
+                                        initargs=(queue, logger.level), name=quarantine.name):
+            yield (path, *res) if profile and res is not None else (path, res, None)
+    finally:
+        listener.stop()
+
+
+def _skip_quarantined(pdfs: Iterable[str], quarantine: Quarantine, logger: logging.Logger) -> Iterator[str]:
+    for p in pdfs:
+        if p in quarantine:
+            logger.warning("Skipping quarantined PDF: %s (%s)", quarantine.name(p),
+                           quarantine.entries[quarantine.name(p)].get("reason"))
+        else:
+            yield p
+
+
+def _merge_duplicates(rec: PaperRecord, merged: Dict[str, List[str]]) -> PaperRecord:
+    """Tutulan kayda kopya dosyaların adlarını ekle (dedup="merge")."""
+    dups = merged.get(rec.source_path)
+    if dups:
+        rec.extras = dict(rec.extras or {}, duplicates=dups)
     return rec
 
 
@@ -85,74 +416,368 @@ def extract_pdfs(
     csv_name: str = "znr_dataset.csv",
     excel_name: str = "znr_dataset.xlsx",
     log_level: str = "INFO",
+    workers: int = 1,
+    use_cache: bool = True,
+    rebuild_cache: bool = False,
+    cache_dir: Optional[str] = None,
+    cache_max_mb: int = 512,
+    jsonl_name: Optional[str] = None,
+    page_budget: Optional[int] = None,
+    early_stop: bool = False,
+    rule_timeout: Optional[float] = RULE_TIME_BUDGET,
+    profile: bool = False,
+    metrics_name: str = "metrics.json",
+    top_n: int = 10,
+    page_workers: int = 1,
+    page_threshold: int = PAGE_THRESHOLD,
+    resume: bool = False,
+    journal_batch: int = 64,
+    sqlite_name: Optional[str] = None,
+    sqlite_key: str = "sha",
+    extra_writers: Optional[List[Tuple[str, str]]] = None,
+    dedup: str = "off",
+    dedup_threshold: float = 0.8,
+    dedup_name: str = "duplicates.json",
+    shard: Optional[Tuple[int, int]] = None,
+    store_text: Optional[str] = None,
+    doc_timeout: Optional[float] = None,
+    max_rss_mb: Optional[float] = None,
+    max_tasks_per_worker: Optional[int] = None,
+    retry_quarantined: bool = False,
+    recursive: bool = False,
+    include: Optional[List[str]] = None,
+    exclude: Optional[List[str]] = None,
+    manifest: Optional[str] = None,
+    schedule: str = "input",
+    progress: Optional[Callable[[Snapshot], None]] = None,
+    progress_interval: float = 1.0,
+    metrics_textfile: Optional[str] = None,
+    metrics_interval: float = 15.0,
 ) -> None:
     """
     Belirtilen klasördeki tüm PDF dosyalarından ZnO odaklı özellikleri çıkarır,
     JSON/CSV/Excel olarak kaydeder ve extraction.log içine işlem günlüğü yazar.
+
+    workers > 1 ise dosyalar bir süreç havuzunda paralel işlenir (0 = tüm çekirdekler);
+    çıktı sırası her durumda dosya adı sırasıdır.
+
+    Önbellek (varsayılan: <output_dir>/.paperloom-cache) içerik özeti + kural
+    parmak izine göre anahtarlanır; use_cache=False tamamen kapatır,
+    rebuild_cache=True mevcut girdileri yok sayıp yeniden yazar.
+
+    Kayıtlar bellekte biriktirilmez; her biri üretildiği anda akış yazıcılarına
+    gider. jsonl_name verilirse ayrıca JSON Lines yazılır (.gz ile biterse sıkıştırılmış).
+
+    page_budget her PDF'ten okunacak en fazla sayfa sayısıdır; early_stop=True ise
+    tüm önemli alanlar ve metadata bulunduğu anda sayfa okuma kesilir.
+
+    page_workers > 1 ise page_threshold'dan uzun PDF'lerin sayfa aralıkları
+    ayrı süreçlerde paralel okunup sırayla birleştirilir (büyük ek dosyalar
+    tüm çalışmayı tek başına bekletmesin diye).
+
+    rule_timeout, extract_all içindeki her kural için saniye cinsinden süre
+    bütçesidir; aşan kurallar kaydın extras alanına yazılır (None = sınırsız).
+
+    profile=True ise her belge için aşama ve kural süreleri extraction.log'a
+    yazılır; çalışma sonunda histogramlar ve en yavaş top_n belge/kural
+    çıktıların yanına metrics_name dosyasına kaydedilir.
+
+    Tamamlanan her dosya kaydıyla birlikte <output_dir>/.paperloom-journal.jsonl
+    günlüğüne eklenir (fsync journal_batch kayıtta bir). resume=True ise
+    günlükte bulunan ve o zamandan beri değişmemiş dosyalar yeniden işlenmez;
+    JSON/CSV/Excel çıktıları günlükteki kayıtlar + yeni kayıtlarla baştan yazılır.
+
+    sqlite_name verilirse kayıtlar ayrıca indeksli bir SQLite veritabanına
+    (mutlak yol da olabilir) upsert edilir: anahtar PDF'in SHA-256'sıdır,
+    sqlite_key="doi" ise aynı DOI'li eski satırın da yerini alır. Veritabanı
+    her çalışmada baştan yazılmaz, yerinde güncellenir.
+
+    json_name/csv_name/excel_name boş ("" ya da None) verilirse o çıktı hiç
+    yazılmaz (ör. yalnız JSON isteyen çalışma openpyxl'i hiç yüklemez).
+    extra_writers [(yazıcı adı, dosya adı), ...] listesidir; adlar
+    plugins.available_writers() içinden (eklentiler dahil) seçilir.
+
+    dedup="skip" ise tam ayrıştırmadan önce kopyalar ayıklanır: bayt bayt aynı
+    dosyalar SHA-256 ile, yakın kopyalar yalnızca ilk sayfadan okunan DOI ya
+    da metin parmak izi (benzerlik >= dedup_threshold) ile. Kopyalar
+    işlenmez ve dedup_name raporuna yazılır. dedup="merge" aynısını yapar,
+    ayrıca tutulan kaydın extras["duplicates"] alanına kopyaların adlarını ekler.
+
+    shard=(K, N) ise yalnızca göreli yolunun kararlı özeti K. paya düşen
+    dosyalar işlenir (bkz. shard.py); her makine kendi output_dir'ine yazar,
+    parçalar `paperloom merge` ile birleştirilir.
+
+    store_text bir klasör ise her PDF'in normalize edilmiş metni oradaki
+    metin deposuna (texts.bin + texts.idx) yazılır; kurallar değiştiğinde
+    reextract_store PDF'leri yeniden ayrıştırmadan yalnızca kuralları çalıştırır.
+    Depoya yalnızca tam okunan metin girer (page_budget/early_stop ile birlikte kullanılamaz).
+
+    doc_timeout (saniye), max_rss_mb ya da max_tasks_per_worker verilirse
+    belgeler denetimli işçilerde işlenir (workers=1 dahil): süreyi ya da bellek
+    sınırını aşan işçi öldürülür (bellek sınırı yalnızca işçi sürecine
+    uygulanır, page_workers çocuklarına değil), belge nedeniyle birlikte
+    <output_dir>/quarantine.json'a yazılır ve sonraki çalışmalarda (dosya
+    değişmedikçe) atlanır; retry_quarantined=True bunları yeniden dener.
+    İşçiler max_tasks_per_worker belgeden sonra yenilenir.
+
+    Girdiler önceden listelenmez, bulundukça işçilere akar (bkz. discover.py).
+    recursive=True alt klasörleri de gezer; include/exclude fnmatch desenleridir
+    (varsayılan include: *.pdf). manifest bir yol listesi dosyasıdır ("-" ise
+    stdin); verilirse klasör gezilmez. recursive ya da manifest ile source_path
+    input_dir'e göre göreli yoldur, aksi halde dosya adıdır. schedule="size"
+    ya da "pages" ise belgeler büyükten küçüğe çalıştırılır (uzun kuyruk
+    kısalır); çıktı sırası yine giriş sırasıdır.
+
+    progress verilirse her progress_interval saniyede bir canlı ilerleme
+    görüntüsüyle (docs/s, pages/s, ETA, işlemdeki ve başarısız belge sayısı;
+    bkz. telemetry.py) çağrılır. metrics_textfile verilirse (output_dir'e
+    göre ya da mutlak yol) aynı sayaçlar her metrics_interval saniyede bir
+    Prometheus textfile biçiminde yeniden yazılır.
     """
-    from .io_utils import write_json, write_csv, write_excel
+    from .io_utils import RecordWriters, SqliteWriter
+    from .plugins import load_writer
 
+    if store_text and (page_budget is not None or early_stop):
+        raise ValueError("store_text needs full reads; drop page_budget/early_stop")
+    if schedule not in ("input", "size", "pages"):
+        raise ValueError(f"Unknown schedule: {schedule}")
     os.makedirs(output_dir, exist_ok=True)
     level = getattr(logging, log_level.upper(), logging.INFO)
     logger = _setup_logger(output_dir, level)
 
-    pdfs = sorted(glob.glob(os.path.join(input_dir, "*.pdf")))
-    records: List[PaperRecord] = []
-
-    logger.info("Starting extraction on %d PDF(s).", len(pdfs))
-
-    for path in pdfs:
-        try:
-            logger.info("Reading PDF: %s", os.path.basename(path))
-            raw = read_pdf_text(path)
-            norm = normalize_text(raw)
-            feats = extract_all(norm)
-            conf = _confidence(feats)
-
-            rec = PaperRecord(
-                source_path=os.path.basename(path),
-                title=feats.get("title"),
-                authors=feats.get("authors"),
-                year=int(feats["year"]) if feats.get("year") else None,
-                doi=feats.get("doi"),
-                keywords=feats.get("keywords"),
-                abstract=feats.get("abstract"),
-
-                system=feats.get("system"),
-                edge=feats.get("edge"),
-                passivation=feats.get("passivation"),
-                doping=feats.get("doping"),
-                vacancy=feats.get("vacancy"),
-                functional=feats.get("functional"),
-                u_values=feats.get("u_values"),
-                kpoints=feats.get("kpoints"),
-                bandgap_ev=feats.get("bandgap_ev"),
-                bandgap_type=feats.get("bandgap_type"),
-                magnetic_moment=feats.get("magnetic_moment"),
-                ndr=feats.get("ndr"),
-
-                confidence=conf,
-                extras=None,
-            )
+    # Girdiler bulundukça akar; tam liste yalnızca dedup ve büyükten küçüğe sıralama için kurulur
+    root = input_dir if recursive or manifest else None
 
-            rec = _sanitize_record(rec)
-            records.append(rec)
-            logger.info(
-                "Processed %s (confidence=%.3f)",
-                os.path.basename(path),
-                rec.confidence if rec.confidence is not None else 0.0,
-            )
+    def discover() -> Iterable[str]:
+        if manifest:
+            found: Iterable[str] = iter_manifest(manifest, input_dir, include, exclude)
+        else:
+            found = iter_pdfs(input_dir, recursive, include, exclude)
+        if shard is not None:
+            from .shard import select_shard
+            found = select_shard(found, input_dir, shard)
+        return found
+
+    pdfs = discover()
+    if shard is not None:
+        logger.info("Processing shard %d/%d.", *shard)
+
+    merged: Dict[str, List[str]] = {}
+    if dedup != "off":
+        from .dedup import find_duplicates
+        pdfs = list(pdfs)
+        report = find_duplicates(pdfs, workers=workers if workers > 0 else (os.cpu_count() or 1),
+                                 threshold=dedup_threshold, root=root)
+        with open(os.path.join(output_dir, dedup_name), "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        dropped = {r["file"] for r in report}
+        pdfs = [p for p in pdfs if source_name(p, root) not in dropped]
+        if dedup == "merge":
+            for r in report:
+                merged.setdefault(r["duplicate_of"], []).append(r["file"])
+        logger.info("Dedup: %d duplicate(s) skipped (%s); report in %s.", len(report),
+                    ", ".join(f"{k}={v}" for k, v in sorted(Counter(r["reason"] for r in report).items())) or "none",
+                    dedup_name)
+
+    listed = pdfs if isinstance(pdfs, list) else None
+    supervised = bool(doc_timeout or max_rss_mb or max_tasks_per_worker)
+    quarantine = None
+    skip_quarantined = False
+    if supervised:
+        quarantine = Quarantine(os.path.join(output_dir, QUARANTINE_NAME), root)
+        skip_quarantined = not retry_quarantined and bool(quarantine.entries)
+        if skip_quarantined:
+            pdfs = _skip_quarantined(pdfs, quarantine, logger)
+
+    tele = None
+    if progress is not None or metrics_textfile:
+        tele = Telemetry(
+            textfile=os.path.join(output_dir, metrics_textfile) if metrics_textfile else None,
+            on_update=progress, interval=progress_interval, textfile_interval=metrics_interval,
+            run=os.path.basename(os.path.abspath(output_dir)),
+        )
+        if listed is not None:
+            tele.expect(sum(1 for p in listed if not skip_quarantined or p not in quarantine))
+        elif manifest != "-":
+            # Akış halindeki girdiler için toplam, aynı keşif ikinci kez gezilerek sayılır
+            recount = discover()
+            if skip_quarantined:
+                recount = (p for p in recount if p not in quarantine)
+            tele.count_in_background(recount)
+
+    journal = RunJournal(os.path.join(output_dir, JOURNAL_NAME), resume=resume, batch=journal_batch)
+    # (yol, günlükteki kayıt ya da None) akışı; resume değilse hepsi işlenecek
+    tagged = ((p, journal.completed(p, source_name(p, root)) if resume else None) for p in pdfs)
+
+    if schedule != "input":
+        # Çalıştırma sırası büyükten küçüğe; çıktı sırası yine giriş sırası
+        tagged = list(tagged)
+        pending: Iterable[str] = largest_first((p for p, r in tagged if r is None), by=schedule)
+        ordered = tagged
+    else:
+        ordered, side = itertools.tee(tagged)
+        pending = (p for p, r in side if r is None)
+    total = len(pending) if isinstance(pending, list) else None
+
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    if total is not None:
+        workers = max(1, min(workers, total))
+    if tele is not None and schedule != "input":
+        tele.expect(len(tagged))
+
+    cache = None
+    if use_cache:
+        cache = ResultCache(
+            cache_dir or os.path.join(output_dir, ".paperloom-cache"),
+            max_bytes=cache_max_mb * 1024 * 1024,
+            rebuild=rebuild_cache,
+        )
+
+    store = None
+    if store_text:
+        store = TextStore(store_text)
+
+    if total is not None:
+        logger.info("Starting extraction on %d PDF(s) with %d worker(s), %s-first.", total, workers, schedule)
+    else:
+        logger.info("Starting extraction with %d worker(s) as files are discovered.", workers)
+
+    # Çıktılar (akış halinde); yazıcı modülleri yalnızca seçildiğinde yüklenir
+    selected = [("json", json_name), ("csv", csv_name), ("excel", excel_name), ("jsonl", jsonl_name)]
+    selected += list(extra_writers or [])
+    writers, names = [], []
+    for writer_name, file_name in selected:
+        if file_name:
+            writers.append(load_writer(writer_name)(os.path.join(output_dir, file_name)))
+            names.append(file_name)
+    if sqlite_name:
+        writers.append(SqliteWriter(os.path.join(output_dir, sqlite_name), input_dir, key=sqlite_key))
+        names.append(sqlite_name)
+
+    metrics = RunMetrics(top_n) if profile else None
+    kwargs = dict(cache=cache, page_budget=page_budget,
+                  early_stop=early_stop, rule_timeout=rule_timeout,
+                  page_workers=page_workers, page_threshold=page_threshold, store=store, root=root,
+                  hash_source=bool(sqlite_name))
+    # Canlı ilerleme sayfa sayısı için belge profillerini kullanır (özet satırı yalnızca --profile ile)
+    collect = profile or tele is not None
+    if collect:
+        kwargs["log_profile"] = profile
+    if tele is not None:
+        pending = tele.track(pending)
+    resumed = processed = 0
+    with tele or nullcontext(), journal, RecordWriters(writers, timed=profile) as out:
+        if supervised:
+            results = _run_supervised(pending, workers, logger, quarantine, doc_timeout, max_rss_mb,
+                                      max_tasks_per_worker, collect, **kwargs)
+        elif workers > 1:
+            results = _run_parallel(pending, workers, logger, profile=collect, total=total, **kwargs)
+        elif collect:
+            results = ((path, *_process_pdf_profiled(path, **kwargs)) for path in pending)
+        else:
+            results = ((path, _process_pdf(path, **kwargs), None) for path in pending)
+        # Günlükteki ve yeni işlenen kayıtlar giriş sırasıyla birleştirilir; büyükten
+        # küçüğe çalıştırmada erken biten kayıtlar sıraları gelene kadar bekletilir
+        early: Dict[str, Tuple[Optional[PaperRecord], Optional[Dict[str, object]]]] = {}
+        for path, done in ordered:
+            if done is not None:
+                out.write(_merge_duplicates(done, merged))
+                resumed += 1
+                if tele is not None:
+                    tele.resumed_one()
+                continue
+            while path not in early:
+                p, r, pr = next(results)
+                early[p] = (r, pr)
+                if tele is not None:
+                    tele.done(r is not None, pr and pr["pages"], bool(pr and pr["cached"]))
+            rec, prof = early.pop(path)
+            processed += 1
+            if metrics is not None and prof is not None:
+                metrics.add(prof)
+            if rec is not None:
+                journal.append(path, rec)
+                out.write(_merge_duplicates(rec, merged))
+    if resumed:
+        logger.info("Resumed %d PDF(s) from the journal.", resumed)
+    logger.info("Processed %d PDF(s).", processed)
 
-        except Exception as e:
-            logger.exception("Failed on %s: %s", os.path.basename(path), e)
+    if metrics is not None:
+        metrics.writers = out.seconds
+        metrics.write(os.path.join(output_dir, metrics_name))
+        names.append(metrics_name)
 
-    # Çıktılar
-    json_path = os.path.join(output_dir, json_name)
-    csv_path = os.path.join(output_dir, csv_name)
-    xlsx_path = os.path.join(output_dir, excel_name)
+    if cache is not None:
+        evicted = cache.evict()
+        if evicted:
+            logger.info("Evicted %d cache entr(ies).", evicted)
+
+    logger.info("Wrote outputs: %s", ", ".join(names))
+
+
+def _reextract_chunk(
+    store: TextStore,
+    entries: List[dict],
+    rule_timeout: Optional[float] = RULE_TIME_BUDGET,
+) -> List[PaperRecord]:
+    """Depodaki bir grup metin için extract_all; aralık temizliği grup başına bir kez (PDF okunmaz)."""
+    recs = [_build_record(e["name"], extract_all(store.text(e), time_budget=rule_timeout))
+            for e in entries]
+    return RecordBatch(recs).sanitize().records
+
+
+def reextract_store(
+    store_dir: str,
+    output_dir: str,
+    json_name: Optional[str] = "znr_dataset.json",
+    csv_name: Optional[str] = "znr_dataset.csv",
+    excel_name: Optional[str] = "znr_dataset.xlsx",
+    jsonl_name: Optional[str] = None,
+    log_level: str = "INFO",
+    workers: int = 1,
+    rule_timeout: Optional[float] = RULE_TIME_BUDGET,
+) -> int:
+    """
+    Metin deposundaki (extract_pdfs(store_text=...)) tüm belgeler için yalnızca
+    kuralları ve _sanitize_record'u yeniden çalıştırıp çıktıları yazar; PDF
+    ayrıştırma yapılmaz. Kayıtlar dosya adı sırasıyla yazılır. Depodaki metin
+    güncel ayrıştırıcı/normalizer ile üretilmemişse uyarılır. Yazılan kayıt
+    sayısını döndürür.
+    """
+    from .io_utils import RecordWriters
+    from .plugins import load_writer
+
+    os.makedirs(output_dir, exist_ok=True)
+    level = getattr(logging, log_level.upper(), logging.INFO)
+    logger = _setup_logger(output_dir, level)
 
-    write_json(json_path, records)
-    write_csv(csv_path, records)
-    write_excel(xlsx_path, records)
+    store = TextStore(store_dir)
+    entries = [e for _, e in sorted(store.entries().items())]
+    stale = sum(1 for e in entries if e.get("fp") != store.fingerprint)
+    if stale:
+        logger.warning("%d stored text(s) were produced by an older parser/normalizer; "
+                       "re-run extract with --store-text to refresh them.", stale)
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(entries)))
+    logger.info("Re-extracting %d stored text(s) with %d worker(s).", len(entries), workers)
 
-    logger.info("Wrote outputs: %s, %s, %s", json_name, csv_name, excel_name)
\ No newline at end of file
+    selected = [("json", json_name), ("csv", csv_name), ("excel", excel_name), ("jsonl", jsonl_name)]
+    writers = [load_writer(w)(os.path.join(output_dir, f)) for w, f in selected if f]
+    fn = partial(_reextract_chunk, store, rule_timeout=rule_timeout)
+    size = max(1, min(256, len(entries) // (workers * 4))) if workers > 1 else 256
+    chunks = [entries[i:i + size] for i in range(0, len(entries), size)]
+    with RecordWriters(writers) as out:
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for recs in pool.map(fn, chunks):
+                    for rec in recs:
+                        out.write(rec)
+        else:
+            for chunk in chunks:
+                for rec in fn(chunk):
+                    out.write(rec)
+    store.close()
+    logger.info("Wrote %d record(s): %s", out.count, ", ".join(f for _, f in selected if f))
+    return out.count
@@ -0,0 +1,48 @@
+import importlib
+from functools import lru_cache
+from typing import Any, Dict
+
+# -----------------------------
+#  Yazıcı eklentileri
+# -----------------------------
+# Ek çıktı biçimleri "paperloom.writers" entry-point grubundan bulunur, ör.
+# bir paperloom-excelx paketinin pyproject.toml'unda:
+#
+#   [project.entry-points."paperloom.writers"]
+#   excelx = "paperloom_excelx:ExcelxWriter"
+#
+# Keşif yalnızca paket metadata'sını okur; eklenti modülü ancak seçildiğinde
+# (load_writer) içe aktarılır. Yazıcı sınıfı path ile kurulur ve
+# write(rec) / close() metotlarını sağlar (bkz. io_utils).
+
+WRITER_GROUP = "paperloom.writers"
+
+BUILTIN_WRITERS = {
+    "json": "paperloom.io_utils:JsonArrayWriter",
+    "jsonl": "paperloom.io_utils:JsonlWriter",
+    "csv": "paperloom.io_utils:CsvStreamWriter",
+    "excel": "paperloom.io_utils:ExcelStreamWriter",
+}
+
+
+@lru_cache(maxsize=1)
+def _entry_points() -> Dict[str, Any]:
+    from importlib.metadata import entry_points
+    return {ep.name: ep for ep in entry_points(group=WRITER_GROUP)}
+
+
+def available_writers() -> Dict[str, str]:
+    """Yazıcı adı → "modül:sınıf"; hiçbir eklenti içe aktarılmaz."""
+    found = {name: ep.value for name, ep in _entry_points().items()}
+    found.update(BUILTIN_WRITERS)  # yerleşik adlar eklentilerle ezilemez
+    return found
+
+
+def load_writer(name: str) -> Any:
+    """Seçilen yazıcı sınıfını içe aktarıp döndür."""
+    if name in BUILTIN_WRITERS:
+        module, _, attr = BUILTIN_WRITERS[name].partition(":")
+        return getattr(importlib.import_module(module), attr)
+    if name in _entry_points():
+        return _entry_points()[name].load()
+    raise KeyError(f"Unknown writer: {name} (available: {', '.join(sorted(available_writers()))})")
@@ -0,0 +1,131 @@
+import json, time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+# -----------------------------
+#  Aşama / kural profili
+# -----------------------------
+# Açıkça istendiğinde (--profile) her belge için aşama süreleri, kural süreleri,
+# sayfa sayısı ve metin uzunluğu toplanır; çalışma sonunda metrics.json yazılır.
+
+# Histogram kova üst sınırları (saniye); son kova sınırsız
+HIST_BOUNDS = [0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0]
+
+
+class DocProfile:
+    """Tek bir belgenin profili. İşçi süreçten ana sürece sözlük olarak taşınır."""
+
+    def __init__(self, source_path: str):
+        self.source_path = source_path
+        self.stages: Dict[str, float] = {}
+        self.rules: Dict[str, float] = {}
+        self.pages: Optional[int] = None
+        self.chars: Optional[int] = None
+        self.cached = False
+
+    @contextmanager
+    def stage(self, name: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - t0
+
+    @property
+    def total(self) -> float:
+        return sum(self.stages.values())
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "source_path": self.source_path,
+            "cached": self.cached,
+            "pages": self.pages,
+            "chars": self.chars,
+            "total": round(self.total, 6),
+            "stages": {k: round(v, 6) for k, v in self.stages.items()},
+            "rules": {k: round(v, 6) for k, v in self.rules.items()},
+        }
+
+    def summary(self) -> str:
+        """extraction.log için tek satırlık özet."""
+        parts = [f"{k}={v:.3f}s" for k, v in self.stages.items()]
+        if self.rules:
+            slow = max(self.rules, key=self.rules.get)
+            parts.append(f"slowest_rule={slow}({self.rules[slow]:.3f}s)")
+        return (f"pages={self.pages} chars={self.chars} " + " ".join(parts)).strip()
+
+
+def histogram(values: List[float]) -> Dict[str, object]:
+    """Süre listesi için kova sayıları ve temel istatistikler."""
+    counts = [0] * (len(HIST_BOUNDS) + 1)
+    for v in values:
+        i = 0
+        while i < len(HIST_BOUNDS) and v > HIST_BOUNDS[i]:
+            i += 1
+        counts[i] += 1
+    labels = [f"<={b}" for b in HIST_BOUNDS] + [f">{HIST_BOUNDS[-1]}"]
+    s = sorted(values)
+
+    def pct(p: float) -> float:
+        return round(s[min(len(s) - 1, int(p * len(s)))], 6) if s else 0.0
+
+    return {
+        "count": len(s),
+        "sum": round(sum(s), 6),
+        "mean": round(sum(s) / len(s), 6) if s else 0.0,
+        "p50": pct(0.50),
+        "p95": pct(0.95),
+        "max": round(s[-1], 6) if s else 0.0,
+        "buckets": dict(zip(labels, counts)),
+    }
+
+
+class RunMetrics:
+    """Belge profillerini ve yazıcı sürelerini biriktirip metrics.json üretir."""
+
+    def __init__(self, top_n: int = 10):
+        self.top_n = top_n
+        self.docs: List[Dict[str, object]] = []
+        self.writers: Dict[str, float] = {}
+        self.started = time.perf_counter()
+
+    def add(self, prof: Optional[Dict[str, object]]) -> None:
+        if prof is not None:
+            self.docs.append(prof)
+
+    def to_dict(self) -> Dict[str, object]:
+        stage_vals: Dict[str, List[float]] = {}
+        rule_vals: Dict[str, List[float]] = {}
+        rule_hits: List[Dict[str, object]] = []
+        for d in self.docs:
+            for k, v in d["stages"].items():
+                stage_vals.setdefault(k, []).append(v)
+            for k, v in d["rules"].items():
+                rule_vals.setdefault(k, []).append(v)
+                rule_hits.append({"rule": k, "source_path": d["source_path"], "seconds": v})
+
+        parsed = [d for d in self.docs if not d["cached"]]
+        slow_docs = sorted(self.docs, key=lambda d: d["total"], reverse=True)[:self.top_n]
+        slow_rules = sorted(rule_vals, key=lambda k: sum(rule_vals[k]), reverse=True)[:self.top_n]
+        return {
+            "wall_seconds": round(time.perf_counter() - self.started, 6),
+            "documents": len(self.docs),
+            "cached": len(self.docs) - len(parsed),
+            "pages": sum(d["pages"] or 0 for d in parsed),
+            "chars": sum(d["chars"] or 0 for d in parsed),
+            "stages": {k: histogram(v) for k, v in stage_vals.items()},
+            "rules": {k: histogram(v) for k, v in rule_vals.items()},
+            "writers": {k: round(v, 6) for k, v in self.writers.items()},
+            "top_documents": [
+                {k: d[k] for k in ("source_path", "total", "pages", "chars", "stages")} for d in slow_docs
+            ],
+            "top_rules": [
+                {"rule": k, "total": round(sum(rule_vals[k]), 6), "max": round(max(rule_vals[k]), 6)}
+                for k in slow_rules
+            ],
+            "top_rule_calls": sorted(rule_hits, key=lambda r: r["seconds"], reverse=True)[:self.top_n],
+        }
+
+    def write(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
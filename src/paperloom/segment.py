@@ -0,0 +1,80 @@
+import re
+from typing import Dict, Tuple
+
+# -----------------------------
+#  Bölüm (section) ayrıştırıcı
+# -----------------------------
+# Normalize edilmiş metni tek geçişte başlık satırlarına göre bölgelere ayırır.
+# Kurallar yalnızca ilgili bölgede çalışır: metadata ön kısımda, yöntem
+# kuralları "Computational details" altında, sonuç kuralları sonuçlarda;
+# kaynakça hiçbir kurala gösterilmez (alıntılanan yıllar, k-noktaları vb.).
+
+# Numaralandırma: "2.", "2.1", "II.", "2 " ...
+_NUM = r"(?:(?:\d{1,2}|[IVX]{1,4})\.?(?:\d{1,2}\.?)?[ \t]+)?"
+
+# Satır başında başlıklar. "Abstract" satır içinde metinle devam edebilir; diğer
+# başlıklar satırın tamamı olmalı ("Results show that ..." cümlesi başlık değildir).
+_HEADING = re.compile(
+    r"\n[ \t]*" + _NUM + r"(?:"
+    r"(?P<abstract>abstract)\b"
+    r"|(?:"
+    r"(?P<introduction>introduction)"
+    r"|(?P<methods>computational[ \t]+(?:details|methods?|setup)|methods?|methodology"
+    r"|theoretical[ \t]+(?:methods?|framework|details)|calculation[ \t]+(?:details|methods?)"
+    r"|simulation[ \t]+details|models?[ \t]+and[ \t]+methods?)"
+    r"|(?P<results>results(?:[ \t]+and[ \t]+discussions?)?|discussions?)"
+    r"|(?P<conclusion>conclusions?|summary|concluding[ \t]+remarks)"
+    r"|(?P<acknowledgments>acknowledge?ments?)"
+    r"|(?P<references>references|bibliography|literature[ \t]+cited|references[ \t]+and[ \t]+notes)"
+    r")[ \t]*:?[ \t]*(?=\n|$))",
+    re.IGNORECASE,
+)
+
+# Gövdeyi başlatan (ön kısmı bitiren) başlıklar
+_BODY_KINDS = ("introduction", "methods", "results", "conclusion", "acknowledgments", "references")
+# Arka kısım: kaynakça ve teşekkür
+_BACK_KINDS = ("acknowledgments", "references")
+
+
+def segment_text(text: str) -> Dict[str, Tuple[int, int]]:
+    """
+    Bölge adı → (başlangıç, bitiş) karakter aralığı.
+
+    Her zaman: "all" (tüm metin), "front" (ilk gövde başlığına kadar: başlık,
+    yazarlar, DOI, özet), "body" (kaynakça/teşekkür öncesi her şey) ve "head"
+    (yöntem/sonuç başlığına kadar; özet kuralı bitiş işaretini görebilsin diye).
+    Başlığı bulunursa: "abstract", "introduction", "methods", "results"
+    (sonuç + tartışma + sonuç bölümü, arka kısma kadar), "references".
+
+    Hiç başlık bulunamazsa tüm bölgeler metnin tamamıdır (eski davranış).
+    """
+    n = len(text)
+    first: Dict[str, int] = {}
+    last_refs = -1
+    # "\n" öneki: ilk satır da başlık olabilsin; konum kayması -1 + 1 = 0
+    for m in _HEADING.finditer("\n" + text):
+        kind = m.lastgroup
+        if kind == "references":
+            last_refs = m.start()
+        elif kind not in first:
+            first[kind] = m.start()
+    # Kaynakça başlığı: sonuncusu, ve ancak diğer tüm başlıklardan sonra geliyorsa
+    if last_refs >= 0 and all(last_refs > p for p in first.values()):
+        first["references"] = last_refs
+
+    spans: Dict[str, Tuple[int, int]] = {"all": (0, n)}
+    if not first:
+        spans.update(front=(0, n), body=(0, n), head=(0, n))
+        return spans
+
+    marks = sorted((p, k) for k, p in first.items())
+    for i, (p, k) in enumerate(marks):
+        spans[k] = (p, marks[i + 1][0] if i + 1 < len(marks) else n)
+
+    back = min([first[k] for k in _BACK_KINDS if k in first] + [n])
+    spans["front"] = (0, min([first[k] for k in _BODY_KINDS if k in first] + [n]))
+    spans["body"] = (0, back)
+    spans["head"] = (0, min([first[k] for k in ("methods", "results") if k in first] + [back]))
+    if "results" in first:
+        spans["results"] = (first["results"], max(first["results"], back))
+    return spans
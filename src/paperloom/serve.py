@@ -0,0 +1,250 @@
+import os, json, time, signal, base64, asyncio, logging, multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit, parse_qs
+from .pipeline import _process_stream
+from .extract_rules import RULE_TIME_BUDGET
+
+# -----------------------------
+#  Yerel HTTP çıkarım servisi
+# -----------------------------
+# Yalnızca standart kütüphane (asyncio) ile yazılmış küçük bir HTTP/1.1 sunucusu.
+# CPU yoğun PDF ayrıştırma ve kural çalıştırma önceden ısıtılmış bir süreç
+# havuzunda yapılır; aynı anda işlenen belge sayısı bir semaforla sınırlanır.
+#
+#   POST /extract?name=x.pdf   gövde: ham PDF baytları         → PaperRecord JSON
+#   POST /extract/batch        {"documents": [{"name", "data": base64}]} → {"records": [...]}
+#   GET  /health               → {"status": "ok", ...}
+#   GET  /stats                → istek/belge/hata sayıları, gecikmeler
+
+logger = logging.getLogger("paperloom.serve")
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            411: "Length Required", 413: "Payload Too Large", 422: "Unprocessable Entity",
+            500: "Internal Server Error"}
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _init_server_worker() -> None:
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _warm() -> int:
+    """İşçide ayrıştırma ve kural modüllerini önceden yükle (hepsi tembel içe aktarılır)."""
+    import PyPDF2  # noqa: F401
+    from . import parse_pdf, normalize, extract_rules  # noqa: F401
+    return os.getpid()
+
+
+class ExtractionService:
+    """Süreç havuzu, eşzamanlılık sınırı ve istatistikler."""
+
+    def __init__(self, workers: int = 1, max_concurrency: Optional[int] = None,
+                 max_body_mb: int = 64, rule_timeout: Optional[float] = RULE_TIME_BUDGET):
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self.max_concurrency = max_concurrency or self.workers * 2
+        self.max_body = max_body_mb * 1024 * 1024
+        self.rule_timeout = rule_timeout
+        self.pool: Optional[ProcessPoolExecutor] = None
+        self.sem: Optional[asyncio.Semaphore] = None
+        self.started = time.time()
+        self.stats: Dict[str, float] = {
+            "requests": 0, "documents": 0, "errors": 0, "in_flight": 0,
+            "pool_restarts": 0, "doc_seconds_total": 0.0, "doc_seconds_max": 0.0,
+        }
+
+    def _new_pool(self) -> list:
+        """Yeni havuz kur ve her işçi için bir ısıtma işi gönder (future'lar döner)."""
+        # fork ile açılan işçiler o anda açık istemci soketlerini devralır ve
+        # kapanmalarını engeller (yeniden başlatmada); forkserver bunu yapmaz
+        methods = multiprocessing.get_all_start_methods()
+        ctx = multiprocessing.get_context("forkserver" if "forkserver" in methods else None)
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=ctx,
+                                        initializer=_init_server_worker)
+        loop = asyncio.get_running_loop()
+        return [loop.run_in_executor(self.pool, _warm) for _ in range(self.workers)]
+
+    async def start(self) -> None:
+        self.sem = asyncio.Semaphore(self.max_concurrency)
+        # Havuzu ısıt: tüm işçiler ilk istekten önce ayağa kalksın ve modülleri yüklesin
+        await asyncio.gather(*self._new_pool())
+
+    def _restart_pool(self, broken: ProcessPoolExecutor) -> None:
+        """Bir işçi öldüğünde (BrokenProcessPool) havuzu yenile; sonraki istekler yeni havuza gider."""
+        if self.pool is not broken:
+            return  # aynı çöküşü gören başka bir istek zaten yeniledi
+        logger.error("Worker process died; restarting the pool.")
+        broken.shutdown(wait=False, cancel_futures=True)
+        self.stats["pool_restarts"] += 1
+        for fut in self._new_pool():
+            fut.add_done_callback(lambda f: f.exception())  # sonuç beklenmez; hata yutulur
+
+    def close(self) -> None:
+        if self.pool is not None:
+            self.pool.shutdown(wait=True, cancel_futures=True)
+
+    async def extract(self, data: bytes, name: str) -> Dict[str, object]:
+        loop = asyncio.get_running_loop()
+        async with self.sem:
+            self.stats["in_flight"] += 1
+            t0 = time.perf_counter()
+            pool = self.pool
+            try:
+                rec = await loop.run_in_executor(
+                    pool, partial(_process_stream, data, name, rule_timeout=self.rule_timeout))
+            except BrokenProcessPool:
+                self.stats["errors"] += 1
+                self._restart_pool(pool)
+                raise HttpError(500, f"{name}: worker process died; the pool was restarted")
+            except Exception as e:
+                self.stats["errors"] += 1
+                raise HttpError(422, f"{name}: {e}")
+            finally:
+                self.stats["in_flight"] -= 1
+            dt = time.perf_counter() - t0
+            self.stats["documents"] += 1
+            self.stats["doc_seconds_total"] += dt
+            self.stats["doc_seconds_max"] = max(self.stats["doc_seconds_max"], dt)
+            return rec
+
+    def health(self) -> Dict[str, object]:
+        return {"status": "ok", "workers": self.workers, "max_concurrency": self.max_concurrency}
+
+    def snapshot(self) -> Dict[str, object]:
+        s = dict(self.stats)
+        s["uptime_seconds"] = round(time.time() - self.started, 3)
+        s["doc_seconds_mean"] = round(s["doc_seconds_total"] / s["documents"], 6) if s["documents"] else 0.0
+        s["doc_seconds_total"] = round(s["doc_seconds_total"], 6)
+        s["doc_seconds_max"] = round(s["doc_seconds_max"], 6)
+        return s
+
+    # --- istek yönlendirme ---
+
+    async def route(self, method: str, target: str, body: bytes) -> Tuple[int, object]:
+        url = urlsplit(target)
+        if url.path == "/health":
+            return 200, self.health()
+        if url.path == "/stats":
+            return 200, self.snapshot()
+        if url.path == "/extract":
+            if method != "POST":
+                raise HttpError(405, "POST PDF bytes to /extract")
+            if not body:
+                raise HttpError(400, "Empty body")
+            name = parse_qs(url.query).get("name", ["document.pdf"])[0]
+            return 200, await self.extract(body, name)
+        if url.path == "/extract/batch":
+            if method != "POST":
+                raise HttpError(405, "POST a JSON batch to /extract/batch")
+            docs = self._parse_batch(body)
+            results = await asyncio.gather(*(self.extract(data, name) for name, data in docs),
+                                           return_exceptions=True)
+            records: List[object] = []
+            for (name, _), r in zip(docs, results):
+                records.append({"source_path": name, "error": str(r)} if isinstance(r, Exception) else r)
+            return 200, {"records": records}
+        raise HttpError(404, f"No route for {url.path}")
+
+    @staticmethod
+    def _parse_batch(body: bytes) -> List[Tuple[str, bytes]]:
+        try:
+            payload = json.loads(body)
+            return [(d.get("name") or f"document_{i}.pdf", base64.b64decode(d["data"], validate=True))
+                    for i, d in enumerate(payload["documents"])]
+        except Exception as e:
+            raise HttpError(400, f"Invalid batch: {e}")
+
+    # --- HTTP/1.1 bağlantısı ---
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    method, target, _ = line.decode("latin-1").split(" ", 2)
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "Malformed request line"}, False)
+                    break
+                headers: Dict[str, str] = {}
+                while True:
+                    h = await reader.readline()
+                    if h in (b"\r\n", b"\n", b""):
+                        break
+                    k, _, v = h.decode("latin-1").partition(":")
+                    headers[k.strip().lower()] = v.strip()
+                keep_alive = headers.get("connection", "").lower() != "close"
+                self.stats["requests"] += 1
+                body = None
+                try:
+                    body = await self._read_body(reader, method, headers)
+                    status, payload = await self.route(method, target, body)
+                except HttpError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except Exception as e:
+                    logger.exception("Request failed: %s %s", method, target)
+                    status, payload = 500, {"error": str(e)}
+                if body is None:
+                    # Gövde okunmadı: akıştaki yeri belirsiz, bağlantı kapatılır
+                    keep_alive = False
+                logger.info("%s %s -> %d", method, target, status)
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_body(self, reader: asyncio.StreamReader, method: str, headers: Dict[str, str]) -> bytes:
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            raise HttpError(411, "Chunked bodies are not supported; send Content-Length")
+        raw = headers.get("content-length", "0") or "0"
+        if not (raw.isascii() and raw.isdigit()):
+            raise HttpError(400, f"Invalid Content-Length: {raw!r}")
+        length = int(raw)
+        if length > self.max_body:
+            raise HttpError(413, f"Body larger than {self.max_body} bytes")
+        if length == 0 and method == "POST" and "content-length" not in headers:
+            raise HttpError(411, "Content-Length required")
+        return await reader.readexactly(length) if length else b""
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: int, payload: object, keep_alive: bool) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+
+async def _serve(service: ExtractionService, host: str, port: int) -> None:
+    await service.start()
+    server = await asyncio.start_server(service.handle, host, port)
+    addrs = ", ".join(str(s.getsockname()) for s in server.sockets)
+    logger.info("Serving on %s with %d worker(s).", addrs, service.workers)
+    async with server:
+        await server.serve_forever()
+
+
+def serve(host: str = "127.0.0.1", port: int = 8765, workers: int = 1,
+          max_concurrency: Optional[int] = None, max_body_mb: int = 64,
+          rule_timeout: Optional[float] = RULE_TIME_BUDGET) -> None:
+    """HTTP servisini başlat; Ctrl-C ile durur."""
+    service = ExtractionService(workers, max_concurrency, max_body_mb, rule_timeout)
+    try:
+        asyncio.run(_serve(service, host, port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
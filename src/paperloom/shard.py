@@ -0,0 +1,109 @@
+import os, glob, heapq, hashlib, logging
+from typing import Iterable, Iterator, List, Optional, Tuple
+from .models import PaperRecord
+
+# -----------------------------
+#  Çok makineli (sharded) çıkarım
+# -----------------------------
+# Her makine `extract --shard K/N` ile külliyatın yalnızca kendi payını işler.
+# Pay, dosyanın girdi klasörüne göre göreli yolunun özetinden hesaplanır:
+# dizin listeleme sırasına, dosya sayısına ya da makineye bağlı değildir.
+# Parça çıktıları (JSONL/CSV/SQLite) `merge` ile dosya adı sırasında,
+# akış halinde tek JSON/CSV/Excel çıktısında birleştirilir.
+
+logger = logging.getLogger("paperloom")
+
+# Klasörde parça çıktısı aranırken öncelik sırası
+PART_PATTERNS = ["*.jsonl", "*.jsonl.gz", "*.db", "*.sqlite", "*.sqlite3", "*.csv"]
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """"K/N" → (K, N); 1 <= K <= N."""
+    k, sep, n = spec.partition("/")
+    try:
+        k_i, n_i = int(k), int(n)
+    except ValueError:
+        raise ValueError(f"Expected K/N, got: {spec}")
+    if not sep or n_i < 1 or not 1 <= k_i <= n_i:
+        raise ValueError(f"Expected K/N with 1 <= K <= N, got: {spec}")
+    return k_i, n_i
+
+
+def shard_of(rel_path: str, n: int) -> int:
+    """Göreli yolun 1..n arasındaki kararlı payı (işletim sisteminden bağımsız)."""
+    key = rel_path.replace(os.sep, "/").encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "big") % n + 1
+
+
+def select_shard(pdfs: Iterable[str], input_dir: str, shard: Tuple[int, int]) -> Iterator[str]:
+    """pdfs içinden K/N payına düşenler (sıra korunur; tembel)."""
+    k, n = shard
+    return (p for p in pdfs if shard_of(os.path.relpath(p, input_dir), n) == k)
+
+
+def _part_file(part: str) -> str:
+    if not os.path.isdir(part):
+        return part
+    for pattern in PART_PATTERNS:
+        found = sorted(glob.glob(os.path.join(part, pattern)))
+        if found:
+            return found[0]
+    raise FileNotFoundError(f"No JSONL/CSV/SQLite output found in {part}")
+
+
+def _checked_order(records: Iterator[PaperRecord], part: str) -> Iterator[PaperRecord]:
+    """Parçanın source_path'e göre sıralı olduğunu doğrula (heapq.merge bunu varsayar)."""
+    last: Optional[str] = None
+    for rec in records:
+        if last is not None and rec.source_path < last:
+            raise ValueError(
+                f"{part} is not sorted by source_path ({last!r} before {rec.source_path!r}); "
+                "parts written from a manifest or by an older version cannot be merged in a stream"
+            )
+        last = rec.source_path
+        yield rec
+
+
+def iter_merged(parts: List[str]) -> Iterator[PaperRecord]:
+    """
+    Parçaların kayıtlarını source_path sırasıyla birleştir (heapq.merge; her
+    parçadan aynı anda tek kayıt bellekte). Aynı dosya birden çok parçada
+    varsa ilk parçadaki tutulur. Sıralı olmayan bir parça ValueError verir.
+    """
+    from .io_utils import iter_records
+
+    streams = [_checked_order(iter_records(_part_file(p)), p) for p in parts]
+    last: Optional[str] = None
+    skipped = 0
+    for rec in heapq.merge(*streams, key=lambda r: r.source_path):
+        if rec.source_path == last:
+            skipped += 1
+            continue
+        last = rec.source_path
+        yield rec
+    if skipped:
+        logger.warning("Merge: %d record(s) found in more than one part were dropped.", skipped)
+
+
+def merge_outputs(
+    parts: List[str],
+    output_dir: str,
+    json_name: Optional[str] = "znr_dataset.json",
+    csv_name: Optional[str] = "znr_dataset.csv",
+    excel_name: Optional[str] = "znr_dataset.xlsx",
+    jsonl_name: Optional[str] = None,
+) -> int:
+    """
+    Parça çıktılarını (dosya ya da shard çıktı klasörü) son JSON/CSV/Excel
+    dosyalarına yazar; boş ad o çıktıyı atlar. Yazılan kayıt sayısını döndürür.
+    """
+    from .io_utils import RecordWriters
+    from .plugins import load_writer
+
+    os.makedirs(output_dir, exist_ok=True)
+    selected = [("json", json_name), ("csv", csv_name), ("excel", excel_name), ("jsonl", jsonl_name)]
+    writers = [load_writer(w)(os.path.join(output_dir, f)) for w, f in selected if f]
+    with RecordWriters(writers) as out:
+        for rec in iter_merged(parts):
+            out.write(rec)
+    return out.count
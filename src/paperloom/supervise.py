@@ -0,0 +1,211 @@
+import os, json, time, signal, logging, multiprocessing
+from multiprocessing.connection import wait
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+from .journal import file_stamp
+from .discover import source_name
+
+# -----------------------------
+#  Denetimli işçiler
+# -----------------------------
+# Bozuk PDF'ler PyPDF2'yi kilitleyebilir ya da belleği GB'larca şişirebilir;
+# süreç içindeki `except Exception` bunları yakalayamaz. Burada her işçi ayrı
+# bir süreçtir ve ana süreç onu denetler:
+#   - belge başına duvar saati süresi (doc_timeout) aşılırsa işçi öldürülür,
+#   - işçinin RSS'i max_rss_mb'yi aşarsa öldürülür (Linux /proc; başka
+#     platformlarda bellek sınırı uygulanmaz). Yalnızca işçi sürecinin kendisi
+#     ölçülür; işçinin açtığı çocuk süreçler (page_workers ile sayfa okuyucular)
+#     sınıra dahil değildir,
+#   - sızıntıları sınırlamak için işçi max_tasks belgeden sonra yenilenir.
+# Öldürülen belgeler nedeniyle birlikte karantina listesine yazılır; sonraki
+# çalışmalar (dosya değişmedikçe) onları atlar.
+
+QUARANTINE_NAME = "quarantine.json"
+
+_PAGE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def _rss_mb(pid: int) -> Optional[float]:
+    """Sürecin yerleşik bellek kullanımı (MB); okunamazsa None."""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * _PAGE / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class Quarantine:
+    """
+    Çıktı klasöründeki quarantine.json: [{"file", "size", "mtime_ns", "reason", "at"}].
+    Bir dosya ancak boyutu ve mtime'ı kayıttakiyle aynıysa karantinada sayılır.
+    root verilirse "file" root'a göre göreli yoldur (kayıtların source_path'i gibi).
+    """
+
+    def __init__(self, path: str, root: Optional[str] = None):
+        self.path = path
+        self.root = root
+        self.entries: Dict[str, dict] = {}
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self.entries = {e["file"]: e for e in json.load(f)}
+            except (OSError, ValueError, KeyError, TypeError):
+                self.entries = {}
+
+    def name(self, path: str) -> str:
+        return source_name(path, self.root)
+
+    def __contains__(self, path: str) -> bool:
+        entry = self.entries.get(self.name(path))
+        if entry is None:
+            return False
+        try:
+            stamp = file_stamp(path)
+        except OSError:
+            return False
+        return entry.get("size") == stamp["size"] and entry.get("mtime_ns") == stamp["mtime_ns"]
+
+    def add(self, path: str, reason: str) -> None:
+        try:
+            stamp = file_stamp(path)
+        except OSError:
+            stamp = {}
+        self.entries[self.name(path)] = {"file": self.name(path), **stamp,
+                                                "reason": reason, "at": round(time.time(), 3)}
+        self.save()
+
+    def save(self) -> None:
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(sorted(self.entries.values(), key=lambda e: e["file"]), f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.path)
+
+
+def _worker_loop(conn, fn: Callable[[str], Any], initializer: Optional[Callable], initargs: tuple) -> None:
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if initializer is not None:
+        initializer(*initargs)
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+        idx, path = task
+        conn.send((idx, fn(path)))
+    conn.close()
+
+
+class _Worker:
+    def __init__(self, ctx, fn, initializer, initargs):
+        self.conn, child = ctx.Pipe()
+        self.proc = ctx.Process(target=_worker_loop, args=(child, fn, initializer, initargs))
+        self.proc.start()
+        child.close()
+        self.done = 0
+        self.task: Optional[Tuple[int, str]] = None
+        self.started = 0.0
+
+    def kill(self) -> None:
+        if self.proc.is_alive():
+            self.proc.kill()
+        self.proc.join()
+        self.conn.close()
+
+    def retire(self) -> None:
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.proc.join(timeout=5)
+        self.kill()
+
+
+def run_supervised(
+    paths: Iterable[str],
+    fn: Callable[[str], Any],
+    workers: int = 1,
+    doc_timeout: Optional[float] = None,
+    max_rss_mb: Optional[float] = None,
+    max_tasks: Optional[int] = None,
+    on_kill: Optional[Callable[[str, str], None]] = None,
+    initializer: Optional[Callable] = None,
+    initargs: tuple = (),
+    poll: float = 0.2,
+    name: Callable[[str], str] = os.path.basename,
+) -> Iterator[Tuple[str, Any]]:
+    """
+    paths'i denetimli işçilerde fn ile işler; (path, sonuç) çiftleri giriş
+    sırasıyla ve hazır oldukça üretilir. paths bir üreteç olabilir; yalnızca
+    boşalan işçi oldukça tüketilir. Öldürülen ya da çöken bir işçinin
+    belgesi için sonuç None'dır ve on_kill(path, neden) çağrılır.
+
+    max_rss_mb yalnızca işçi sürecinin RSS'ine uygulanır, çocuk süreçlerine
+    (sayfa okuyucular) değil. name, günlükte kullanılacak belge adıdır
+    (karantinadaki adla aynı olsun diye Quarantine.name verilir).
+    """
+    logger = logging.getLogger("paperloom.extract")
+    ctx = multiprocessing.get_context()
+    spawn = lambda: _Worker(ctx, fn, initializer, initargs)
+    todo = enumerate(paths)
+    first = next(todo, None)
+    if first is None:
+        return
+    pool = [spawn() for _ in range(max(1, workers))]
+    names: Dict[int, str] = {}
+    results: Dict[int, Any] = {}
+    next_out = next_in = 0
+
+    def replace(w: _Worker, reason: Optional[str]) -> None:
+        idx, path = w.task
+        w.kill()
+        logger.error("Killed worker on %s: %s", name(path), reason)
+        if on_kill is not None:
+            on_kill(path, reason)
+        results[idx] = None
+        pool[pool.index(w)] = spawn()
+
+    try:
+        while first is not None or next_out < next_in:
+            for w in list(pool):
+                if w.task is None and first is not None:
+                    if max_tasks and w.done >= max_tasks:
+                        i = pool.index(w)
+                        w.retire()
+                        w = pool[i] = spawn()
+                    w.task, first = first, next(todo, None)
+                    names[w.task[0]] = w.task[1]
+                    next_in += 1
+                    w.started = time.monotonic()
+                    w.conn.send(w.task)
+
+            busy = [w for w in pool if w.task is not None]
+            ready = wait([w.conn for w in busy], timeout=poll) if busy else []
+            now = time.monotonic()
+            for w in busy:
+                if w.conn in ready:
+                    try:
+                        idx, res = w.conn.recv()
+                    except (EOFError, OSError):
+                        w.proc.join(timeout=1)
+                        replace(w, f"worker exited (code {w.proc.exitcode})")
+                        continue
+                    results[idx] = res
+                    w.task = None
+                    w.done += 1
+                elif doc_timeout and now - w.started > doc_timeout:
+                    replace(w, f"timeout after {doc_timeout:g}s")
+                elif max_rss_mb:
+                    rss = _rss_mb(w.proc.pid)
+                    if rss is not None and rss > max_rss_mb:
+                        replace(w, f"memory {rss:.0f} MB > {max_rss_mb:g} MB")
+
+            while next_out in results:
+                yield names.pop(next_out), results.pop(next_out)
+                next_out += 1
+    finally:
+        for w in pool:
+            if w.task is None:
+                w.retire()
+            else:
+                w.kill()
@@ -0,0 +1,261 @@
+import os, math, time, threading
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# -----------------------------
+#  Canlı ilerleme ve metrikler
+# -----------------------------
+# Saatler süren bir extract çalışmasının hızını ve durumunu dışarıdan görmek
+# için. Ana süreçte bir arka plan iş parçacığı düzenli olarak anlık görüntü
+# alır ve:
+#   - her `interval` saniyede bir on_update(snapshot) çağırır (CLI bunu
+#     stderr'de tek satırlık bir ilerleme göstergesine çevirir),
+#   - textfile verilmişse metrikleri Prometheus textfile biçiminde (her
+#     `textfile_interval` saniyede bir, atomik olarak) yeniden yazar; node
+#     exporter'ın textfile toplayıcısı dosyayı olduğu gibi okur.
+# Hızlar son `window` saniyelik kayan pencereden hesaplanır. Takılan bir iş,
+# paperloom_documents_per_second'ın düşmesi ve
+# paperloom_last_progress_timestamp_seconds'ın ilerlememesiyle görünür.
+#
+# Sayaçları yalnızca ana iş parçacığı artırır; arka plan iş parçacığı okur.
+# Anlık görüntü örneğin kendi kilidi altında alınır; on_update ve dosya yazımı
+# kilidin dışındadır.
+
+Snapshot = Dict[str, object]
+
+
+class Telemetry:
+    """extract_pdfs'in ilerleme sayaçları; start() ile arka plan yenilemesi başlar."""
+
+    def __init__(
+        self,
+        textfile: Optional[str] = None,
+        on_update: Optional[Callable[[Snapshot], None]] = None,
+        interval: float = 1.0,
+        textfile_interval: float = 15.0,
+        window: float = 60.0,
+        run: Optional[str] = None,
+    ):
+        self.textfile = textfile
+        self.on_update = on_update
+        self.interval = interval
+        self.textfile_interval = textfile_interval
+        self.window = window
+        self.run = run
+        self.expected: Optional[int] = None
+        self.submitted = self.ok = self.failed = self.resumed = self.cached = self.pages = 0
+        self.started_at = self.last_progress = time.time()
+        self.running = True
+        self._t0 = time.monotonic()
+        self._samples: Deque[Tuple[float, int, int]] = deque([(self._t0, 0, 0)])
+        self._written = self._updated = 0.0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # --- ana iş parçacığından çağrılanlar ---
+
+    def expect(self, n: int) -> None:
+        """Toplam belge sayısı (günlükten devam edilenler dahil) biliniyorsa ETA hesaplanır."""
+        self.expected = n
+
+    def count_in_background(self, paths: Iterable[str]) -> None:
+        """Girdiler akış halindeyken toplamı ayrı bir iş parçacığında say (ETA için)."""
+        def count() -> None:
+            n = sum(1 for _ in paths)
+            if self.expected is None:
+                self.expected = n
+        threading.Thread(target=count, name="paperloom-count", daemon=True).start()
+
+    def track(self, paths: Iterable[str]) -> Iterator[str]:
+        """İşçilere verilen yolları say (işlemdeki belge = verilen - biten)."""
+        for p in paths:
+            self.submitted += 1
+            yield p
+
+    def done(self, ok: bool, pages: Optional[int] = None, cached: bool = False) -> None:
+        if ok:
+            self.ok += 1
+        else:
+            self.failed += 1
+        self.pages += pages or 0
+        self.cached += bool(cached)
+        self.last_progress = time.time()
+
+    def resumed_one(self) -> None:
+        self.resumed += 1
+        self.last_progress = time.time()
+
+    # --- anlık görüntü ve çıktılar ---
+
+    def snapshot(self) -> Snapshot:
+        now = time.monotonic()
+        processed = self.ok + self.failed
+        samples = self._samples
+        samples.append((now, processed, self.pages))
+        while len(samples) > 2 and samples[1][0] <= now - self.window:
+            samples.popleft()
+        t_old, d_old, p_old = samples[0]
+        dt = now - t_old
+        docs_rate = (processed - d_old) / dt if dt > 0 else 0.0
+        pages_rate = (self.pages - p_old) / dt if dt > 0 else 0.0
+        done = processed + self.resumed
+        remaining = None if self.expected is None else max(0, self.expected - done)
+        eta = None
+        if remaining == 0:
+            eta = 0.0
+        elif remaining is not None and docs_rate > 0:
+            eta = remaining / docs_rate
+        return {
+            "elapsed_seconds": now - self._t0,
+            "expected": self.expected,
+            "done": done,
+            "ok": self.ok,
+            "failed": self.failed,
+            "resumed": self.resumed,
+            "cached": self.cached,
+            "pages": self.pages,
+            "in_flight": max(0, self.submitted - processed),
+            "docs_per_sec": docs_rate,
+            "pages_per_sec": pages_rate,
+            "eta_seconds": eta,
+            "running": self.running,
+        }
+
+    def _publish(self, force: bool = False) -> None:
+        with self._lock:
+            snap = self.snapshot()
+            now = time.monotonic()
+            update = self.on_update is not None and (force or now - self._updated >= self.interval)
+            write = bool(self.textfile) and (force or now - self._written >= self.textfile_interval)
+            if update:
+                self._updated = now
+            if write:
+                self._written = now
+                text = prometheus_text(snap, self.started_at, self.last_progress, self.run)
+        if update:
+            self.on_update(snap)
+        if write:
+            write_textfile(self.textfile, text)
+
+    def _loop(self) -> None:
+        tick = min(self.interval if self.on_update is not None else math.inf,
+                   self.textfile_interval if self.textfile else math.inf)
+        while not self._stop.wait(tick):
+            try:
+                self._publish()
+            except Exception:
+                pass  # göstergeler çalışmayı asla durdurmamalı
+
+    def start(self) -> "Telemetry":
+        self._publish(force=True)
+        self._thread = threading.Thread(target=self._loop, name="paperloom-telemetry", daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        """Yenilemeyi durdur ve son durumu (running=0) yaz."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.running = False
+        self._publish(force=True)
+
+    def __enter__(self) -> "Telemetry":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# -----------------------------
+#  Prometheus textfile
+# -----------------------------
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _num(value: Optional[float]) -> str:
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return "NaN"
+    if isinstance(value, bool):
+        return str(int(value))
+    if isinstance(value, int):
+        return str(value)
+    return repr(round(value, 6))
+
+
+def prometheus_text(snap: Snapshot, started_at: float, last_progress: float, run: Optional[str] = None) -> str:
+    """Anlık görüntüyü Prometheus açıklama biçimine (text exposition 0.0.4) çevir."""
+    base = [f'run="{_label(run)}"'] if run else []
+
+    def labels(**extra: str) -> str:
+        parts = base + [f'{k}="{_label(v)}"' for k, v in extra.items()]
+        return "{" + ",".join(parts) + "}" if parts else ""
+
+    lines: List[str] = []
+
+    def metric(name: str, kind: str, help_text: str, samples: List[Tuple[str, object]]) -> None:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for lab, value in samples:
+            lines.append(f"{name}{lab} {_num(value)}")
+
+    metric("paperloom_documents_total", "counter", "Documents finished in this run, by outcome.",
+           [(labels(outcome=k), snap[k]) for k in ("ok", "failed", "resumed")])
+    metric("paperloom_cache_hits_total", "counter", "Documents served from the result cache.",
+           [(labels(), snap["cached"])])
+    metric("paperloom_pages_total", "counter", "PDF pages parsed.", [(labels(), snap["pages"])])
+    metric("paperloom_documents_expected", "gauge", "Documents in this run (NaN until known).",
+           [(labels(), snap["expected"])])
+    metric("paperloom_documents_in_flight", "gauge", "Documents handed to workers and not finished yet.",
+           [(labels(), snap["in_flight"])])
+    metric("paperloom_documents_per_second", "gauge", "Recent document throughput (sliding window).",
+           [(labels(), snap["docs_per_sec"])])
+    metric("paperloom_pages_per_second", "gauge", "Recent page throughput (sliding window).",
+           [(labels(), snap["pages_per_sec"])])
+    metric("paperloom_eta_seconds", "gauge", "Estimated seconds until the run finishes (NaN if unknown).",
+           [(labels(), snap["eta_seconds"])])
+    metric("paperloom_start_timestamp_seconds", "gauge", "Unix time the run started.",
+           [(labels(), started_at)])
+    metric("paperloom_last_progress_timestamp_seconds", "gauge", "Unix time a document last finished.",
+           [(labels(), last_progress)])
+    metric("paperloom_last_update_timestamp_seconds", "gauge", "Unix time this file was written.",
+           [(labels(), time.time())])
+    metric("paperloom_running", "gauge", "1 while the run is in progress, 0 once it has finished.",
+           [(labels(), snap["running"])])
+    return "\n".join(lines) + "\n"
+
+
+def write_textfile(path: str, text: str) -> None:
+    """Geçici dosya + os.replace: toplayıcı hiçbir zaman yarım dosya görmez."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+# -----------------------------
+#  CLI ilerleme satırı
+# -----------------------------
+
+def _clock(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "--:--"
+    seconds = int(seconds)
+    h, rest = divmod(seconds, 3600)
+    return f"{h}:{rest // 60:02d}:{rest % 60:02d}" if h else f"{rest // 60:02d}:{rest % 60:02d}"
+
+
+def format_status(snap: Snapshot) -> str:
+    """Tek satırlık ilerleme metni."""
+    done, expected = snap["done"], snap["expected"]
+    if expected:
+        head = f"{done}/{expected} docs ({100 * done // expected}%)"
+    else:
+        head = f"{done} docs"
+    return (f"{head} | {snap['docs_per_sec']:.2f} docs/s | {snap['pages_per_sec']:.1f} pages/s"
+            f" | ETA {_clock(snap['eta_seconds'])} | in flight {snap['in_flight']}"
+            f" | failed {snap['failed']} | elapsed {_clock(snap['elapsed_seconds'])}")
@@ -0,0 +1,133 @@
+import os, json, mmap, hashlib
+from typing import Dict, Optional
+from . import normalize, parse_pdf
+
+try:
+    import fcntl
+except ImportError:  # Windows: kilit yok, tek süreçle yazılmalı
+    fcntl = None
+
+# -----------------------------
+#  Normalize metin deposu
+# -----------------------------
+# read_pdf_text + normalize_text çıktısı tek bir büyük dosyada (texts.bin,
+# UTF-8, art arda) tutulur; texts.idx her metin için bir JSON satırıdır:
+#   {"sha": içerik özeti, "name": dosya adı, "offset", "length", "pages", "fp"}
+# Aynı içerik (sha) bir kez yazılır; farklı adlar aynı aralığı gösterir.
+# Okuma mmap ile yapılır, yalnızca istenen aralık belleğe gelir. Kurallar
+# değişince `reextract` PDF'leri yeniden ayrıştırmadan bu depo üzerinde çalışır.
+
+DATA_NAME = "texts.bin"
+INDEX_NAME = "texts.idx"
+
+
+def text_fingerprint() -> str:
+    """parse_pdf.py ve normalize.py kaynaklarının özeti: depodaki metni bunlar üretir."""
+    h = hashlib.sha256()
+    for mod in (parse_pdf, normalize):
+        with open(mod.__file__, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()[:16]
+
+
+class TextStore:
+    """
+    Salt-ekleme, içerik adresli metin deposu. Birden çok süreç aynı depoya
+    yazabilir: her ekleme veri dosyası üzerinde özel kilit (flock) altında
+    yapılır ve başka süreçlerin eklediği indeks satırları önce okunur.
+    Nesne yalnızca yolları taşır; süreç havuzuna güvenle gönderilebilir.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.data_path = os.path.join(root, DATA_NAME)
+        self.index_path = os.path.join(root, INDEX_NAME)
+        self.fingerprint = text_fingerprint()
+        os.makedirs(root, exist_ok=True)
+        self._by_sha: Dict[str, dict] = {}
+        self._by_name: Dict[str, dict] = {}
+        self._idx_pos = 0
+        self._mm: Optional[mmap.mmap] = None
+
+    def __getstate__(self) -> dict:
+        state = dict(self.__dict__)
+        state.update(_by_sha={}, _by_name={}, _idx_pos=0, _mm=None)
+        return state
+
+    def _refresh(self) -> None:
+        """İndeksin son okunan konumdan sonraki satırlarını yükle."""
+        if not os.path.exists(self.index_path):
+            return
+        with open(self.index_path, "rb") as f:
+            f.seek(self._idx_pos)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # yarım satır: yazan süreç henüz bitirmedi
+                self._idx_pos += len(line)
+                try:
+                    entry = json.loads(line)
+                    self._by_sha[entry["sha"]] = entry
+                    self._by_name[entry["name"]] = entry
+                except (ValueError, KeyError, TypeError):
+                    continue
+
+    def has(self, sha: str) -> bool:
+        """Bu içerik, güncel ayrıştırıcı/normalizer ile üretilmiş olarak depoda mı?"""
+        fresh = lambda: self._by_sha.get(sha, {}).get("fp") == self.fingerprint
+        if not fresh():
+            self._refresh()
+        return fresh()
+
+    def put(self, sha: str, name: str, text: str, pages: int) -> None:
+        """Metni ekle; aynı içerik zaten varsa yalnızca ad için indeks satırı yazılır."""
+        with open(self.data_path, "ab") as data:
+            if fcntl is not None:
+                fcntl.flock(data, fcntl.LOCK_EX)
+            try:
+                if self.has(sha):
+                    known = self._by_sha[sha]
+                    if self._by_name.get(name, {}).get("sha") == sha:
+                        return
+                    entry = dict(known, name=name)
+                else:
+                    blob = text.encode("utf-8")
+                    data.seek(0, os.SEEK_END)
+                    entry = {"sha": sha, "name": name, "offset": data.tell(), "length": len(blob),
+                             "pages": pages, "fp": self.fingerprint}
+                    data.write(blob)
+                    data.flush()
+                with open(self.index_path, "ab") as idx:
+                    if idx.tell() and not self._index_ends_with_newline():
+                        idx.write(b"\n")  # çöken bir yazarın yarım satırından ayır
+                    idx.write((json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8"))
+                self._refresh()
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(data, fcntl.LOCK_UN)
+
+    def _index_ends_with_newline(self) -> bool:
+        with open(self.index_path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def entries(self) -> Dict[str, dict]:
+        """Dosya adı → en son indeks satırı (aynı adla yeniden eklenen içerik eskisinin yerini alır)."""
+        self._refresh()
+        return dict(self._by_name)
+
+    def text(self, entry: dict) -> str:
+        """Bir indeks satırının metnini mmap üzerinden oku."""
+        if not entry["length"]:
+            return ""
+        end = entry["offset"] + entry["length"]
+        if self._mm is None or len(self._mm) < end:
+            if self._mm is not None:
+                self._mm.close()
+            with open(self.data_path, "rb") as f:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mm[entry["offset"]:end].decode("utf-8")
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
@@ -0,0 +1,211 @@
+import os, time, signal, logging, multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, Future, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from logging.handlers import QueueListener
+from typing import Deque, Dict, List, Optional, Tuple
+from .pipeline import _process_pdf, _init_worker, _setup_logger
+from .extract_rules import RULE_TIME_BUDGET
+from .cache import ResultCache
+from .journal import RunJournal, JOURNAL_NAME
+from .discover import iter_pdfs
+from .supervise import Quarantine, QUARANTINE_NAME
+
+Stamp = Tuple[int, int]
+
+
+def _scan(
+    input_dir: str,
+    recursive: bool = False,
+    include: Optional[List[str]] = None,
+    exclude: Optional[List[str]] = None,
+) -> Dict[str, Stamp]:
+    """Klasördeki PDF'lerin (boyut, mtime) damgaları; keşif extract ile aynıdır (discover.iter_pdfs)."""
+    found: Dict[str, Stamp] = {}
+    for path in iter_pdfs(input_dir, recursive, include, exclude):
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue  # tarama sırasında silinmiş
+        found[path] = (st.st_size, st.st_mtime_ns)
+    return found
+
+
+def _init_watch_worker(queue, level: int) -> None:
+    """Ctrl-C yalnızca ana süreci durdursun; işçiler havuz kapanırken temizce biter."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _init_worker(queue, level)
+
+
+def watch_folder(
+    input_dir: str,
+    output_dir: str,
+    jsonl_name: str = "znr_dataset.jsonl",
+    csv_name: Optional[str] = "znr_dataset.csv",
+    sqlite_name: Optional[str] = None,
+    sqlite_key: str = "sha",
+    log_level: str = "INFO",
+    workers: int = 1,
+    interval: float = 1.0,
+    max_queue: Optional[int] = None,
+    use_cache: bool = True,
+    cache_dir: Optional[str] = None,
+    cache_max_mb: int = 512,
+    rule_timeout: Optional[float] = RULE_TIME_BUDGET,
+    once: bool = False,
+    recursive: bool = False,
+    include: Optional[List[str]] = None,
+    exclude: Optional[List[str]] = None,
+) -> int:
+    """
+    input_dir'i izler; yeni ya da değişmiş PDF'leri sürekli açık (ısınmış) bir
+    süreç havuzunda işleyip kayıtlarını JSONL/CSV (ve istenirse SQLite) çıktılarının
+    sonuna ekler. Tüm klasör yeniden işlenmez.
+
+    - Klasör her `interval` saniyede bir os.scandir ile taranır; bir dosya iki
+      tarama arasında boyutu/mtime'ı değişmediyse (kopyalama bitmişse) kuyruğa alınır.
+    - Havuzda aynı anda en fazla `max_queue` iş bulunur (varsayılan workers*4);
+      fazlası bekler (geri basınç).
+    - İşlenen dosyalar çalışma günlüğüne (.paperloom-journal.jsonl) yazılır;
+      yeniden başlatıldığında değişmemiş dosyalar atlanır.
+    - JSON dizisi ve Excel sona eklemeye uygun olmadığından bu modda yazılmaz.
+    - Değişen bir dosyanın yeni kaydı JSONL/CSV'ye yeni satır olarak eklenir
+      (aynı source_path için son satır geçerlidir); SQLite'ta eski satırın
+      yerini alır.
+    - recursive/include/exclude extract ile aynıdır; recursive=True ise
+      source_path input_dir'e göre göreli yoldur.
+    - Bir işçi çökerse (BrokenProcessPool) havuz yeniden kurulur. O anda
+      işlemde tek dosya varsa karantinaya (quarantine.json) alınır; birden
+      çoksa hepsi tek tek yeniden denenir ve yalnız başına çöken karantinaya
+      alınır. Karantinadaki dosyalar değişmedikçe yeniden denenmez.
+
+    once=True ise mevcut birikim işlenince döner. İşlenen kayıt sayısını döndürür.
+    """
+    from .io_utils import RecordWriters, JsonlWriter, CsvStreamWriter, SqliteWriter
+
+    os.makedirs(output_dir, exist_ok=True)
+    level = getattr(logging, log_level.upper(), logging.INFO)
+    logger = _setup_logger(output_dir, level)
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    max_queue = max_queue or workers * 4
+
+    cache = None
+    if use_cache:
+        cache = ResultCache(cache_dir or os.path.join(output_dir, ".paperloom-cache"),
+                            max_bytes=cache_max_mb * 1024 * 1024)
+
+    journal = RunJournal(os.path.join(output_dir, JOURNAL_NAME), resume=True)
+    # Daha önce işlenmiş dosyalar: günlükteki damgalarıyla
+    handled: Dict[str, Stamp] = {
+        os.path.join(input_dir, name): (e.get("size"), e.get("mtime_ns"))
+        for name, e in journal.done.items()
+    }
+    journal.done.clear()
+
+    writers = [JsonlWriter(os.path.join(output_dir, jsonl_name), append=True)]
+    if csv_name:
+        writers.append(CsvStreamWriter(os.path.join(output_dir, csv_name), append=True))
+    if sqlite_name:
+        writers.append(SqliteWriter(os.path.join(output_dir, sqlite_name), input_dir, key=sqlite_key, batch=1))
+
+    quarantine = Quarantine(os.path.join(output_dir, QUARANTINE_NAME), input_dir if recursive else None)
+
+    queue = multiprocessing.Queue()
+    listener = QueueListener(queue, *logger.handlers, respect_handler_level=True)
+    listener.start()
+
+    def new_pool() -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=workers, initializer=_init_watch_worker, initargs=(queue, level))
+
+    pool = new_pool()
+    fn = partial(_process_pdf, cache=cache, rule_timeout=rule_timeout, hash_source=bool(sqlite_name),
+                 root=input_dir if recursive else None)
+
+    seen: Dict[str, Stamp] = {}
+    backlog: Deque[Tuple[str, Stamp]] = deque()
+    queued: Dict[str, Stamp] = {}
+    in_flight: Dict[Future, Tuple[str, Stamp]] = {}
+    # Bir çöküş anında işlemde olan dosyalar; suçluyu bulmak için tek tek denenir
+    suspects: Deque[Tuple[str, Stamp]] = deque()
+    processed = 0
+    logger.info("Watching %s with %d warm worker(s), max queue %d.", input_dir, workers, max_queue)
+    try:
+        with journal, RecordWriters(writers, batch_size=1) as out:
+            next_scan = 0.0
+            while True:
+                now = time.monotonic()
+                if now >= next_scan:
+                    current = _scan(input_dir, recursive, include, exclude)
+                    for path, stamp in sorted(current.items()):
+                        settled = once or seen.get(path) == stamp
+                        if settled and handled.get(path) != stamp and queued.get(path) != stamp:
+                            if path in quarantine:
+                                logger.warning("Skipping quarantined PDF: %s (%s)", quarantine.name(path),
+                                               quarantine.entries[quarantine.name(path)].get("reason"))
+                                handled[path] = stamp
+                                continue
+                            backlog.append((path, stamp))
+                            queued[path] = stamp
+                    seen = current
+                    next_scan = now + interval
+
+                if suspects:
+                    if not in_flight:
+                        path, stamp = suspects.popleft()
+                        in_flight[pool.submit(fn, path)] = (path, stamp)
+                else:
+                    while backlog and len(in_flight) < max_queue:
+                        path, stamp = backlog.popleft()
+                        in_flight[pool.submit(fn, path)] = (path, stamp)
+
+                if once and not backlog and not in_flight and not suspects:
+                    break
+
+                done, _ = wait(list(in_flight), timeout=max(0.0, next_scan - time.monotonic()),
+                               return_when=FIRST_COMPLETED)
+                if any(isinstance(f.exception(), BrokenProcessPool) for f in done):
+                    # Havuz bozuldu: kalan işler de hemen hatayla biter
+                    done |= wait(list(in_flight))[0]
+                crashed: List[Tuple[str, Stamp]] = []
+                for fut in done:
+                    path, stamp = in_flight.pop(fut)
+                    exc = fut.exception()
+                    if isinstance(exc, BrokenProcessPool):
+                        crashed.append((path, stamp))
+                        continue
+                    handled[path] = stamp
+                    if queued.get(path) == stamp:
+                        del queued[path]
+                    if exc is not None:
+                        logger.error("Failed on %s: %s", quarantine.name(path), exc)
+                        continue
+                    rec = fut.result()
+                    if rec is not None:
+                        journal.append(path, rec)
+                        out.write(rec)
+                        processed += 1
+                if crashed:
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    pool = new_pool()
+                    if len(crashed) == 1:
+                        path, stamp = crashed[0]
+                        logger.error("Worker process died on %s; quarantined.", quarantine.name(path))
+                        quarantine.add(path, "worker crashed")
+                        handled[path] = stamp
+                        if queued.get(path) == stamp:
+                            del queued[path]
+                    else:
+                        logger.error("Worker process died with %d file(s) in flight; retrying them one at a time.",
+                                     len(crashed))
+                        suspects.extend(sorted(crashed))
+                if not in_flight and not done:
+                    time.sleep(max(0.0, next_scan - time.monotonic()))
+    except KeyboardInterrupt:
+        logger.info("Watch interrupted; %d file(s) left in queue.", len(backlog) + len(in_flight))
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+        listener.stop()
+    logger.info("Watch stopped after %d record(s).", processed)
+    return processed
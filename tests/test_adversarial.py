@@ -0,0 +1,44 @@
+import math, re, time
+
+import pytest
+
+import paperloom.extract_rules as rules
+from paperloom.bench import ADVERSARIAL
+from paperloom.extract_rules import extract_all
+
+SMALL, LARGE = 20_000, 160_000
+# Doğrusal ≈ 1, karesel ≈ 2; ölçüm gürültüsü için pay bırakılır
+MAX_EXPONENT = 1.5
+
+
+def _best(text: str, repeat: int = 3) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        extract_all(text, time_budget=None)
+        times.append(time.perf_counter() - t0)
+    return max(min(times), 1e-4)
+
+
+@pytest.mark.parametrize("name", sorted(ADVERSARIAL))
+def test_adversarial_input_is_linear(name):
+    gen = ADVERSARIAL[name]
+    small, large = _best(gen(SMALL)), _best(gen(LARGE))
+    exponent = math.log(large / small) / math.log(LARGE / SMALL)
+    assert exponent <= MAX_EXPONENT, f"{name}: {small:.4f}s -> {large:.4f}s (exponent {exponent:.2f})"
+    assert large < 5.0
+
+
+@pytest.mark.skipif(not rules._CAN_ALARM, reason="SIGALRM yok")
+def test_rule_time_budget_stops_runaway_rule(monkeypatch):
+    catastrophic = re.compile(r"(a+)+$")
+
+    def runaway(idx):
+        return "x" if catastrophic.search(idx.text) else None
+
+    monkeypatch.setattr(rules, "RULES", rules.RULES + [("runaway", runaway, True)])
+    t0 = time.perf_counter()
+    out = extract_all("a" * 40 + "b", time_budget=0.2)
+    assert time.perf_counter() - t0 < 3.0
+    assert out["runaway"] is None
+    assert out["extras"] == {"rule_timeouts": ["runaway"]}
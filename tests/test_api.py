@@ -0,0 +1,71 @@
+import random
+
+import pytest
+
+from paperloom import extract_record, extract_records
+from paperloom.synth import pdf_bytes, synth_paper
+
+
+@pytest.fixture
+def pdfs(tmp_path):
+    rng = random.Random(1)
+    paths = []
+    for name in ("a.pdf", "b.pdf"):
+        path = tmp_path / name
+        path.write_bytes(pdf_bytes(synth_paper(rng, pages=3)[0]))
+        paths.append(str(path))
+    return paths
+
+
+def test_tuple_of_paths_is_two_sources(pdfs):
+    assert [r.source_path for r in extract_records(tuple(pdfs))] == ["a.pdf", "b.pdf"]
+
+
+def test_name_bytes_pair_is_one_source(pdfs):
+    with open(pdfs[1], "rb") as f:
+        data = f.read()
+    assert [r.source_path for r in extract_records(("x.pdf", data))] == ["x.pdf"]
+
+
+def test_extract_record_names_a_path(pdfs):
+    assert extract_record(pdfs[0], name="named.pdf").source_path == "named.pdf"
+
+
+def test_other_tuples_are_rejected():
+    with pytest.raises(TypeError):
+        list(extract_records([("a.pdf", "b.pdf", "c.pdf")]))
+
+
+def test_rule_timeout_defaults_to_rule_budget(monkeypatch, pdfs):
+    import paperloom.pipeline as pipeline
+    from paperloom.extract_rules import RULE_TIME_BUDGET
+
+    seen = []
+    real = pipeline._extract_source
+
+    def spy(source, name, page_budget=None, early_stop=False, rule_timeout=None):
+        seen.append(rule_timeout)
+        return real(source, name, page_budget, early_stop, rule_timeout)
+
+    monkeypatch.setattr(pipeline, "_extract_source", spy)
+    extract_record(pdfs[0])
+    assert seen == [RULE_TIME_BUDGET]
+
+
+def test_truncated_records_do_not_leak_into_full_cache(tmp_path, pdfs):
+    from paperloom.pipeline import extract_pdfs
+
+    cache_dir = str(tmp_path / "cache")
+    full = extract_record(pdfs[0])
+    short = extract_record(pdfs[0], page_budget=1, cache_dir=cache_dir)
+    assert short.to_dict() != full.to_dict()
+    with open(pdfs[0], "rb") as f:
+        assert extract_record(("a.pdf", f.read()), cache_dir=cache_dir).to_dict() == full.to_dict()
+
+    out = tmp_path / "out"
+    extract_pdfs(str(tmp_path), str(out), json_name="", csv_name="", excel_name="",
+                 jsonl_name="all.jsonl", cache_dir=cache_dir)
+    from paperloom.io_utils import iter_records
+    got = {r.source_path: r.to_dict() for r in iter_records(str(out / "all.jsonl"))}
+    assert got["a.pdf"] == full.to_dict()
+    assert extract_record(pdfs[0], page_budget=1, cache_dir=cache_dir).to_dict() == short.to_dict()
@@ -0,0 +1,12 @@
+import pytest
+
+from paperloom import batch, cache, extract_rules, normalize, segment
+
+
+@pytest.mark.parametrize("module", [extract_rules, segment, normalize, batch])
+def test_rule_modules_change_the_fingerprint(tmp_path, monkeypatch, module):
+    before = cache.rules_fingerprint()
+    copy = tmp_path / "changed.py"
+    copy.write_bytes(open(module.__file__, "rb").read() + b"\n# changed\n")
+    monkeypatch.setattr(module, "__file__", str(copy))
+    assert cache.rules_fingerprint() != before
@@ -0,0 +1,104 @@
+import random
+
+import pytest
+
+from paperloom.cache import ResultCache
+from paperloom.codec import CATEGORIES, CODEC_VERSION, decode_record, encode_record
+from paperloom.models import FIELDS, PaperRecord
+
+FULL = PaperRecord(
+    source_path="dir/ZnO – ribbon.pdf", title="Négative differential résistance in ZnO", authors="A. Yılmaz; B. Øst",
+    year=2019, doi="10.1000/xyz", keywords="ZnO; NDR", abstract="Abstract with μB and 9×9×1 and emoji 🧪",
+    system="ZnO nanoribbon", edge="zigzag", passivation="H", doping="Co", vacancy="V_O",
+    functional="PBE", u_values="U_Zn-d=6.5 eV", kpoints="9x9x1", bandgap_ev=1.25, bandgap_type="direct",
+    magnetic_moment="1.98 μB", ndr=False, confidence=0.75,
+    extras={"rule_timeouts": ["doi"], "nested": {"ü": [1, 2.5, None, True]}},
+)
+
+
+def _roundtrip(rec):
+    return decode_record(encode_record(rec))
+
+
+def test_every_field_roundtrips():
+    assert set(FIELDS) == {f for f in FIELDS if getattr(FULL, f) is not None}
+    assert _roundtrip(FULL).to_dict() == FULL.to_dict()
+
+
+def test_none_masks():
+    rng = random.Random(0)
+    for _ in range(200):
+        kept = {f: getattr(FULL, f) for f in FIELDS if f == "source_path" or rng.random() < 0.5}
+        rec = PaperRecord(**kept)
+        assert _roundtrip(rec).to_dict() == rec.to_dict()
+    assert _roundtrip(PaperRecord(source_path="x.pdf")).to_dict() == PaperRecord(source_path="x.pdf").to_dict()
+
+
+@pytest.mark.parametrize("field", sorted(CATEGORIES))
+def test_categories_known_and_escaped(field):
+    for value in CATEGORIES[field] + ("pbe", "", "ünknown", "zigzag "):
+        rec = PaperRecord(source_path="a.pdf", **{field: value})
+        assert getattr(_roundtrip(rec), field) == value
+
+
+def test_empty_and_falsy_values():
+    rec = PaperRecord(source_path="", title="", year=0, bandgap_ev=0.0, ndr=False, confidence=0.0, extras={})
+    assert _roundtrip(rec).to_dict() == rec.to_dict()
+
+
+def test_file_sha256_is_not_encoded():
+    rec = PaperRecord(source_path="a.pdf", file_sha256="ab" * 32)
+    assert _roundtrip(rec).file_sha256 is None
+
+
+def test_version_mismatch_raises_value_error():
+    data = bytearray(encode_record(FULL))
+    data[0] = CODEC_VERSION + 1
+    with pytest.raises(ValueError):
+        decode_record(bytes(data))
+
+
+def _cache_with(tmp_path, payload: bytes):
+    cache = ResultCache(str(tmp_path / "cache"))
+    key = cache.key_for("a.pdf", digest="0" * 64)
+    cache.put(key, FULL)
+    with open(cache._entry_path(key), "wb") as f:
+        f.write(payload)
+    return cache, key
+
+
+@pytest.mark.parametrize("payload", [
+    b"",
+    bytes([CODEC_VERSION + 1]) + encode_record(FULL)[1:],
+    b'{"source_path": "a.pdf"}',          # eski JSON önbellek girdisi
+    b"\x89PNG\r\n\x1a\n",
+    encode_record(FULL)[:-5],
+])
+def test_foreign_or_stale_entries_are_cache_misses(tmp_path, payload):
+    cache, key = _cache_with(tmp_path, payload)
+    assert cache.get(key, "a.pdf") is None
+
+
+def test_cache_hit_roundtrip(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"))
+    key = cache.key_for("a.pdf", digest="1" * 64)
+    cache.put(key, FULL)
+    got = cache.get(key, "other.pdf")
+    assert got.source_path == "other.pdf"
+    assert {k: v for k, v in got.to_dict().items() if k != "source_path"} == \
+        {k: v for k, v in FULL.to_dict().items() if k != "source_path"}
+
+
+def test_random_garbage_never_raises(tmp_path):
+    rng = random.Random(1)
+    good = encode_record(FULL)
+    cache, key = _cache_with(tmp_path, b"")
+    for _ in range(500):
+        data = bytearray(good)
+        for _ in range(rng.randint(1, 8)):
+            data[rng.randrange(len(data))] = rng.randrange(256)
+        data[0] = CODEC_VERSION
+        with open(cache._entry_path(key), "wb") as f:
+            f.write(bytes(data[:rng.randint(0, len(data))]))
+        got = cache.get(key, "a.pdf")
+        assert got is None or isinstance(got, PaperRecord)
@@ -0,0 +1,54 @@
+import json
+import random
+
+from paperloom.dedup import find_duplicates
+from paperloom.io_utils import iter_records
+from paperloom.pipeline import extract_pdfs
+from paperloom.synth import pdf_bytes, synth_paper
+
+BODY = " ".join(
+    f"Section {i}: we study zigzag ZnO nanoribbons of width {i + 4} passivated with hydrogen, "
+    f"using PBE with U_Zn-d={i}.5 eV and a {i + 5}x1x1 k-point grid; the band gap is 1.{i} eV."
+    for i in range(8)
+)
+
+
+def _pdf(path, first_page, more=("Second page text.",)):
+    path.write_bytes(pdf_bytes([first_page, *more]))
+    return str(path)
+
+
+def test_duplicates_across_names(tmp_path):
+    rng = random.Random(5)
+    original = _pdf(tmp_path / "a_original.pdf", "Title: ZnO ribbons\nDOI: 10.1234/zno.2020.001\n" + BODY)
+    copy = tmp_path / "z_renamed_copy.pdf"
+    copy.write_bytes(open(original, "rb").read())
+    preprint = _pdf(tmp_path / "b_preprint.pdf", "Preprint. DOI 10.1234/ZNO.2020.001\n" + BODY + " Draft.")
+    near = _pdf(tmp_path / "c_near.pdf", "Title: ZnO ribbons (accepted manuscript)\n" + BODY)
+    other = _pdf(tmp_path / "d_other.pdf", "\n".join(synth_paper(rng, pages=1)[0]))
+
+    report = find_duplicates([original, preprint, near, other, str(copy)], root=str(tmp_path))
+    assert [(r["file"], r["duplicate_of"], r["reason"]) for r in report] == [
+        ("b_preprint.pdf", "a_original.pdf", "doi"),
+        ("c_near.pdf", "a_original.pdf", "text"),
+        ("z_renamed_copy.pdf", "a_original.pdf", "sha256"),
+    ]
+    assert report[2]["similarity"] == 1.0
+
+    assert find_duplicates([original, other, near], near=False) == []
+
+
+def test_merge_keeps_one_record(tmp_path):
+    inp, out = tmp_path / "in", tmp_path / "out"
+    inp.mkdir()
+    original = _pdf(inp / "a.pdf", "Title: ZnO ribbons\nDOI: 10.1234/zno.2020.001\n" + BODY)
+    (inp / "b.pdf").write_bytes(open(original, "rb").read())
+    _pdf(inp / "c.pdf", "Title: something else entirely about graphene sheets and phonons")
+
+    extract_pdfs(str(inp), str(out), json_name="", csv_name="", excel_name="",
+                 jsonl_name="all.jsonl", use_cache=False, dedup="merge")
+    recs = {r.source_path: r for r in iter_records(str(out / "all.jsonl"))}
+    assert sorted(recs) == ["a.pdf", "c.pdf"]
+    assert recs["a.pdf"].extras["duplicates"] == ["b.pdf"]
+    report = json.loads((out / "duplicates.json").read_text(encoding="utf-8"))
+    assert [(r["file"], r["reason"]) for r in report] == [("b.pdf", "sha256")]
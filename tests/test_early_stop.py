@@ -0,0 +1,91 @@
+import random
+
+from paperloom.extract_rules import IncrementalExtractor, extract_all
+from paperloom.pipeline import IMPORTANT_FIELDS, META_FIELDS, _read_pages
+from paperloom.normalize import normalize_text
+from paperloom.synth import pdf_bytes, synth_paper
+
+
+def _paper(ndr: bool, pages: int = 8):
+    rng = random.Random(0)
+    while True:
+        page_texts, truth = synth_paper(rng, pages=pages)
+        if truth["ndr"] is ndr:
+            return page_texts
+
+
+def test_early_stop_without_ndr(tmp_path):
+    path = tmp_path / "no_ndr.pdf"
+    path.write_bytes(pdf_bytes(_paper(ndr=False)))
+    _, n_pages = _read_pages(str(path), None, True)
+    assert n_pages == 2
+
+
+def test_early_stop_with_ndr(tmp_path):
+    path = tmp_path / "ndr.pdf"
+    path.write_bytes(pdf_bytes(_paper(ndr=True)))
+    _, n_pages = _read_pages(str(path), None, True)
+    assert n_pages == 2
+
+
+def test_early_stop_text_is_normalized_once(tmp_path):
+    from paperloom.parse_pdf import iter_pdf_pages
+
+    path = tmp_path / "ndr.pdf"
+    path.write_bytes(pdf_bytes(_paper(ndr=True)))
+    text, n_pages = _read_pages(str(path), None, True)
+    pages = list(iter_pdf_pages(str(path), max_pages=n_pages))
+    assert text == normalize_text("\n".join(pages))
+    assert _read_pages(str(path), n_pages, False) == (text, n_pages)
+
+
+def test_false_counts_as_found():
+    tracker = IncrementalExtractor(["ndr"])
+    assert tracker.feed("nothing to see here")
+    assert tracker.found == {"ndr"}
+
+
+def test_feed_runs_only_missing_rules(monkeypatch):
+    import paperloom.extract_rules as rules
+
+    seen = []
+
+    def spy(text, time_budget=None, timings=None, fields=None):
+        seen.append(set(fields))
+        return extract_all(text, time_budget, timings, fields)
+
+    monkeypatch.setattr(rules, "extract_all", spy)
+    pages = [normalize_text(p) for p in _paper(ndr=False)]
+    tracker = IncrementalExtractor(IMPORTANT_FIELDS + META_FIELDS)
+    tracker.feed(pages[0])
+    after_first = set(tracker.found)
+    tracker.feed(pages[1])
+    assert seen[0] == set(IMPORTANT_FIELDS + META_FIELDS)
+    assert after_first and seen[1] == seen[0] - after_first
+    assert tracker.done
+
+
+def test_extract_all_fields_subset():
+    out = extract_all("ZnO nanoribbon with a direct band gap of 1.23 eV", fields=["bandgap_ev", "ndr"])
+    assert set(out) == {"bandgap_ev", "ndr"}
+    assert out["bandgap_ev"] == 1.23
+
+
+def test_early_stop_rules_are_not_timed_as_read(tmp_path, monkeypatch):
+    import time
+
+    from paperloom.profiling import DocProfile
+
+    real_feed = IncrementalExtractor.feed
+
+    def slow_feed(self, text):
+        time.sleep(0.05)
+        return real_feed(self, text)
+
+    monkeypatch.setattr(IncrementalExtractor, "feed", slow_feed)
+    path = tmp_path / "ndr.pdf"
+    path.write_bytes(pdf_bytes(_paper(ndr=True)))
+    prof = DocProfile(str(path))
+    _read_pages(str(path), None, True, stage=prof.stage)
+    assert prof.stages["early_stop"] >= 0.1
+    assert prof.stages["read"] < 0.05
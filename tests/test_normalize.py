@@ -0,0 +1,54 @@
+import random
+
+import pytest
+
+from paperloom.bench import _NORMALIZE_ATOMS, _reference_normalize
+from paperloom.normalize import Normalizer, normalize_pages, normalize_text
+
+CASES = [
+    "",
+    "  plain text \n",
+    "nano-\nbon", "nano- \n  bon", "a-\nb-\nc", "x-\n", "-\nb", "nano-\n\n bon",
+    "1×2", "1 × 2", "1×2×3", "a×2", "2×", "5 ×\n6",
+    "4x4x1", "4 X 4 x 1", "4x4x1x1", "12x12", "k-grid 6 x 6 x 1 and 8x8x2",
+    "ﬁlm ﬃne", "co­mpound", "５ｘ５ｘ１",
+    "a \t b\t\tc", "a  \n  b", "a\r\nb", "a\xa0\nb", "a　 \n b", "a\x85b",
+]
+PAGES = [
+    ["nano-", "bon"],
+    ["nano-\n", "bon"],
+    ["4x4", "x1"],
+    ["4 x", " 4 x 1"],
+    ["1 ×", "2"],
+    ["first page.", "", "  third page\t", ""],
+    ["Abstract.\n\n", "\n  body-", "\nof text"],
+    ["", ""],
+]
+
+
+@pytest.mark.parametrize("text", CASES)
+def test_normalize_text_matches_reference(text):
+    assert normalize_text(text) == _reference_normalize(text)
+
+
+@pytest.mark.parametrize("pages", PAGES)
+def test_pages_match_joined_text(pages):
+    want = normalize_text("\n".join(pages))
+    assert normalize_pages(pages) == want
+    assert normalize_pages(pages, sep="") == normalize_text("".join(pages))
+
+    norm = Normalizer()
+    out = [norm.feed(p if i == 0 else "\n" + p) for i, p in enumerate(pages)]
+    out.append(norm.finish())
+    assert "".join(out) == want
+
+
+def test_random_atoms():
+    rng = random.Random(0)
+    for _ in range(3000):
+        text = "".join(rng.choice(_NORMALIZE_ATOMS) for _ in range(rng.randint(0, 40)))
+        assert normalize_text(text) == _reference_normalize(text), repr(text)
+        cuts = sorted(rng.sample(range(len(text) + 1), min(len(text) + 1, rng.randint(0, 4))))
+        pages = [text[a:b] for a, b in zip([0] + cuts, cuts + [len(text)])]
+        assert normalize_pages(pages, sep="") == normalize_text(text), repr(pages)
+        assert normalize_pages(pages) == normalize_text("\n".join(pages)), repr(pages)
@@ -0,0 +1,78 @@
+import random
+
+import pytest
+
+import paperloom.pipeline as pipeline
+from paperloom.synth import pdf_bytes, synth_paper
+
+NAMES = [f"p{i:02d}.pdf" for i in range(6)]
+_PROCESS_PDF = pipeline._process_pdf
+OUTPUTS = dict(json_name="out.json", csv_name="out.csv", excel_name="", jsonl_name="out.jsonl")
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    inp = tmp_path / "in"
+    inp.mkdir()
+    rng = random.Random(4)
+    for name in NAMES:
+        (inp / name).write_bytes(pdf_bytes(synth_paper(rng, pages=2)[0]))
+    return inp
+
+
+def _run(inp, out, **kwargs):
+    pipeline.extract_pdfs(str(inp), str(out), use_cache=False, journal_batch=1, **OUTPUTS, **kwargs)
+
+
+def _outputs(out):
+    return {name: (out / name).read_bytes() for name in OUTPUTS.values() if name}
+
+
+class Interrupted(Exception):
+    """Çalışmayı yarıda kesen hata (çökme / Ctrl-C yerine)."""
+
+
+def _interrupt_after(monkeypatch, n):
+    """n belge işlendikten sonra çalışmayı kes; işlenen yolların listesini döndür."""
+    calls = []
+
+    def process(path, **kwargs):
+        if len(calls) == n:
+            raise Interrupted
+        calls.append(path)
+        return _PROCESS_PDF(path, **kwargs)
+
+    monkeypatch.setattr(pipeline, "_process_pdf", process)
+    return calls
+
+
+def test_resume_skips_completed_documents(tmp_path, corpus, monkeypatch):
+    _run(corpus, tmp_path / "clean")
+
+    out = tmp_path / "out"
+    first = _interrupt_after(monkeypatch, 3)
+    with pytest.raises(Interrupted):
+        _run(corpus, out)
+    assert len(first) == 3
+
+    second = _interrupt_after(monkeypatch, len(NAMES))
+    _run(corpus, out, resume=True)
+    assert sorted(map(str, second)) == sorted(str(corpus / n) for n in NAMES[3:])
+    assert _outputs(out) == _outputs(tmp_path / "clean")
+
+    # Her şey tamamlandıktan sonra yeniden devam etmek hiçbir belgeyi yeniden işlemez
+    third = _interrupt_after(monkeypatch, 0)
+    _run(corpus, out, resume=True)
+    assert third == []
+    assert _outputs(out) == _outputs(tmp_path / "clean")
+
+
+def test_changed_file_is_reprocessed_on_resume(tmp_path, corpus, monkeypatch):
+    out = tmp_path / "out"
+    _run(corpus, out)
+    (corpus / NAMES[1]).write_bytes(pdf_bytes(synth_paper(random.Random(9), pages=2)[0]))
+    _run(corpus, tmp_path / "clean")
+    calls = _interrupt_after(monkeypatch, len(NAMES))
+    _run(corpus, out, resume=True)
+    assert calls == [str(corpus / NAMES[1])]
+    assert _outputs(out) == _outputs(tmp_path / "clean")
@@ -0,0 +1,156 @@
+import asyncio
+import base64
+import http.client
+import json
+import os
+import random
+import signal
+import socket
+import threading
+import time
+
+import pytest
+
+from paperloom.serve import ExtractionService
+from paperloom.synth import pdf_bytes, synth_paper
+
+
+@pytest.fixture(scope="module")
+def server():
+    """Servis, ayrı bir iş parçacığındaki olay döngüsünde geçici bir portta çalışır."""
+    service = ExtractionService(workers=1, max_body_mb=1)
+    loop = asyncio.new_event_loop()
+    ready = threading.Event()
+    box = {}
+
+    def run():
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(service.start())
+        srv = loop.run_until_complete(asyncio.start_server(service.handle, "127.0.0.1", 0))
+        box["port"] = srv.sockets[0].getsockname()[1]
+        ready.set()
+        loop.run_forever()
+        srv.close()
+        loop.run_until_complete(srv.wait_closed())
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    assert ready.wait(60)
+    yield service, box["port"]
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(10)
+    service.close()
+
+
+@pytest.fixture(scope="module")
+def pdf():
+    return pdf_bytes(synth_paper(random.Random(3), pages=2)[0])
+
+
+def _request(port, method, path, body=None, headers=None):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    try:
+        conn.request(method, path, body=body, headers=headers or {})
+        resp = conn.getresponse()
+        return resp.status, json.loads(resp.read())
+    finally:
+        conn.close()
+
+
+def _raw(port, head: bytes):
+    """Ham istek gönder; (durum, Connection başlığı, gövde) döndür."""
+    with socket.create_connection(("127.0.0.1", port), timeout=30) as sock:
+        sock.sendall(head)
+        resp = http.client.HTTPResponse(sock)
+        resp.begin()
+        return resp.status, resp.getheader("Connection"), json.loads(resp.read())
+
+
+def test_health(server):
+    _, port = server
+    status, payload = _request(port, "GET", "/health")
+    assert status == 200 and payload["status"] == "ok"
+
+
+def test_extract(server, pdf):
+    _, port = server
+    status, rec = _request(port, "POST", "/extract?name=paper.pdf", body=pdf)
+    assert status == 200
+    assert rec["source_path"] == "paper.pdf"
+    assert rec["confidence"] is not None
+
+
+def test_batch_with_a_corrupt_document(server, pdf):
+    _, port = server
+    docs = [{"name": "good.pdf", "data": base64.b64encode(pdf).decode()},
+            {"name": "bad.pdf", "data": base64.b64encode(b"not a pdf").decode()}]
+    status, payload = _request(port, "POST", "/extract/batch", body=json.dumps({"documents": docs}),
+                               headers={"Content-Type": "application/json"})
+    assert status == 200
+    good, bad = payload["records"]
+    assert good["source_path"] == "good.pdf" and "error" not in good
+    assert bad["source_path"] == "bad.pdf" and bad["error"]
+
+
+def test_stats(server, pdf):
+    _, port = server
+    _, before = _request(port, "GET", "/stats")
+    _request(port, "POST", "/extract?name=a.pdf", body=pdf)
+    _request(port, "POST", "/extract?name=b.pdf", body=b"%PDF-broken")
+    _, after = _request(port, "GET", "/stats")
+    assert after["documents"] == before["documents"] + 1
+    assert after["errors"] == before["errors"] + 1
+    assert after["requests"] >= before["requests"] + 3
+    assert after["in_flight"] == 0
+
+
+def test_length_required(server):
+    _, port = server
+    status, connection, _ = _raw(port, b"POST /extract HTTP/1.1\r\nHost: x\r\n\r\n")
+    assert (status, connection) == (411, "close")
+    status, connection, _ = _raw(port, b"POST /extract HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n")
+    assert (status, connection) == (411, "close")
+
+
+def test_payload_too_large(server):
+    _, port = server
+    status, connection, _ = _raw(port, b"POST /extract HTTP/1.1\r\nContent-Length: %d\r\n\r\n" % (2 << 20))
+    assert (status, connection) == (413, "close")
+
+
+@pytest.mark.parametrize("length", [b"-1", b"abc", b"1e3", "٣".encode("utf-8")])
+def test_bad_content_length(server, length):
+    _, port = server
+    status, connection, _ = _raw(port, b"POST /extract HTTP/1.1\r\nContent-Length: " + length + b"\r\n\r\n")
+    assert (status, connection) == (400, "close")
+
+
+def test_keep_alive_reuses_the_connection(server, pdf):
+    _, port = server
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    try:
+        conn.request("GET", "/health")
+        assert conn.getresponse().read()
+        sock = conn.sock
+        conn.request("POST", "/extract?name=k.pdf", body=pdf)
+        resp = conn.getresponse()
+        assert resp.status == 200 and json.loads(resp.read())["source_path"] == "k.pdf"
+        conn.request("GET", "/nowhere")
+        resp = conn.getresponse()
+        assert resp.status == 404 and resp.read()
+        assert conn.sock is sock
+    finally:
+        conn.close()
+
+
+def test_pool_restarts_after_a_worker_dies(server, pdf):
+    service, port = server
+    restarts = service.stats["pool_restarts"]
+    for pid in list(service.pool._processes):
+        os.kill(pid, signal.SIGKILL)
+    time.sleep(0.5)
+    status, payload = _request(port, "POST", "/extract?name=a.pdf", body=pdf)
+    assert status == 500 and "restarted" in payload["error"]
+    assert service.stats["pool_restarts"] == restarts + 1
+    status, rec = _request(port, "POST", "/extract?name=a.pdf", body=pdf)
+    assert status == 200 and rec["source_path"] == "a.pdf"
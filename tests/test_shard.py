@@ -0,0 +1,81 @@
+import json
+import os
+import random
+
+import pytest
+
+from paperloom.io_utils import iter_records
+from paperloom.pipeline import extract_pdfs
+from paperloom.shard import iter_merged, merge_outputs, parse_shard, select_shard, shard_of
+from paperloom.synth import pdf_bytes, synth_paper
+
+TREE = ["z.pdf", "a.pdf", "a0.pdf", "a-b.pdf", "a/x.pdf", "a/a.pdf", "a/b/y.pdf", "b/a.pdf", "b/c/d.pdf"]
+
+
+@pytest.fixture(scope="module")
+def tree(tmp_path_factory):
+    root = tmp_path_factory.mktemp("tree")
+    rng = random.Random(0)
+    for rel in TREE:
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(pdf_bytes(synth_paper(rng, pages=2)[0]))
+    return root
+
+
+def _extract(tree, out, shard=None):
+    extract_pdfs(
+        str(tree), str(out), json_name="", csv_name="", excel_name="",
+        jsonl_name="part.jsonl", use_cache=False, recursive=True, shard=shard,
+    )
+    return [r.source_path for r in iter_records(str(out / "part.jsonl"))]
+
+
+def test_recursive_shards_merge_to_full_set(tree, tmp_path):
+    full = _extract(tree, tmp_path / "full")
+    assert len(full) == len(TREE)
+    assert full == sorted(full)
+
+    parts = []
+    for k in range(1, 4):
+        out = tmp_path / f"part{k}"
+        paths = _extract(tree, out, shard=(k, 3))
+        assert paths == sorted(paths)
+        parts.append(str(out))
+
+    # Aynı parça iki kez verilse de yinelenen kayıt çıkmamalı
+    count = merge_outputs(parts + parts[:1], str(tmp_path / "merged"),
+                          json_name="", csv_name="", excel_name="", jsonl_name="all.jsonl")
+    merged = [r.source_path for r in iter_records(str(tmp_path / "merged" / "all.jsonl"))]
+    assert count == len(TREE)
+    assert merged == full
+
+
+def test_unsorted_part_is_rejected(tree, tmp_path):
+    full = tmp_path / "full"
+    _extract(tree, full)
+    lines = (full / "part.jsonl").read_text(encoding="utf-8").splitlines()
+    unsorted = tmp_path / "unsorted.jsonl"
+    unsorted.write_text("\n".join(reversed(lines)) + "\n", encoding="utf-8")
+    assert json.loads(lines[0])["source_path"] < json.loads(lines[-1])["source_path"]
+    with pytest.raises(ValueError, match="not sorted"):
+        list(iter_merged([str(unsorted)]))
+
+
+@pytest.mark.parametrize("spec, expected", [("1/1", (1, 1)), ("2/3", (2, 3)), ("10/10", (10, 10)), (" 1/2 ", (1, 2))])
+def test_parse_shard(spec, expected):
+    assert parse_shard(spec) == expected
+
+
+@pytest.mark.parametrize("spec", ["3/2", "0/0", "0/3", "a/b", "1", "1/", "/2", "-1/2", "1/2/3", ""])
+def test_parse_shard_rejects_bad_specs(spec):
+    with pytest.raises(ValueError):
+        parse_shard(spec)
+
+
+def test_shards_partition_the_input():
+    paths = [f"/data/d{i % 7}/p{i}.pdf" for i in range(200)]
+    parts = [list(select_shard(paths, "/data", (k, 4))) for k in range(1, 5)]
+    assert sorted(p for part in parts for p in part) == sorted(paths)
+    assert all(parts)
+    assert shard_of("a/b.pdf", 4) == shard_of("a/b.pdf", 4)
@@ -0,0 +1,129 @@
+import json
+import random
+import sqlite3
+
+import pytest
+
+from paperloom.batch import RecordBatch
+from paperloom.io_utils import SqliteWriter, parse_condition, query_sqlite
+from paperloom.models import PaperRecord
+from paperloom.pipeline import extract_pdfs
+from paperloom.synth import pdf_bytes, synth_paper
+
+
+def _rows(db):
+    con = sqlite3.connect(db)
+    try:
+        return sorted(con.execute("SELECT file_sha256, source_path, title, doi FROM records"))
+    finally:
+        con.close()
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    inp = tmp_path / "in"
+    inp.mkdir()
+    rng = random.Random(6)
+    for i in range(4):
+        (inp / f"p{i}.pdf").write_bytes(pdf_bytes(synth_paper(rng, pages=2)[0]))
+    return inp
+
+
+def _extract(inp, out):
+    extract_pdfs(str(inp), str(out), json_name="", csv_name="", excel_name="",
+                 sqlite_name="records.db", use_cache=False)
+    return str(out / "records.db")
+
+
+def test_rerun_is_idempotent(tmp_path, corpus):
+    db = _extract(corpus, tmp_path / "out")
+    first = _rows(db)
+    assert len(first) == 4
+    assert _rows(_extract(corpus, tmp_path / "out")) == first
+
+
+def test_changed_file_replaces_its_row(tmp_path, corpus):
+    db = _extract(corpus, tmp_path / "out")
+    before = {path: sha for sha, path, _, _ in _rows(db)}
+    (corpus / "p1.pdf").write_bytes(pdf_bytes(synth_paper(random.Random(99), pages=2)[0]))
+    after = {path: sha for sha, path, _, _ in _rows(_extract(corpus, tmp_path / "out"))}
+    assert sorted(after) == sorted(before)
+    assert after["p1.pdf"] != before["p1.pdf"]
+    assert {p: s for p, s in after.items() if p != "p1.pdf"} == {p: s for p, s in before.items() if p != "p1.pdf"}
+
+
+def _write(db, recs, key="sha"):
+    w = SqliteWriter(db, "", key=key)
+    w.write_batch(RecordBatch(recs))
+    w.close()
+
+
+def _rec(path, sha, **kw):
+    rec = PaperRecord(source_path=path, **kw)
+    rec.file_sha256 = sha
+    return rec
+
+
+def test_doi_key_replaces_other_versions(tmp_path):
+    db = str(tmp_path / "r.db")
+    _write(db, [_rec("v1.pdf", "a" * 64, doi="10.1/x"), _rec("other.pdf", "b" * 64)], key="doi")
+    _write(db, [_rec("v2.pdf", "c" * 64, doi="10.1/x")], key="doi")
+    assert [r[1] for r in _rows(db)] == ["other.pdf", "v2.pdf"]
+
+
+@pytest.fixture
+def store(tmp_path):
+    db = str(tmp_path / "q.db")
+    _write(db, [
+        _rec("a.pdf", "1" * 64, doping="Co", bandgap_ev=1.2, title="ZnO ribbon", year=2019),
+        _rec("b.pdf", "2" * 64, doping="Mn", bandgap_ev=2.5, title="ZnO cluster", year=2021),
+        _rec("c.pdf", "3" * 64, doping="Co", bandgap_ev=3.1, title="It's a ribbon", doi="10.1/c"),
+    ])
+    return db
+
+
+def _paths(rows):
+    return [r["source_path"] for r in rows]
+
+
+def test_query_conditions(store):
+    assert _paths(query_sqlite(store, [("doping", "=", "Co")])) == ["a.pdf", "c.pdf"]
+    assert _paths(query_sqlite(store, [parse_condition("bandgap_ev>=2"), parse_condition("doping=Co")])) == ["c.pdf"]
+    assert _paths(query_sqlite(store, [parse_condition("title~%ribbon%")], order_by="bandgap_ev DESC")) == ["c.pdf", "a.pdf"]
+    assert _paths(query_sqlite(store, [parse_condition("doi=null")])) == ["a.pdf", "b.pdf"]
+    assert _paths(query_sqlite(store, [parse_condition("doi!=null")])) == ["c.pdf"]
+    assert _paths(query_sqlite(store, [parse_condition("year<2020")])) == ["a.pdf"]
+    assert _paths(query_sqlite(store, [parse_condition("title=It's a ribbon")])) == ["c.pdf"]
+    assert _paths(query_sqlite(store, order_by="source_path desc", limit=2)) == ["c.pdf", "b.pdf"]
+
+
+@pytest.mark.parametrize("bad", [
+    lambda db: query_sqlite(db, [("doping; DROP TABLE records", "=", "x")]),
+    lambda db: query_sqlite(db, [("doping", "OR 1=1 --", "x")]),
+    lambda db: query_sqlite(db, order_by="source_path; DROP TABLE records"),
+    lambda db: query_sqlite(db, order_by="nope"),
+    lambda db: parse_condition("1=1"),
+    lambda db: parse_condition("doping"),
+])
+def test_query_rejects_untrusted_sql(store, bad):
+    with pytest.raises(ValueError):
+        bad(store)
+    assert len(_rows(store)) == 3
+
+
+def test_values_are_bound_not_interpolated(store):
+    assert query_sqlite(store, [parse_condition("doping=x' OR '1'='1")]) == []
+    assert len(_rows(store)) == 3
+
+
+def test_cli_query(store):
+    from typer.testing import CliRunner
+
+    from paperloom.cli import app
+
+    result = CliRunner().invoke(app, ["query", store, "--where", "doping=Co", "--where", "bandgap_ev<2"])
+    assert result.exit_code == 0, result.output
+    assert [json.loads(line)["source_path"] for line in result.output.splitlines()] == ["a.pdf"]
+    result = CliRunner().invoke(app, ["query", store, "--where", "1=1; DROP TABLE records"])
+    assert result.exit_code != 0
+    assert len(_rows(store)) == 3
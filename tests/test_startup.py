@@ -0,0 +1,48 @@
+import json, subprocess, sys
+
+from paperloom.bench import HEAVY_MODULES, bench_startup
+from paperloom.defaults import STARTUP_BUDGET_MS
+
+
+def _heavy_after(code: str) -> list:
+    """Temiz bir yorumlayıcıda code çalıştıktan sonra yüklü olan ağır modüller."""
+    probe = code + "\nimport sys, json\nprint(json.dumps([m for m in %r if m in sys.modules]))" % (HEAVY_MODULES,)
+    out = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def test_package_import_is_light():
+    assert _heavy_after("import paperloom") == []
+
+
+def test_cli_import_is_light():
+    assert _heavy_after("import paperloom.cli") == []
+
+
+def test_help_is_light():
+    code = (
+        "from typer.testing import CliRunner\n"
+        "from paperloom.cli import app\n"
+        "assert CliRunner().invoke(app, ['extract', '--help']).exit_code == 0"
+    )
+    assert _heavy_after(code) == []
+
+
+def test_cli_import_is_within_budget():
+    # bench --check ile aynı ölçüm; paylaşılan makinelerde gürültüye karşı 2 kat pay
+    result = bench_startup(budget_ms=2 * STARTUP_BUDGET_MS, repeat=3)
+    assert result["ok"], result
+
+
+def test_cli_defaults_follow_the_library():
+    from typer.testing import CliRunner
+
+    from paperloom import extract_rules, pipeline
+    from paperloom.cli import app
+
+    assert extract_rules.RULE_TIME_BUDGET is not None
+    for cmd in ("extract", "reextract", "watch", "serve"):
+        out = CliRunner().invoke(app, [cmd, "--help"], env={"COLUMNS": "200"}).output
+        assert f"[default: {extract_rules.RULE_TIME_BUDGET}]" in out, cmd
+    out = CliRunner().invoke(app, ["extract", "--help"], env={"COLUMNS": "200"}).output
+    assert f"[default: {pipeline.PAGE_THRESHOLD}]" in out
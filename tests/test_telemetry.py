@@ -0,0 +1,61 @@
+import os
+import threading
+import time
+
+from paperloom import telemetry
+from paperloom.telemetry import Telemetry, format_status, prometheus_text
+
+
+def test_progress_and_textfile(tmp_path):
+    prom = tmp_path / "paperloom.prom"
+    snaps = []
+    with Telemetry(textfile=str(prom), on_update=snaps.append, run="r1") as tel:
+        tel.expect(3)
+        for _ in range(3):
+            tel.done(True, pages=2)
+    last = snaps[-1]
+    assert (last["done"], last["ok"], last["pages"], last["eta_seconds"], last["running"]) == (3, 3, 6, 0.0, False)
+    assert "3/3 docs (100%)" in format_status(last)
+    text = prom.read_text(encoding="utf-8")
+    assert 'paperloom_documents_total{run="r1",outcome="ok"} 3' in text
+    assert 'paperloom_pages_total{run="r1"} 6' in text
+    assert 'paperloom_running{run="r1"} 0' in text
+    assert os.listdir(tmp_path) == ["paperloom.prom"]
+
+
+def test_label_escaping():
+    snap = Telemetry().snapshot()
+    text = prometheus_text(snap, 0.0, 0.0, run='a"b\\c')
+    assert 'paperloom_running{run="a\\"b\\\\c"} 1' in text
+
+
+def test_slow_output_does_not_block_snapshots(tmp_path, monkeypatch):
+    writing = threading.Event()
+    release = threading.Event()
+    real_write = telemetry.write_textfile
+
+    def slow_write(path, text):
+        if threading.current_thread().name == "paperloom-telemetry":
+            writing.set()
+            release.wait(5)
+        real_write(path, text)
+
+    monkeypatch.setattr(telemetry, "write_textfile", slow_write)
+    snaps = []
+    tel = Telemetry(textfile=str(tmp_path / "m.prom"), on_update=snaps.append,
+                    interval=0.01, textfile_interval=0.01).start()
+    try:
+        assert writing.wait(5)
+        # Arka plan yazımı sürerken başka bir yayın (ve fork) beklemeden ilerler
+        n = len(snaps)
+        t0 = time.monotonic()
+        tel._publish(force=True)
+        pid = os.fork()
+        if pid == 0:
+            os._exit(0)
+        os.waitpid(pid, 0)
+        assert time.monotonic() - t0 < 1.0
+        assert len(snaps) > n
+    finally:
+        release.set()
+        tel.close()
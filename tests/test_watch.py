@@ -0,0 +1,33 @@
+import json
+import os
+import random
+
+from paperloom import watch
+from paperloom.pipeline import _process_pdf
+from paperloom.synth import pdf_bytes, synth_paper
+
+
+def _crash_on_bad(path, **kwargs):
+    """crash*.pdf işçi sürecini öldürür (segfault gibi; except ile yakalanamaz)."""
+    if os.path.basename(path).startswith("crash"):
+        os._exit(1)
+    return _process_pdf(path, **kwargs)
+
+
+def test_worker_crash_is_quarantined(tmp_path, monkeypatch):
+    inp, out = tmp_path / "in", tmp_path / "out"
+    inp.mkdir()
+    rng = random.Random(2)
+    for name in ("a.pdf", "b.pdf", "crash.pdf", "d.pdf", "e.pdf"):
+        (inp / name).write_bytes(pdf_bytes(synth_paper(rng, pages=2)[0]))
+    monkeypatch.setattr(watch, "_process_pdf", _crash_on_bad)
+
+    n = watch.watch_folder(str(inp), str(out), csv_name=None, workers=2, once=True, use_cache=False)
+    assert n == 4
+    rows = [json.loads(line) for line in (out / "znr_dataset.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert sorted(r["source_path"] for r in rows) == ["a.pdf", "b.pdf", "d.pdf", "e.pdf"]
+    quarantined = json.loads((out / "quarantine.json").read_text(encoding="utf-8"))
+    assert [e["file"] for e in quarantined] == ["crash.pdf"]
+
+    # Yeniden başlatıldığında karantinadaki (değişmemiş) dosya denenmez
+    assert watch.watch_folder(str(inp), str(out), csv_name=None, workers=2, once=True, use_cache=False) == 0
@@ -0,0 +1,38 @@
+import json
+
+from paperloom.io_utils import CsvStreamWriter, JsonArrayWriter, JsonlWriter, RecordWriters
+from paperloom.models import PaperRecord
+
+
+def _recs(n):
+    return [PaperRecord(f"p{i}.pdf", title=f"Paper {i}", year=2020 + i, ndr=False) for i in range(n)]
+
+
+def test_streaming_writers_get_each_record_immediately(tmp_path):
+    jsonl, csv = tmp_path / "a.jsonl", tmp_path / "a.csv"
+    out = RecordWriters([JsonlWriter(str(jsonl)), CsvStreamWriter(str(csv)),
+                         JsonArrayWriter(str(tmp_path / "a.json"))], batch_size=256)
+    for i, rec in enumerate(_recs(3), 1):
+        out.write(rec)
+        assert len(jsonl.read_text(encoding="utf-8").splitlines()) == i
+        assert len(csv.read_text(encoding="utf-8").splitlines()) == i + 1  # başlık
+    out.close()
+    assert [r["source_path"] for r in json.loads((tmp_path / "a.json").read_text(encoding="utf-8"))] == \
+        ["p0.pdf", "p1.pdf", "p2.pdf"]
+
+
+def test_batched_writers_flush_after_max_delay(tmp_path):
+    seen = []
+
+    class Columnar:
+        def write_batch(self, batch):
+            seen.append(len(batch))
+
+        def close(self):
+            pass
+
+    out = RecordWriters([Columnar()], batch_size=256, max_delay=0.0)
+    for rec in _recs(3):
+        out.write(rec)
+    out.close()
+    assert seen == [1, 1, 1]